@@ -2,17 +2,25 @@
 This file contains the main code for the Streamlit app.
 """
 
-import streamlit as st
+from src.utils.startup import startup_timer
+
+with startup_timer.step("import streamlit"):
+    import streamlit as st
 
 
 # Setting the pages
-pages = [
-    st.Page("src/pages/home.py", title="Finance Analyzer", icon="📊"),
-    st.Page("src/pages/file_upload.py", title="Upload File", icon="📂"),
-    # st.Page("src/pages/analysis.py", title="Analysis", icon="📈"),
-]
+# OBS: The pages are only imported when they are opened, so their heavy
+#      imports (pandas, the readers) do not slow down the app startup
+with startup_timer.step("navigation"):
+    pages = [
+        st.Page("src/pages/home.py", title="Finance Analyzer", icon="📊"),
+        st.Page("src/pages/file_upload.py", title="Upload File", icon="📂"),
+        # st.Page("src/pages/analysis.py", title="Analysis", icon="📈"),
+    ]
+    pg = st.navigation(pages)
+    st.set_page_config(page_title="Finance Analyzer", page_icon="💰", layout="wide")
 
 # Running the app
-pg = st.navigation(pages)
-st.set_page_config(page_title="Finance Analyzer", page_icon="💰", layout="wide")
-pg.run()
+with startup_timer.step(f"page {pg.title}"):
+    pg.run()
+startup_timer.log()
@@ -0,0 +1,269 @@
+"""
+Generators of synthetic financial documents for the benchmarks.
+
+Every generator is seeded, so the same size and seed always produce the same
+document. The ledgers have the columns used by the financial metrics, and the
+PDFs have a text layer with a ruled table on each page (or only page images,
+for the scanned PDFs).
+"""
+
+import json
+import random
+import tempfile
+import pandas as pd
+from datetime import date, timedelta
+from fpdf import FPDF
+from pathlib import Path
+
+# -- Rows of the ledgers and pages of the PDFs of each size
+SIZES = {
+    "small": {"rows": 1_000, "pages": 5},
+    "medium": {"rows": 10_000, "pages": 20},
+    "large": {"rows": 100_000, "pages": 50},
+}
+
+# -- Kinds of documents and their extensions
+KINDS = {
+    "csv": "csv",
+    "excel": "xlsx",
+    "json": "json",
+    "pdf": "pdf",
+    "scanned_pdf": "pdf",
+}
+
+# -- Accounts of the ledger entries
+ACCOUNTS = ["Sales", "Services", "Licensing", "Consulting", "Maintenance", "Support"]
+
+# -- Rows of the table on each PDF page
+PDF_TABLE_ROWS = 12
+
+
+def ledger(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a ledger with the columns used by the financial metrics.
+
+    Parameters:
+        rows - int: Number of entries
+        seed - int: Seed of the random values
+
+    Returns:
+        pd.DataFrame: Ledger with one entry per row
+    """
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    entries = []
+    for idx in range(rows):
+        revenue = round(rng.uniform(1_000, 100_000), 2)
+        cogs = round(revenue * rng.uniform(0.3, 0.7), 2)
+        operating_income = round((revenue - cogs) * rng.uniform(0.2, 0.8), 2)
+        assets = round(rng.uniform(100_000, 1_000_000), 2)
+        entries.append(
+            {
+                "date": (start + timedelta(days=idx % 3650)).isoformat(),
+                "account": rng.choice(ACCOUNTS),
+                "description": f"Entry {idx} of {rng.choice(ACCOUNTS).lower()}",
+                "revenue": revenue,
+                "cogs": cogs,
+                "operating_income": operating_income,
+                "net_income": round(operating_income * rng.uniform(0.5, 0.9), 2),
+                "depreciation": round(rng.uniform(100, 5_000), 2),
+                "amortization": round(rng.uniform(50, 2_000), 2),
+                "investment": round(rng.uniform(10_000, 500_000), 2),
+                "equity": round(assets * rng.uniform(0.3, 0.7), 2),
+                "assets": assets,
+                "debt": round(assets * rng.uniform(0.1, 0.6), 2),
+            }
+        )
+    return pd.DataFrame(entries)
+
+
+def write_csv(file_path: Path, rows: int, seed: int = 0) -> Path:
+    """
+    Write a ledger as a CSV file.
+
+    Parameters:
+        file_path - Path: Path of the file
+        rows - int: Number of entries
+        seed - int: Seed of the random values
+
+    Returns:
+        Path: Path of the file
+    """
+    ledger(rows, seed).to_csv(file_path, index=False)
+    return file_path
+
+
+def write_excel(file_path: Path, rows: int, seed: int = 0) -> Path:
+    """
+    Write a ledger as an Excel workbook, split in a sheet per year.
+
+    Parameters:
+        file_path - Path: Path of the file
+        rows - int: Number of entries
+        seed - int: Seed of the random values
+
+    Returns:
+        Path: Path of the file
+    """
+    df = ledger(rows, seed)
+    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        for year, sheet in df.groupby(df["date"].str[:4]):
+            sheet.to_excel(writer, sheet_name=year, index=False)
+    return file_path
+
+
+def write_json(file_path: Path, rows: int, seed: int = 0) -> Path:
+    """
+    Write a ledger as a nested JSON document, with the entries grouped by account.
+
+    Parameters:
+        file_path - Path: Path of the file
+        rows - int: Number of entries
+        seed - int: Seed of the random values
+
+    Returns:
+        Path: Path of the file
+    """
+    df = ledger(rows, seed)
+    document = {
+        "company": {"name": "Synthetic Corp", "currency": "USD"},
+        "accounts": [
+            {"name": account, "entries": entries.to_dict(orient="records")}
+            for account, entries in df.groupby("account")
+        ],
+    }
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(document, f)
+    return file_path
+
+
+def write_pdf(file_path: Path, pages: int, seed: int = 0) -> Path:
+    """
+    Write a report with a text layer and a ruled table on each page.
+
+    Parameters:
+        file_path - Path: Path of the file
+        pages - int: Number of pages
+        seed - int: Seed of the random values
+
+    Returns:
+        Path: Path of the file
+    """
+    df = ledger(pages * PDF_TABLE_ROWS, seed)
+    columns = ["date", "account", "revenue", "cogs", "net_income"]
+    pdf = FPDF()
+    for page in range(pages):
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 14)
+        pdf.cell(0, 10, txt=f"Quarterly Report - Page {page + 1}", ln=True)
+        pdf.set_font("Arial", size=10)
+        pdf.multi_cell(0, 5, txt=_paragraph(random.Random(seed + page)))
+        pdf.ln(4)
+
+        # -- Table with borders, so its cells are detected by the extractor
+        rows = df.iloc[page * PDF_TABLE_ROWS : (page + 1) * PDF_TABLE_ROWS]
+        for column in columns:
+            pdf.cell(36, 7, txt=column, border=1)
+        pdf.ln()
+        for row in rows[columns].itertuples(index=False):
+            for value in row:
+                pdf.cell(36, 7, txt=str(value), border=1)
+            pdf.ln()
+    pdf.output(str(file_path))
+    return file_path
+
+
+def write_scanned_pdf(file_path: Path, pages: int, seed: int = 0) -> Path:
+    """
+    Write a report of page images without a text layer, like a scanned document.
+
+    Parameters:
+        file_path - Path: Path of the file
+        pages - int: Number of pages
+        seed - int: Seed of the random values
+
+    Returns:
+        Path: Path of the file
+    """
+    from PIL import Image, ImageDraw
+
+    pdf = FPDF()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for page in range(pages):
+            # -- Draw the text of the page on an A4 image at 100 DPI
+            image = Image.new("L", (827, 1169), color=255)
+            draw = ImageDraw.Draw(image)
+            lines = [f"Quarterly Report - Page {page + 1}", ""]
+            lines += _paragraph(random.Random(seed + page)).split(". ")
+            for idx, line in enumerate(lines):
+                draw.text((60, 60 + idx * 24), line, fill=0)
+            image_path = Path(tmp_dir) / f"page-{page}.png"
+            image.save(image_path)
+
+            pdf.add_page()
+            pdf.image(str(image_path), x=0, y=0, w=210, h=297)
+        pdf.output(str(file_path))
+    return file_path
+
+
+def generate(kind: str, size: str, directory: Path, seed: int = 0) -> Path:
+    """
+    Get a synthetic document, generating it only if it is not in the directory.
+
+    Parameters:
+        kind - str: Kind of document (see KINDS)
+        size - str: Size of the document (see SIZES)
+        directory - Path: Directory of the generated documents
+        seed - int: Seed of the random values
+
+    Returns:
+        Path: Path of the document
+
+    Raises:
+        ValueError: If the kind or the size is unknown
+    """
+    if kind not in KINDS or size not in SIZES:
+        raise ValueError(f"Unknown document: {kind} ({size})")
+
+    directory.mkdir(parents=True, exist_ok=True)
+    file_path = directory / f"{kind}-{size}-{seed}.{KINDS[kind]}"
+    if file_path.exists():
+        return file_path
+
+    # -- Write the document to a temporary file, so interrupted runs are redone
+    tmp_path = file_path.with_name(f"tmp-{file_path.name}")
+    rows, pages = SIZES[size]["rows"], SIZES[size]["pages"]
+    match kind:
+        case "csv":
+            write_csv(tmp_path, rows, seed)
+        case "excel":
+            write_excel(tmp_path, rows, seed)
+        case "json":
+            write_json(tmp_path, rows, seed)
+        case "pdf":
+            write_pdf(tmp_path, pages, seed)
+        case "scanned_pdf":
+            write_scanned_pdf(tmp_path, pages, seed)
+    tmp_path.replace(file_path)
+    return file_path
+
+
+def _paragraph(rng: random.Random) -> str:
+    """
+    Generate a paragraph of report text.
+
+    Parameters:
+        rng - random.Random: Seeded random generator
+
+    Returns:
+        str: Paragraph with a few sentences
+    """
+    sentences = [
+        f"Revenue grew {rng.uniform(1, 20):.1f}% compared to the previous quarter",
+        f"Gross margin reached {rng.uniform(30, 70):.1f}% on {rng.choice(ACCOUNTS)}",
+        f"Operating expenses were {rng.uniform(1, 50):.1f} million dollars",
+        f"Net income was {rng.uniform(1, 30):.1f} million dollars",
+        f"The board approved a dividend of {rng.uniform(0.1, 2):.2f} per share",
+    ]
+    rng.shuffle(sentences)
+    return ". ".join(sentences) + "."
@@ -0,0 +1,300 @@
+"""
+Memory regression harness of the readers.
+
+Usage:
+    python -m benchmarks.memory run --readers csv pdf -o memory.json
+
+Each reader extracts generated documents of increasing size, each one on a new
+interpreter, which reports the growth of its peak RSS during the extraction and
+the peak memory and blocks traced by tracemalloc. A line is fitted to the peak
+RSS by input size, and its slope (MB of memory per MB of input) is checked
+against the threshold of the reader, so memory blowups are caught before a
+release.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from benchmarks.generators import (
+    write_csv,
+    write_excel,
+    write_json,
+    write_pdf,
+    write_scanned_pdf,
+)
+
+# -- Generator, configuration, sizes (rows or pages) and maximum MB of peak RSS
+#    per MB of input of each reader
+READERS = {
+    "csv": {
+        "write": write_csv,
+        "suffix": "csv",
+        "config": {"optimize_memory": False},
+        "sizes": [5_000, 20_000, 80_000],
+        "max_slope": 30.0,
+    },
+    "excel": {
+        "write": write_excel,
+        "suffix": "xlsx",
+        "config": {"sheets": 0},
+        "sizes": [2_000, 8_000, 32_000],
+        "max_slope": 20.0,
+    },
+    "json": {
+        "write": write_json,
+        "suffix": "json",
+        "config": {"normalize": True},
+        "sizes": [5_000, 20_000, 80_000],
+        "max_slope": 15.0,
+    },
+    "pdf": {
+        "write": write_pdf,
+        "suffix": "pdf",
+        "config": {"scan": False},
+        "sizes": [4, 16, 32],
+        "max_slope": 100.0,
+    },
+    "scanned_pdf": {
+        "write": write_scanned_pdf,
+        "suffix": "pdf",
+        "config": {"scan": True},
+        "sizes": [2, 4, 8],
+        "max_slope": 250.0,
+    },
+}
+
+
+def measure(file_path: Path, config: dict, trace: bool = True) -> dict:
+    """
+    Extract a file and measure the memory used by the extraction.
+
+    Runs on the new interpreter of each measurement: the peak RSS is measured
+    on a first extraction and the traced memory on a second one, since
+    tracemalloc adds its own memory to the RSS.
+
+    Parameters:
+        file_path - Path: Path of the file
+        config - dict: Configuration for the extractor
+        trace - bool: Flag to trace the allocations (0 when not traced)
+
+    Returns:
+        dict: Peak RSS growth, peak traced memory in bytes and traced blocks
+    """
+    import gc
+    import tracemalloc
+    from src.extract.extractor import DataExtractor
+    from src.extract.registry import readers
+    from src.utils.profiling import peak_rss
+
+    # -- Import the reader before the baseline, so only the extraction is measured
+    readers.get(file_path.suffix)
+    baseline = peak_rss()
+    extractor = DataExtractor(file_path, config).load()
+    rss = peak_rss() - baseline
+    del extractor
+    gc.collect()
+    if not trace:
+        return {"peak_rss": rss, "traced_peak": 0, "traced_blocks": 0}
+
+    # -- Trace the allocations of a second extraction, keeping its result alive
+    #    until the snapshot so its blocks are counted
+    tracemalloc.start()
+    extractor = DataExtractor(file_path, config).load()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    del extractor
+    tracemalloc.stop()
+
+    return {"peak_rss": rss, "traced_peak": traced_peak, "traced_blocks": blocks}
+
+
+def measure_in_subprocess(file_path: Path, config: dict, trace: bool = True) -> dict:
+    """
+    Measure the memory of an extraction on a new interpreter.
+
+    Parameters:
+        file_path - Path: Path of the file
+        config - dict: Configuration for the extractor
+        trace - bool: Flag to trace the allocations
+
+    Returns:
+        dict: Result of measure
+
+    Raises:
+        RuntimeError: If the extraction fails
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.memory",
+            "measure",
+            str(file_path),
+            json.dumps(config),
+            *([] if trace else ["--no-trace"]),
+        ],
+        capture_output=True,
+        text=True,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.getcwd(),
+            "FINANCE_ANALYZER_LOG_ASYNC": "0",
+        },
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Error measuring {file_path}: {result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def fit(points: list[dict]) -> dict:
+    """
+    Fit a line to the peak RSS by input size.
+
+    Parameters:
+        points - list[dict]: Input size and peak RSS in bytes of each measurement
+
+    Returns:
+        dict: Slope (MB of memory per MB of input) and intercept (MB) of the
+            line, with the highest ratio of memory to input of the points
+    """
+    sizes = [point["input_bytes"] / 1024**2 for point in points]
+    memory = [point["peak_rss"] / 1024**2 for point in points]
+    slope, intercept = statistics.linear_regression(sizes, memory)
+    return {
+        "slope": slope,
+        "intercept": intercept,
+        "max_ratio": max(mem / size for mem, size in zip(memory, sizes)),
+    }
+
+
+def profile_reader(
+    reader: str,
+    data_dir: Path,
+    sizes: list[int] | None = None,
+    seed: int = 0,
+    trace: bool = True,
+) -> dict:
+    """
+    Measure a reader on documents of increasing size and fit its scaling line.
+
+    Parameters:
+        reader - str: Name of the reader (see READERS)
+        data_dir - Path: Directory of the generated documents
+        sizes - list[int] | None: Rows or pages of the documents (defaults to
+            the sizes of the reader)
+        seed - int: Seed of the generated documents
+        trace - bool: Flag to trace the allocations
+
+    Returns:
+        dict: Reader, measurements, fitted line, threshold and status
+            ("ok" or "failed")
+    """
+    spec = READERS[reader]
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    points = []
+    for size in sizes or spec["sizes"]:
+        file_path = data_dir / f"memory-{reader}-{size}-{seed}.{spec['suffix']}"
+        if not file_path.exists():
+            spec["write"](file_path, size, seed)
+        point = measure_in_subprocess(file_path, spec["config"], trace)
+        point.update(size=size, input_bytes=file_path.stat().st_size)
+        points.append(point)
+
+    line = fit(points)
+    return {
+        "reader": reader,
+        "points": points,
+        **line,
+        "max_slope": spec["max_slope"],
+        "status": "ok" if line["slope"] <= spec["max_slope"] else "failed",
+    }
+
+
+def available_readers() -> list[str]:
+    """
+    Get the readers that can run here (scanned PDFs need poppler and tesseract).
+
+    Returns:
+        list[str]: Names of the readers
+    """
+    names = list(READERS)
+    if not (shutil.which("pdftoppm") and shutil.which("tesseract")):
+        names.remove("scanned_pdf")
+    return names
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse the command-line arguments.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Check the memory of the readers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Profile the readers")
+    run_parser.add_argument("--readers", nargs="+", choices=list(READERS))
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument(
+        "--data-dir", type=Path, default=Path("data/benchmarks"), help="Documents"
+    )
+    run_parser.add_argument("-o", "--output", type=Path, help="JSON results file")
+
+    # -- Measurement of a single file, run on a new interpreter
+    measure_parser = commands.add_parser("measure", help=argparse.SUPPRESS)
+    measure_parser.add_argument("file", type=Path)
+    measure_parser.add_argument("config", type=json.loads)
+    measure_parser.add_argument("--no-trace", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Profile the memory of the readers.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        int: Exit code (1 if a reader is over its threshold)
+    """
+    args = parse_args(argv)
+    if args.command == "measure":
+        print(json.dumps(measure(args.file, args.config, not args.no_trace)))
+        return 0
+
+    results = []
+    for reader in args.readers or available_readers():
+        result = profile_reader(reader, args.data_dir, seed=args.seed)
+        print(
+            f"{result['status'].upper():<7} {reader:<12} "
+            f"{result['slope']:8.1f} MB/MB (max {result['max_slope']:.0f}), "
+            f"{result['intercept']:8.1f} MB fixed"
+        )
+        for point in result["points"]:
+            print(
+                f"        {point['size']:>8} -> {point['input_bytes'] / 1024:9.0f} KB "
+                f"input, {point['peak_rss'] / 1024**2:7.1f} MB RSS, "
+                f"{point['traced_peak'] / 1024**2:7.1f} MB traced, "
+                f"{point['traced_blocks']} blocks"
+            )
+        results.append(result)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(result["status"] == "failed" for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
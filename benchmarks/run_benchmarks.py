@@ -0,0 +1,438 @@
+"""
+Benchmark suite of the extraction, the financial metrics and the processing of
+uploads, on synthetic documents.
+
+Usage:
+    python -m benchmarks.run_benchmarks run --sizes small medium -o results.json
+    python -m benchmarks.run_benchmarks run --baseline main.json -o branch.json
+    python -m benchmarks.run_benchmarks compare main.json branch.json
+
+The documents are generated once in the data directory (see
+benchmarks.generators). Each case is timed a number of times after a warmup,
+and the results are written as JSON with the commit and the environment of the
+run. The comparison flags the cases whose median time grew by more than the
+threshold, exiting with code 1 when there are regressions.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+from typing import Callable
+from benchmarks.generators import SIZES, generate, ledger
+from src.analysis import financial_metrics
+from src.api.extraction_cache import ExtractionCache
+from src.api.file_processing import process_uploaded_file
+from src.extract.extractor import DataExtractor
+
+# -- Configuration of the extractor for each kind of document
+EXTRACTION_CONFIGS = {
+    "csv": {"optimize_memory": False},
+    "excel": {"sheets": "all"},
+    "json": {"normalize": True},
+    "pdf": {"scan": False},
+    "scanned_pdf": {"scan": True},
+}
+
+# -- Columns of the ledger given to each metric function
+METRIC_COLUMNS = {
+    "gross_margin": ["revenue", "cogs"],
+    "operating_margin": ["revenue", "operating_income"],
+    "net_margin": ["net_income", "revenue"],
+    "roi": ["net_income", "investment"],
+    "roe": ["net_income", "equity"],
+    "roa": ["net_income", "assets"],
+    "revenue_growth": ["revenue", "date"],
+    "net_income_growth": ["net_income", "date"],
+    "ebitda": ["operating_income", "depreciation", "amortization"],
+    "debt_ratio": ["debt", "assets"],
+}
+
+# -- Defaults of the comparison: relative and absolute growth of the median
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA = 0.001
+
+
+class Case:
+    """
+    Class representing a benchmark case.
+
+    Attributes:
+        name - str: Name of the case (e.g. "extract.csv.small")
+        group - str: Group of the case ("extract", "metrics" or "upload")
+        size - str: Size of the input
+        run - Callable[[], object]: Function running the case once
+    """
+
+    def __init__(self, name: str, group: str, size: str, run: Callable) -> None:
+        """
+        Initialize the Case class.
+
+        Parameters:
+            name - str: Name of the case
+            group - str: Group of the case
+            size - str: Size of the input
+            run - Callable[[], object]: Function running the case once
+        """
+        self.name = name
+        self.group = group
+        self.size = size
+        self.run = run
+
+
+def build_cases(data_dir: Path, sizes: list[str], seed: int = 0) -> list[Case]:
+    """
+    Build the benchmark cases, generating their documents.
+
+    Scanned PDFs are only benchmarked when poppler and tesseract are installed.
+
+    Parameters:
+        data_dir - Path: Directory of the generated documents
+        sizes - list[str]: Sizes of the inputs (see benchmarks.generators.SIZES)
+        seed - int: Seed of the generated documents
+
+    Returns:
+        list[Case]: Benchmark cases
+    """
+    kinds = list(EXTRACTION_CONFIGS)
+    if not (shutil.which("pdftoppm") and shutil.which("tesseract")):
+        print("Skipping the scanned PDFs: poppler or tesseract is not installed")
+        kinds.remove("scanned_pdf")
+
+    cases = []
+    for size in sizes:
+        # -- Extraction and upload processing of each kind of document
+        for kind in kinds:
+            file_path = generate(kind, size, data_dir, seed)
+            config = EXTRACTION_CONFIGS[kind]
+            cases.append(
+                Case(
+                    f"extract.{kind}.{size}",
+                    "extract",
+                    size,
+                    lambda file_path=file_path, config=config: DataExtractor(
+                        file_path, config
+                    ).load(),
+                )
+            )
+            cases.append(
+                Case(
+                    f"upload.{kind}.{size}",
+                    "upload",
+                    size,
+                    lambda file_path=file_path, config=config: _process_upload(
+                        file_path, config
+                    ),
+                )
+            )
+
+        # -- Metric functions on the ledger
+        df = ledger(SIZES[size]["rows"], seed)
+        for metric, columns in METRIC_COLUMNS.items():
+            function = getattr(financial_metrics, f"calculate_{metric}")
+            cases.append(
+                Case(
+                    f"metrics.{metric}.{size}",
+                    "metrics",
+                    size,
+                    lambda function=function, columns=columns, df=df: function(
+                        df, *columns
+                    ),
+                )
+            )
+    return cases
+
+
+def time_case(case: Case, repeat: int = 5, warmup: int = 1) -> dict:
+    """
+    Time a benchmark case.
+
+    Parameters:
+        case - Case: Benchmark case
+        repeat - int: Number of timed runs
+        warmup - int: Number of runs before the timed ones
+
+    Returns:
+        dict: Name, group, size and statistics of the run times in seconds
+    """
+    for _ in range(warmup):
+        case.run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+    return {
+        "name": case.name,
+        "group": case.group,
+        "size": case.size,
+        "runs": repeat,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if repeat > 1 else 0.0,
+    }
+
+
+def run(
+    cases: list[Case], repeat: int = 5, warmup: int = 1, pattern: str | None = None
+) -> list[dict]:
+    """
+    Time the benchmark cases, printing each result.
+
+    Parameters:
+        cases - list[Case]: Benchmark cases
+        repeat - int: Number of timed runs of each case
+        warmup - int: Number of runs of each case before the timed ones
+        pattern - str | None: Substring of the names of the cases to run
+
+    Returns:
+        list[dict]: Results of the cases
+    """
+    results = []
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        result = time_case(case, repeat, warmup)
+        print(
+            f"{case.name:<40} median {result['median'] * 1000:10.2f} ms"
+            f"  min {result['min'] * 1000:10.2f} ms"
+        )
+        results.append(result)
+    return results
+
+
+def environment() -> dict:
+    """
+    Get the commit and the environment of a run.
+
+    Returns:
+        dict: Commit, date, Python version, platform and number of CPUs
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": _cpu_count(),
+    }
+
+
+def write_results(file_path: Path, results: list[dict], settings: dict) -> None:
+    """
+    Write the results of a run as JSON.
+
+    Parameters:
+        file_path - Path: Path of the results file
+        results - list[dict]: Results of the cases
+        settings - dict: Settings of the run (sizes, repeat, warmup and seed)
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"environment": environment(), "settings": settings, "results": results},
+            f,
+            indent=2,
+        )
+
+
+def load_results(file_path: Path) -> dict[str, dict]:
+    """
+    Load the results of a run.
+
+    Parameters:
+        file_path - Path: Path of the results file
+
+    Returns:
+        dict[str, dict]: Results by case name
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+def compare(
+    baseline: dict[str, dict],
+    current: dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> list[dict]:
+    """
+    Compare the median times of two runs.
+
+    A case regresses when its median grows by more than the threshold and by
+    more than the minimum delta, so the noise of the fastest cases is ignored.
+
+    Parameters:
+        baseline - dict[str, dict]: Results of the baseline by case name
+        current - dict[str, dict]: Results of the current run by case name
+        threshold - float: Relative growth of the median flagged as regression
+        min_delta - float: Minimum growth of the median in seconds
+
+    Returns:
+        list[dict]: Name, medians, ratio and status of each case ("regression",
+            "improvement", "unchanged", "new" or "missing")
+    """
+    comparison = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before = baseline.get(name, {}).get("median")
+        after = current.get(name, {}).get("median")
+        if before is None or after is None:
+            status = "new" if before is None else "missing"
+            ratio = None
+        else:
+            ratio = after / before if before else float("inf")
+            if ratio > 1 + threshold and after - before > min_delta:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold) and before - after > min_delta:
+                status = "improvement"
+            else:
+                status = "unchanged"
+        comparison.append(
+            {
+                "name": name,
+                "baseline": before,
+                "current": after,
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return comparison
+
+
+def print_comparison(comparison: list[dict]) -> int:
+    """
+    Print a comparison, with the regressions first.
+
+    Parameters:
+        comparison - list[dict]: Result of compare
+
+    Returns:
+        int: Number of regressions
+    """
+    order = ["regression", "improvement", "new", "missing", "unchanged"]
+    for item in sorted(comparison, key=lambda item: order.index(item["status"])):
+        ratio = f"{item['ratio']:.2f}x" if item["ratio"] is not None else "-"
+        print(f"{item['status'].upper():<12} {item['name']:<40} {ratio}")
+    regressions = sum(item["status"] == "regression" for item in comparison)
+    print(f"{regressions} regression(s) in {len(comparison)} case(s)")
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse the command-line arguments.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the finance analyzer.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # -- Run the benchmarks
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument(
+        "--sizes", nargs="+", choices=list(SIZES), default=["small"]
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("-k", "--filter", help="Substring of the case names")
+    run_parser.add_argument(
+        "--data-dir", type=Path, default=Path("data/benchmarks"), help="Documents"
+    )
+    run_parser.add_argument(
+        "-o", "--output", type=Path, default=Path("benchmark_results.json")
+    )
+    run_parser.add_argument("--baseline", type=Path, help="Results to compare with")
+
+    # -- Compare two runs
+    compare_parser = commands.add_parser("compare", help="Compare two runs")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+
+    for command in [run_parser, compare_parser]:
+        command.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+        command.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run or compare the benchmarks.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        int: Exit code (1 if there are regressions)
+    """
+    args = parse_args(argv)
+    if args.command == "compare":
+        baseline, current = load_results(args.baseline), load_results(args.current)
+    else:
+        cases = build_cases(args.data_dir, args.sizes, args.seed)
+        results = run(cases, args.repeat, args.warmup, args.filter)
+        settings = {
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        }
+        write_results(args.output, results, settings)
+        print(f"Results written to {args.output}")
+        if args.baseline is None:
+            return 0
+        baseline = load_results(args.baseline)
+        current = {result["name"]: result for result in results}
+
+    comparison = compare(baseline, current, args.threshold, args.min_delta)
+    return 1 if print_comparison(comparison) else 0
+
+
+def _process_upload(file_path: Path, config: dict) -> DataExtractor:
+    """
+    Process a document as an upload, with an empty cache so it is extracted.
+
+    Parameters:
+        file_path - Path: Path of the document
+        config - dict: Configuration for the extractor
+
+    Returns:
+        DataExtractor: Extractor object with the extracted data
+    """
+    uploaded_file = BytesIO(file_path.read_bytes())
+    uploaded_file.name = file_path.name
+    return process_uploaded_file(uploaded_file, config, cache=ExtractionCache())
+
+
+def _cpu_count() -> int | None:
+    """
+    Get the number of CPUs available to the process.
+
+    Returns:
+        int | None: Number of CPUs
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,20 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from src.utils.logger import get_logger
+from src.utils.tracing import tracer
+
+# -- pandas is only needed for the annotations, so the import is deferred to
+#    the callers, which already have the data frames
+if TYPE_CHECKING:
+    import pandas as pd
 
 # -- Get the logger
 logger = get_logger()
 
 
 # -- MARGIN AND PROFITABILITY METRICS
+@tracer.traced("metrics.gross_margin")
 def calculate_gross_margin(df: pd.DataFrame, revenue_col: str, cogs_col: str) -> float:
     """
     Calculate the Gross Margin (%) of a company.
@@ -45,6 +54,7 @@ def calculate_gross_margin(df: pd.DataFrame, revenue_col: str, cogs_col: str) ->
     return gross_margin * 100
 
 
+@tracer.traced("metrics.operating_margin")
 def calculate_operating_margin(
     df: pd.DataFrame, revenue_col: str, operating_income_col: str
 ) -> float:
@@ -88,6 +98,7 @@ def calculate_operating_margin(
     return operating_margin * 100
 
 
+@tracer.traced("metrics.net_margin")
 def calculate_net_margin(
     df: pd.DataFrame, net_income_col: str, revenue_col: str
 ) -> float:
@@ -132,6 +143,7 @@ def calculate_net_margin(
 
 
 # -- RETURN ON INVESTMENT METRICS --
+@tracer.traced("metrics.roi")
 def calculate_roi(
     df: pd.DataFrame, net_income_col: str, init_investment_col: str
 ) -> float:
@@ -177,6 +189,7 @@ def calculate_roi(
     return roi * 100
 
 
+@tracer.traced("metrics.roe")
 def calculate_roe(df: pd.DataFrame, net_income_col: str, equity_col: str) -> float:
     """
     Calculate the Return on Equity (ROE) of a company.
@@ -218,6 +231,7 @@ def calculate_roe(df: pd.DataFrame, net_income_col: str, equity_col: str) -> flo
     return roe * 100
 
 
+@tracer.traced("metrics.roa")
 def calculate_roa(df: pd.DataFrame, net_income_col: str, assets_col: str) -> float:
     """
     Calculate the Return on Assets (ROA) of a company.
@@ -260,6 +274,7 @@ def calculate_roa(df: pd.DataFrame, net_income_col: str, assets_col: str) -> flo
 
 
 # -- GROWTH INDICATORS --
+@tracer.traced("metrics.revenue_growth")
 def calculate_revenue_growth(
     df: pd.DataFrame, revenue_col: str, date_col: str
 ) -> float:
@@ -305,6 +320,7 @@ def calculate_revenue_growth(
     return revenue_growth * 100
 
 
+@tracer.traced("metrics.net_income_growth")
 def calculate_net_income_growth(
     df: pd.DataFrame, net_income_col: str, date_col: str
 ) -> float:
@@ -355,6 +371,7 @@ def calculate_net_income_growth(
 
 
 # -- FINANCIAL HEALTH INDICATORS --
+@tracer.traced("metrics.ebitda")
 def calculate_ebitda(
     df: pd.DataFrame,
     operating_income_col: str,
@@ -405,6 +422,7 @@ def calculate_ebitda(
     return ebitda
 
 
+@tracer.traced("metrics.debt_ratio")
 def calculate_debt_ratio(df: pd.DataFrame, debt_col: str, assets_col: str) -> float:
     """
     Calculate the Debt Ratio of a company.
@@ -0,0 +1,541 @@
+import re
+import inspect
+import unicodedata
+import pandas as pd
+from functools import lru_cache
+from typing import Callable
+from src.utils.logger import get_logger
+from src.utils.tracing import tracer
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Labels of each line item used by the metric functions (named after their
+#    `<concept>_col` parameters), in English, Portuguese, Spanish, French and German
+CONCEPTS = {
+    "revenue": [
+        "revenue",
+        "net revenue",
+        "operating revenue",
+        "sales",
+        "net sales",
+        "turnover",
+        "receita",
+        "receita liquida",
+        "receita operacional liquida",
+        "receita liquida de vendas",
+        "faturamento",
+        "vendas liquidas",
+        "ingresos",
+        "ingresos netos",
+        "ingresos ordinarios",
+        "ventas",
+        "ventas netas",
+        "chiffre d affaires",
+        "umsatz",
+        "umsatzerlose",
+    ],
+    "cogs": [
+        "cogs",
+        "cost of goods sold",
+        "cost of sales",
+        "cost of revenue",
+        "cost of products sold",
+        "custo dos produtos vendidos",
+        "custo das mercadorias vendidas",
+        "custo dos servicos prestados",
+        "custo das vendas",
+        "cpv",
+        "cmv",
+        "costo de ventas",
+        "costo de los bienes vendidos",
+        "coste de las ventas",
+        "cout des ventes",
+        "umsatzkosten",
+    ],
+    "operating_income": [
+        "operating income",
+        "operating profit",
+        "income from operations",
+        "operating result",
+        "ebit",
+        "lucro operacional",
+        "resultado operacional",
+        "resultado antes do resultado financeiro",
+        "utilidad operativa",
+        "utilidad de operacion",
+        "resultado operativo",
+        "beneficio operativo",
+        "resultat operationnel",
+        "betriebsergebnis",
+    ],
+    "net_income": [
+        "net income",
+        "net profit",
+        "net earnings",
+        "profit for the year",
+        "profit for the period",
+        "lucro liquido",
+        "lucro liquido do exercicio",
+        "lucro liquido do periodo",
+        "resultado liquido",
+        "utilidad neta",
+        "beneficio neto",
+        "resultado neto",
+        "resultat net",
+        "jahresuberschuss",
+    ],
+    "init_investment": [
+        "initial investment",
+        "investment",
+        "capital expenditure",
+        "capex",
+        "investimento",
+        "investimento inicial",
+        "inversion",
+        "inversion inicial",
+        "investissement",
+    ],
+    "equity": [
+        "equity",
+        "shareholders equity",
+        "stockholders equity",
+        "patrimonio liquido",
+        "patrimonio neto",
+        "capitaux propres",
+        "eigenkapital",
+    ],
+    "assets": [
+        "assets",
+        "ativo",
+        "ativo total",
+        "activo",
+        "activo total",
+        "actif",
+        "bilanzsumme",
+    ],
+    "date": [
+        "date",
+        "period",
+        "year",
+        "fiscal year",
+        "quarter",
+        "data",
+        "periodo",
+        "ano",
+        "exercicio",
+        "fecha",
+        "ejercicio",
+        "annee",
+        "jahr",
+    ],
+    "depreciation": [
+        "depreciation",
+        "depreciation amortization",
+        "depreciacao",
+        "depreciacao amortizacao",
+        "depreciacion",
+        "depreciacion amortizacion",
+        "abschreibungen",
+    ],
+    "amortization": [
+        "amortization",
+        "amortisation",
+        "amortizacao",
+        "amortizacion",
+    ],
+    "debt": [
+        "debt",
+        "net debt",
+        "liabilities",
+        "borrowings",
+        "loans borrowings",
+        "divida",
+        "divida liquida",
+        "passivo",
+        "emprestimos financiamentos",
+        "deuda",
+        "pasivo",
+        "dette",
+        "verbindlichkeiten",
+    ],
+}
+
+# -- Line items that are costs, often written as negative numbers (e.g. "(400)")
+COSTS = {"cogs", "depreciation", "amortization"}
+
+# -- Words that do not change the line item of a label
+FILLER_WORDS = {
+    "total",
+    "the",
+    "of",
+    "and",
+    "for",
+    "de",
+    "da",
+    "do",
+    "das",
+    "dos",
+    "del",
+    "la",
+    "las",
+    "el",
+    "los",
+    "e",
+    "y",
+    "et",
+    "des",
+    "du",
+    "und",
+}
+
+# -- Notes, references and punctuation of the labels (e.g. "(Note 3)", "1.", "*")
+NOTES = re.compile(r"\([^)]*\)|\[[^\]]*\]|\bnotes?\b|\bnota\b")
+NON_WORDS = re.compile(r"[^a-z]+")
+
+# -- Names of the columns with the notes of the rows, which are not periods
+NOTE_COLUMN = re.compile(r"^\s*(notes?|notas?|ref\.?)\s*$", re.IGNORECASE)
+
+# -- Currencies, percents and spaces around the numbers (e.g. "R$ 3.000",
+#    "EUR 1.200,50", "12 %")
+CURRENCY = re.compile(r"^[A-Z]{3}(?=\s*[-(\d])|[A-Z]{0,3}[$€£¥]|%|\s")
+
+# -- Numbers with a single separator followed by a group of three digits,
+#    which may be a thousands or a decimal separator (e.g. "1,200" or "3.000")
+AMBIGUOUS_NUMBER = re.compile(r"^-?[1-9]\d{0,2}[.,]\d{3}$")
+
+
+@lru_cache(maxsize=65536)
+def normalize_label(label: str) -> str:
+    """
+    Normalize a label of a table, so its synonyms and translations compare equal.
+
+    Accents, case, notes, numbers, punctuation and filler words are removed, and
+    plural words are made singular (e.g. "Receita Líquida (Nota 4)" becomes
+    "receita liquida", "Total Net Revenues" becomes "net revenue"). The labels
+    are cached, since the same ones repeat across the pages of a filing.
+
+    Parameters:
+        label - str: Label of a row or column
+
+    Returns:
+        str: Normalized label (empty if it has no words)
+    """
+    text = unicodedata.normalize("NFKD", label)
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    text = NON_WORDS.sub(" ", NOTES.sub(" ", text))
+    words = [
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in text.split()
+        if word not in FILLER_WORDS
+    ]
+    return " ".join(words)
+
+
+# -- Normalized labels of the line items
+SYNONYMS = {
+    normalize_label(label): concept
+    for concept, labels in CONCEPTS.items()
+    for label in labels
+}
+
+
+def to_numbers(series: pd.Series) -> pd.Series:
+    """
+    Parse the values of a column as numbers.
+
+    Numbers written as text (e.g. "1,234.5", "(120)", "$ 30", "R$ 1.234,56")
+    are parsed, with the decimal separator of the column detected from its
+    values. Columns where it is ambiguous (e.g. only "1,200" and "3.000") are
+    read with thousands separators, as usual in financial statements.
+
+    Parameters:
+        series - pd.Series: Column of a table
+
+    Returns:
+        pd.Series: Numbers of the column (NaN for the values that are not numbers)
+    """
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return pd.Series(float("nan"), index=series.index)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.astype(float)
+    text = (
+        series.astype("string")
+        .str.strip()
+        .str.replace(CURRENCY, "", regex=True)
+        .str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+    )
+
+    # -- Remove the thousands separators and use dots as decimal separators
+    votes = text.dropna().map(_decimal_separator).value_counts()
+    if votes.get(",", 0) > votes.get(".", 0):
+        text = text.str.replace(".", "", regex=False).str.replace(",", ".")
+    elif votes.get(".", 0):
+        text = text.str.replace(",", "", regex=False)
+    else:
+        text = text.str.replace(r"[.,]", "", regex=True)
+    return pd.to_numeric(text, errors="coerce").astype(float)
+
+
+def _decimal_separator(value: str) -> str | None:
+    """
+    Get the decimal separator of a number written as text.
+
+    Parameters:
+        value - str: Number without currencies and spaces
+
+    Returns:
+        str | None: Decimal separator, or None when the number has none or it
+            is ambiguous (e.g. "1,200")
+    """
+    separators = [char for char in value if char in ".,"]
+    if not separators or AMBIGUOUS_NUMBER.match(value):
+        return None
+    # -- The last separator is the decimal one, unless it is repeated
+    #    (e.g. "1.234,56" or "1.234.567")
+    last = separators[-1]
+    if separators.count(last) > 1:
+        return "," if last == "." else "."
+    return last
+
+
+def match_label(label) -> str | None:
+    """
+    Get the line item of a label.
+
+    Parameters:
+        label - Any: Label of a row or column (values that are not text never match)
+
+    Returns:
+        str | None: Line item of the label (see CONCEPTS), or None
+    """
+    if not isinstance(label, str):
+        return None
+    return SYNONYMS.get(normalize_label(label))
+
+
+class LineItemLocator:
+    """
+    Index of the line items of the tables extracted from a report.
+
+    Every table is scanned once, matching its column names (one column per line
+    item, one row per period) and the labels of its rows (one row per line item,
+    one column per period) against the synonyms of each line item. The located
+    values are then arranged as the data frame and column names that the
+    metric functions take.
+
+    Attributes:
+        tables - dict[str, pd.DataFrame]: Tables of the report by name
+
+    Methods:
+        concepts: List the located line items
+        locations: Get the locations of a line item
+        inputs: Get the data frame and column names of some line items
+        inputs_for: Get the data frame and column names of a metric function
+    """
+
+    def __init__(self, tables: dict[str, pd.DataFrame]) -> None:
+        """
+        Initialize the LineItemLocator class, indexing the tables.
+
+        Parameters:
+            tables - dict[str, pd.DataFrame]: Tables of the report by name
+        """
+        self.tables = tables
+        self._index: dict[str, list[dict]] = {}
+        with tracer.span("line_items.index", tables=len(tables)):
+            for table_name, df in tables.items():
+                if df.empty:
+                    continue
+                self._index_columns(table_name, df)
+                self._index_rows(table_name, df)
+        logger.info(
+            f"{sum(len(found) for found in self._index.values())} line items "
+            f"located in {len(tables)} tables"
+        )
+
+    def concepts(self) -> list[str]:
+        """
+        List the located line items.
+
+        Returns:
+            list[str]: Line items with at least one location
+        """
+        return list(self._index)
+
+    def locations(self, concept: str) -> list[dict]:
+        """
+        Get the locations of a line item, in the order of the tables.
+
+        Parameters:
+            concept - str: Line item (see CONCEPTS)
+
+        Returns:
+            list[dict]: Table, row (None for a column), column (None for a row),
+                original label and values by period of each location
+        """
+        return self._index.get(concept, [])
+
+    def inputs(self, *concepts: str) -> tuple[pd.DataFrame, dict[str, str]]:
+        """
+        Get the data frame and column names of some line items.
+
+        The line items are taken from the table that has most of them, and the
+        rest from the first table that has each one. The values are aligned by
+        period, with one row per period and the periods in a "period" column,
+        which is also the column of the date.
+
+        Parameters:
+            *concepts - str: Line items (see CONCEPTS)
+
+        Returns:
+            tuple[pd.DataFrame, dict[str, str]]: Values of the line items, and
+                the column of each one by parameter name (e.g. "revenue_col")
+
+        Raises:
+            ValueError: If a line item is unknown
+            KeyError: If a line item is not found in the tables
+        """
+        unknown = [concept for concept in concepts if concept not in CONCEPTS]
+        if unknown:
+            raise ValueError(f"Unknown line items: {unknown}")
+        values = [concept for concept in concepts if concept != "date"]
+        missing = [concept for concept in values if concept not in self._index]
+        if missing:
+            logger.error(f"Line items not found in the tables: {missing}")
+            raise KeyError(f"Line items not found in the tables: {missing}")
+
+        # -- Prefer the table with most of the line items, so they share periods
+        counts: dict[str, int] = {}
+        for concept in values:
+            for table_name in dict.fromkeys(
+                loc["table"] for loc in self._index[concept]
+            ):
+                counts[table_name] = counts.get(table_name, 0) + 1
+        best = max(counts, key=counts.get, default=None)
+
+        columns = {}
+        for concept in values:
+            found = self._index[concept]
+            location = next((loc for loc in found if loc["table"] == best), found[0])
+            columns[concept] = location["values"]
+
+        df = pd.concat(columns, axis=1) if columns else pd.DataFrame()
+        df = df.rename_axis("period").reset_index()
+        names = {f"{concept}_col": concept for concept in values}
+        if "date" in concepts:
+            names["date_col"] = "period"
+        return df, names
+
+    def inputs_for(self, metric: Callable) -> tuple[pd.DataFrame, dict[str, str]]:
+        """
+        Get the data frame and column names of a metric function.
+
+        The line items are the `<concept>_col` parameters of the function, so
+        its result is computed as `metric(df, **columns)`.
+
+        Parameters:
+            metric - Callable: Metric function (e.g. calculate_gross_margin)
+
+        Returns:
+            tuple[pd.DataFrame, dict[str, str]]: Result of inputs
+
+        Raises:
+            ValueError: If a line item of the function is unknown
+            KeyError: If a line item of the function is not found in the tables
+        """
+        concepts = [
+            name.removesuffix("_col")
+            for name in inspect.signature(metric).parameters
+            if name.endswith("_col")
+        ]
+        return self.inputs(*concepts)
+
+    def _add(self, concept: str, location: dict) -> None:
+        """
+        Add a location of a line item to the index.
+
+        Parameters:
+            concept - str: Line item
+            location - dict: Location of the line item
+        """
+        values = location["values"].dropna()
+        values = values[~values.index.duplicated()]
+        if values.empty:
+            return
+        if concept in COSTS:
+            values = values.abs()
+        location["values"] = values
+        self._index.setdefault(concept, []).append(location)
+
+    def _index_columns(self, table_name: str, df: pd.DataFrame) -> None:
+        """
+        Index the columns of a table named after a line item.
+
+        Parameters:
+            table_name - str: Name of the table
+            df - pd.DataFrame: Table
+        """
+        matches = {column: match_label(column) for column in df.columns}
+        dates = [column for column, concept in matches.items() if concept == "date"]
+        if not any(concept not in (None, "date") for concept in matches.values()):
+            return
+
+        periods = (
+            pd.Index(df[dates[0]].astype(str)) if dates else pd.RangeIndex(len(df))
+        )
+        for column, concept in matches.items():
+            if concept is None or concept == "date":
+                continue
+            values = pd.Series(to_numbers(df[column]).to_numpy(), index=periods)
+            self._add(
+                concept,
+                {
+                    "table": table_name,
+                    "row": None,
+                    "column": column,
+                    "label": column,
+                    "values": values,
+                },
+            )
+
+    def _index_rows(self, table_name: str, df: pd.DataFrame) -> None:
+        """
+        Index the rows of a table labeled after a line item.
+
+        The labels are the values of the first column without numbers, and the
+        names of the columns with numbers are the periods of the values.
+
+        Parameters:
+            table_name - str: Name of the table
+            df - pd.DataFrame: Table
+        """
+        label_col = None
+        numbers = {}
+        for idx, column in enumerate(df.columns):
+            if isinstance(column, str) and NOTE_COLUMN.match(column):
+                continue
+            parsed = to_numbers(df.iloc[:, idx])
+            if parsed.notna().any():
+                numbers[str(column)] = parsed.to_numpy()
+            elif label_col is None:
+                label_col = idx
+        if label_col is None or not numbers:
+            return
+
+        labels = df.iloc[:, label_col].tolist()
+        values = pd.DataFrame(numbers)
+        for row, label in enumerate(labels):
+            concept = match_label(label)
+            if concept is None or concept == "date":
+                continue
+            self._add(
+                concept,
+                {
+                    "table": table_name,
+                    "row": row,
+                    "column": None,
+                    "label": label,
+                    "values": values.iloc[row],
+                },
+            )
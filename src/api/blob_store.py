@@ -0,0 +1,106 @@
+import os
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+
+class BlobStore:
+    """
+    Content-addressed storage of uploads, keeping identical bytes only once.
+
+    Blobs are stored by the SHA-256 of their content, on a subdirectory named
+    after the first characters of the hash.
+
+    Attributes:
+        root - Path: Directory of the blobs
+        stats - dict: Number of puts and dedup hits, bytes written and saved
+
+    Methods:
+        put: Store a content, unless an identical one is already stored
+        path: Get the path of a blob
+        hit_rate: Get the ratio of puts served by a stored blob
+    """
+
+    def __init__(self, root: Path) -> None:
+        """
+        Initialize the BlobStore class.
+
+        Parameters:
+            root - Path: Directory of the blobs
+        """
+        self.root = root
+        self.stats = {"puts": 0, "hits": 0, "bytes_written": 0, "bytes_saved": 0}
+        self._lock = threading.Lock()
+
+    def path(self, digest: str, suffix: str = "") -> Path:
+        """
+        Get the path of a blob.
+
+        Parameters:
+            digest - str: SHA-256 of the content
+            suffix - str: Suffix of the file (e.g. ".pdf")
+
+        Returns:
+            Path: Path of the blob
+        """
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def put(
+        self, content: bytes | memoryview, suffix: str = "", digest: str | None = None
+    ) -> Path:
+        """
+        Store a content, unless an identical one is already stored.
+
+        Parameters:
+            content - bytes | memoryview: Content of the file
+            suffix - str: Suffix of the file (e.g. ".pdf")
+            digest - str | None: SHA-256 of the content, if already computed
+
+        Returns:
+            Path: Path of the blob
+        """
+        digest = digest or hashlib.sha256(content).hexdigest()
+        file_path = self.path(digest, suffix)
+        size = memoryview(content).nbytes
+
+        # -- Reuse the stored blob
+        if file_path.exists():
+            os.utime(file_path)
+            with self._lock:
+                self.stats["puts"] += 1
+                self.stats["hits"] += 1
+                self.stats["bytes_saved"] += size
+            logger.debug(f"Blob {digest} already stored ({size} bytes saved)")
+            return file_path
+
+        # -- Write the blob atomically
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, file_path)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self.stats["puts"] += 1
+            self.stats["bytes_written"] += size
+        return file_path
+
+    def hit_rate(self) -> float:
+        """
+        Get the ratio of puts served by a stored blob.
+
+        Returns:
+            float: Hit rate between 0 and 1
+        """
+        with self._lock:
+            puts = self.stats["puts"]
+            return self.stats["hits"] / puts if puts else 0.0
@@ -0,0 +1,269 @@
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import tempfile
+import threading
+import importlib.util
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+from src.extract.arrow_tables import open_tables
+from src.extract.extractor import DataExtractor
+from src.utils.logger import get_logger
+from src.utils.tracing import tracer
+
+# -- Get the logger
+logger = get_logger()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extraction results keyed by file content and configuration.
+
+    The memory tier keeps the most recently used results with LRU eviction and
+    the optional disk tier keeps pickled results shared between app restarts.
+    On disk, the tables of each result are written as Arrow IPC files and
+    reopened memory-mapped, so results are loaded without reading their tables
+    and processes loading the same result share its pages in the OS page cache.
+    Entries on disk are never rewritten, since other processes may map them.
+
+    Attributes:
+        max_entries - int: Maximum number of results in memory
+        cache_dir - Path | None: Directory of the disk tier
+        arrow - bool: Flag to write the tables on disk as Arrow IPC files
+            (only when pyarrow is installed)
+        stats - dict: Number of memory hits, disk hits and misses
+
+    Methods:
+        key: Build the cache key of an upload
+        get: Get a cached result
+        get_or_extract: Get a cached result or extract it once
+        put: Store a result
+        hit_rate: Get the ratio of lookups served by the cache
+        clear: Remove the results from memory
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        cache_dir: Path | None = None,
+        arrow: bool = True,
+    ) -> None:
+        """
+        Initialize the ExtractionCache class.
+
+        Parameters:
+            max_entries - int: Maximum number of results in memory
+            cache_dir - Path | None: Directory of the disk tier
+            arrow - bool: Flag to write the tables on disk as Arrow IPC files
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.arrow = arrow and importlib.util.find_spec("pyarrow") is not None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._entries: OrderedDict[str, DataExtractor] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+        # -- Create the directory of the disk tier
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(content: bytes | memoryview, file_name: str, config: dict) -> str:
+        """
+        Build the cache key of an upload.
+
+        Parameters:
+            content - bytes | memoryview: Content of the file
+            file_name - str: Name of the file
+            config - dict: Configuration for the extractor
+
+        Returns:
+            str: Hash of the content, file format and configuration
+        """
+        digest = hashlib.sha256(content)
+        digest.update(Path(file_name).suffix.lower().encode("utf-8"))
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> DataExtractor | None:
+        """
+        Get a cached result, promoting disk hits to the memory tier.
+
+        Parameters:
+            key - str: Cache key
+
+        Returns:
+            DataExtractor | None: Cached extractor, or None on a miss
+        """
+        extractor, tier = self._lookup(key)
+        with self._lock:
+            self.stats[tier] += 1
+        return extractor
+
+    def get_or_extract(
+        self, key: str, extract: Callable[[], DataExtractor]
+    ) -> DataExtractor:
+        """
+        Get a cached result or extract it once, even for concurrent lookups.
+
+        Sessions looking up the same key at the same time wait for the first
+        extraction and share its result.
+
+        Parameters:
+            key - str: Cache key
+            extract - Callable[[], DataExtractor]: Function to extract the data
+
+        Returns:
+            DataExtractor: Cached or extracted extractor
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with tracer.span("cache.get_or_extract") as span, key_lock:
+                extractor, tier = self._lookup(key)
+                if extractor is None:
+                    extractor = extract()
+                    self.put(key, extractor)
+                span.set(tier=tier)
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+        with self._lock:
+            self.stats[tier] += 1
+        return extractor
+
+    def hit_rate(self) -> float:
+        """
+        Get the ratio of lookups served by the cache.
+
+        Returns:
+            float: Hit rate between 0 and 1
+        """
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return hits / lookups if lookups else 0.0
+
+    def put(self, key: str, extractor: DataExtractor) -> None:
+        """
+        Store a result in the cache.
+
+        Parameters:
+            key - str: Cache key
+            extractor - DataExtractor: Extractor with the extracted data
+        """
+        self._remember(key, extractor)
+        self._dump(key, extractor)
+
+    def clear(self) -> None:
+        """
+        Remove the results from the memory tier.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: str) -> tuple[DataExtractor | None, str]:
+        """
+        Look up the memory and disk tiers, promoting disk hits to memory.
+
+        Parameters:
+            key - str: Cache key
+
+        Returns:
+            tuple[DataExtractor | None, str]: Cached extractor and stats counter
+        """
+        # -- Look up the memory tier
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key], "memory_hits"
+
+        # -- Look up the disk tier
+        extractor = self._load(key)
+        if extractor is None:
+            return None, "misses"
+        self._remember(key, extractor)
+        return extractor, "disk_hits"
+
+    def _remember(self, key: str, extractor: DataExtractor) -> None:
+        """
+        Store a result in the memory tier, evicting the least recently used.
+
+        Parameters:
+            key - str: Cache key
+            extractor - DataExtractor: Extractor with the extracted data
+        """
+        with self._lock:
+            self._entries[key] = extractor
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug(f"Extraction result evicted from memory: {evicted}")
+
+    def _load(self, key: str) -> DataExtractor | None:
+        """
+        Load a result from the disk tier, memory-mapping its tables.
+
+        Parameters:
+            key - str: Cache key
+
+        Returns:
+            DataExtractor | None: Cached extractor, or None if not on disk
+        """
+        if self.cache_dir is None:
+            return None
+
+        entry = self.cache_dir / key
+        try:
+            with open(entry / "extractor.pkl", "rb") as f:
+                extractor, paths = pickle.load(f)
+            tables = open_tables(entry)
+            if set(tables) != set(paths):
+                raise ValueError("Missing tables")
+            if tables:
+                extractor.map_tables(tables)
+            return extractor
+        except FileNotFoundError:
+            return None
+        except (
+            pickle.UnpicklingError,
+            EOFError,
+            AttributeError,
+            KeyError,
+            ValueError,
+            OSError,
+        ) as e:
+            logger.error(f"Error loading cached extraction {entry}: {e}")
+            return None
+
+    def _dump(self, key: str, extractor: DataExtractor) -> None:
+        """
+        Write a result to the disk tier atomically, with its tables as Arrow files.
+
+        Parameters:
+            key - str: Cache key
+            extractor - DataExtractor: Extractor with the extracted data
+        """
+        if self.cache_dir is None:
+            return
+
+        # -- Write to a temporary directory and move it to the final path
+        entry = self.cache_dir / key
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp"))
+        try:
+            # -- The extractor is stored with the keys of its tables in Arrow files
+            stored = extractor.dump_tables(tmp_dir) if self.arrow else (extractor, [])
+            with open(tmp_dir / "extractor.pkl", "wb") as f:
+                pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_dir, entry)
+        except OSError as e:
+            # -- Entries written by other processes are kept, since they may be mapped
+            if not entry.exists():
+                logger.error(f"Error writing cached extraction: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
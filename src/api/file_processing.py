@@ -1,25 +1,231 @@
-from pathlib import Path
+import sqlite3
+import threading
+import pandas as pd
 from io import BytesIO
+from src.api.extraction_cache import ExtractionCache
+from src.api.report_store import ReportStore
+from src.api.staging import UploadStaging
+from src.api.text_index import TextIndex
+from src.config import settings
 from src.extract.extractor import DataExtractor
+from src.extract.progress import ProgressCallback
+from src.utils.logger import get_logger
 
-def process_uploaded_file(uploaded_file: BytesIO, config: dict) -> DataExtractor:
+# -- Get the logger
+logger = get_logger()
+
+# -- Cache of extraction results shared by the Streamlit reruns and sessions
+extraction_cache = ExtractionCache(
+    settings.CACHE_MAX_ENTRIES, settings.CACHE_DIR, settings.CACHE_ARROW
+)
+
+# -- Local store of the extracted reports (disabled when no path is set)
+report_store = ReportStore(settings.STORE_PATH) if settings.STORE_PATH else None
+
+# -- Full-text index of the texts of the PDF uploads
+text_index = TextIndex(settings.INDEX_DIR, settings.INDEX_MAX_SEGMENTS)
+
+# -- Staging of the uploads that must be on disk for the extraction (only
+#    these are deduplicated on disk by its blob store)
+upload_staging = UploadStaging(
+    settings.TEMP_DIR / "staging",
+    settings.STAGING_MAX_AGE,
+    settings.STAGING_MAX_BYTES,
+    settings.STAGING_JANITOR_INTERVAL,
+)
+
+# -- Counters of the uploaded and extracted bytes for the deduplication metrics
+_upload_stats = {"uploads": 0, "uploaded_bytes": 0, "extracted_bytes": 0}
+_stats_lock = threading.Lock()
+
+
+def process_uploaded_file(
+    uploaded_file: BytesIO,
+    config: dict,
+    cache: ExtractionCache | None = None,
+    session_id: str | None = None,
+    progress: ProgressCallback | None = None,
+    store: ReportStore | None = None,
+    company: str | None = None,
+    period: str | None = None,
+    index: TextIndex | None = None,
+) -> DataExtractor:
     """
     Process the uploaded file and extract data from it.
 
+    The result is cached by the content of the file and the configuration, so
+    reruns of the page and other sessions with the same upload share a single
+    extraction, even when they upload it at the same time. The
+    file is read from the upload buffer, and only staged on disk when the
+    extractor needs a path. With a report store, the tables of the file are
+    also stored by the cache key, so they can be queried in later sessions,
+    and the texts of PDF files are added to the full-text index.
+
     Parameters:
         uploaded_file - BytesIO: Uploaded file
         config - dict: Configuration for the extractor
+        cache - ExtractionCache | None: Cache of results (defaults to the shared one)
+        session_id - str | None: Session of the upload, to stage it per session
+        progress - ProgressCallback | None: Callback called after each page
+        store - ReportStore | None: Store of the reports (defaults to the shared
+            one, if enabled)
+        company - str | None: Company of the report, for the store
+        period - str | None: Period of the report, for the store
+        index - TextIndex | None: Full-text index of the PDF texts (defaults
+            to the shared one)
 
     Returns:
         DataExtractor: Extractor object with the extracted data
     """
-    # -- Save the uploaded file
-    # TODO: Set the temp directory on a file with environment variables
-    # TODO: Get the temp directory from the config saved in session state
-    file_path = Path("data/temp") / uploaded_file.name
-    file_path.write_bytes(uploaded_file.getvalue())
-    
-    # -- Extract data from the file
-    extractor = DataExtractor(file_path, config)
+    # -- Get the result from the cache, extracting identical uploads only once
+    cache = cache or extraction_cache
+    content = uploaded_file.getbuffer()
+    key = cache.key(content, uploaded_file.name, config)
+    _count_upload("uploaded_bytes", content.nbytes)
+
+    def extract() -> DataExtractor:
+        """
+        Extract data from the upload buffer or from the staged file.
+
+        Returns:
+            DataExtractor: Extractor object with the extracted data
+        """
+        _count_upload("extracted_bytes", content.nbytes)
+        if DataExtractor.requires_path(uploaded_file.name, config):
+            upload_staging.start_janitor()
+            with upload_staging.staged(content, uploaded_file.name, session_id) as path:
+                return DataExtractor(path, config, uploaded_file.name, progress).load()
+        return DataExtractor(content, config, uploaded_file.name, progress).load()
+
+    extractor = cache.get_or_extract(key, extract)
+
+    # -- Store the report, unless it is already stored with the same details
+    store = store or report_store
+    if store is not None:
+        _store_report(store, key, extractor, company, period)
+
+    # -- Index the texts of the pages, once per upload
+    index = index or text_index
+    if extractor.file_format == "pdf" and not index.has(key):
+        index.add(key, extractor.file_name, extractor.texts)
+    return extractor
+
+
+def extracted_tables(extractor: DataExtractor) -> dict[str, pd.DataFrame]:
+    """
+    Get the tables extracted from a file, named by sheet, page or record path.
+
+    Tables memory-mapped from the disk tier of the cache are not copied.
+
+    Parameters:
+        extractor - DataExtractor: Extractor object with the extracted data
+
+    Returns:
+        dict[str, pd.DataFrame]: Tables of the file (empty if it has no tables)
+    """
+    tables = {}
+    for path, df in extractor.frames().items():
+        if extractor.file_format == "pdf":
+            tables[f"Page {path[-1] + 1}"] = df
+        elif path:
+            tables[path[-1]] = df
+        else:
+            tables[extractor.file_name] = df
+    return tables
+
+
+def combine_tables(extractors: dict[str, DataExtractor]) -> pd.DataFrame:
+    """
+    Combine the tables extracted from several files into one dataset.
 
-    return extractor
\ No newline at end of file
+    Columns with the same name are aligned and missing ones are left empty.
+
+    Parameters:
+        extractors - dict[str, DataExtractor]: Extractors by a unique key (e.g.
+            the extraction job), so files with the same name are all combined
+
+    Returns:
+        pd.DataFrame: Rows of every table, with the source file and table names
+    """
+    frames = []
+    for extractor in extractors.values():
+        for table_name, df in extracted_tables(extractor).items():
+            frames.append(
+                df.reset_index(drop=True).assign(
+                    source_file=extractor.file_name, source_table=table_name
+                )
+            )
+    if not frames:
+        return pd.DataFrame(columns=["source_file", "source_table"])
+
+    # -- Move the source columns to the front
+    combined = pd.concat(frames, ignore_index=True)
+    columns = ["source_file", "source_table"]
+    return combined[columns + [col for col in combined.columns if col not in columns]]
+
+
+def dedup_stats() -> dict:
+    """
+    Get the deduplication metrics of the uploads.
+
+    The extraction metrics cover every upload, while the staging ones only
+    cover the uploads staged on disk (scanned PDFs and Excel files with many
+    sheets), since the others are extracted from memory without being stored.
+
+    Returns:
+        dict: Hit rates of the extraction cache and of the blob store of the
+            staged uploads, with the bytes that were not extracted or stored again
+    """
+    blob_store = upload_staging.blob_store
+    with _stats_lock:
+        uploads = _upload_stats["uploads"]
+        saved = _upload_stats["uploaded_bytes"] - _upload_stats["extracted_bytes"]
+    return {
+        "uploads": uploads,
+        "extractions": extraction_cache.stats["misses"],
+        "extraction_hit_rate": extraction_cache.hit_rate(),
+        "extraction_bytes_saved": saved,
+        "staged_uploads": blob_store.stats["puts"],
+        "staging_hit_rate": blob_store.hit_rate(),
+        "staging_bytes_saved": blob_store.stats["bytes_saved"],
+    }
+
+
+def _store_report(
+    store: ReportStore,
+    report_id: str,
+    extractor: DataExtractor,
+    company: str | None,
+    period: str | None,
+) -> None:
+    """
+    Store the tables of a report, logging the errors of the store.
+
+    Parameters:
+        store - ReportStore: Store of the reports
+        report_id - str: Identifier of the report
+        extractor - DataExtractor: Extractor object with the extracted data
+        company - str | None: Company of the report
+        period - str | None: Period of the report
+    """
+    try:
+        stored = store.get(report_id)
+        if stored and (stored["company"], stored["period"]) == (company, period):
+            return
+        store.add(report_id, extractor, extracted_tables(extractor), company, period)
+    except sqlite3.Error as e:
+        logger.error(f"Error storing {extractor.file_name}: {e}")
+
+
+def _count_upload(counter: str, size: int) -> None:
+    """
+    Count an upload on the deduplication metrics.
+
+    Parameters:
+        counter - str: Counter of bytes ("uploaded_bytes" or "extracted_bytes")
+        size - int: Size of the upload in bytes
+    """
+    with _stats_lock:
+        _upload_stats[counter] += size
+        if counter == "uploaded_bytes":
+            _upload_stats["uploads"] += 1
@@ -0,0 +1,238 @@
+import time
+import uuid
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+from src.config import settings
+from src.extract.extractor import DataExtractor
+from src.extract.progress import ExtractionCancelled, ProgressCallback
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+
+class ExtractionJob:
+    """
+    Class representing an extraction running in the background.
+
+    Attributes:
+        job_id - str: Identifier of the job
+        name - str: Name of the extracted file
+        status - str: Status of the job (pending, running, done, failed or cancelled)
+        pages_done - int: Number of pages extracted
+        total_pages - int: Number of pages of the file (0 while unknown)
+        partial - dict: Data extracted so far
+        result - DataExtractor | None: Extractor with the data, when done
+        error - str | None: Error message, when failed
+        accessed - float: Monotonic time of the last access to the job
+
+    Methods:
+        progress: Progress callback given to the extractor
+        cancel: Request the cancellation of the job
+        finished: Check if the job is no longer running
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the ExtractionJob class.
+
+        Parameters:
+            name - str: Name of the extracted file
+        """
+        self.job_id = uuid.uuid4().hex
+        self.name = name
+        self.status = "pending"
+        self.pages_done = 0
+        self.total_pages = 0
+        self.partial: dict = {}
+        self.result: DataExtractor | None = None
+        self.error: str | None = None
+        self.future: Future | None = None
+        self.accessed = time.monotonic()
+        self._cancelled = threading.Event()
+
+    def progress(self, page: int, total: int, partial: dict) -> None:
+        """
+        Record the progress of the extraction, stopping it when cancelled.
+
+        Parameters:
+            page - int: Index of the extracted page
+            total - int: Number of pages of the file
+            partial - dict: Data extracted so far
+
+        Raises:
+            ExtractionCancelled: If the job was cancelled
+        """
+        self.pages_done = page + 1
+        self.total_pages = total
+        self.partial = partial
+        if self._cancelled.is_set():
+            raise ExtractionCancelled(f"Extraction of {self.name} was cancelled")
+
+    def cancel(self) -> None:
+        """
+        Request the cancellation of the job, effective after the current page.
+        """
+        self._cancelled.set()
+        if self.future is not None and self.future.cancel():
+            self.status = "cancelled"
+
+    def finished(self) -> bool:
+        """
+        Check if the job is no longer running.
+
+        Returns:
+            bool: True if the job is done, failed or cancelled
+        """
+        return self.status in ["done", "failed", "cancelled"]
+
+
+class JobManager:
+    """
+    Class responsible for running extractions on a bounded pool of threads.
+
+    Jobs are kept by identifier, so they survive the reruns of the Streamlit
+    pages, which poll their progress. Finished jobs not accessed for max_age
+    seconds, and the least recently accessed ones over max_finished, are
+    removed with their results, so the jobs of abandoned sessions do not pile up.
+
+    Attributes:
+        max_workers - int: Maximum number of concurrent extractions
+        max_age - float: Seconds a finished job is kept without being accessed
+        max_finished - int: Maximum number of finished jobs kept
+
+    Methods:
+        submit: Submit an extraction to the pool
+        get: Get a job by identifier
+        cancel: Cancel a job by identifier
+        forget: Remove a finished job
+    """
+
+    def __init__(
+        self, max_workers: int = 2, max_age: float = 3600, max_finished: int = 64
+    ) -> None:
+        """
+        Initialize the JobManager class.
+
+        Parameters:
+            max_workers - int: Maximum number of concurrent extractions
+            max_age - float: Seconds a finished job is kept without being accessed
+            max_finished - int: Maximum number of finished jobs kept
+        """
+        self.max_workers = max_workers
+        self.max_age = max_age
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="extraction"
+        )
+        self._jobs: dict[str, ExtractionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, name: str, extract: Callable[[ProgressCallback], DataExtractor]
+    ) -> ExtractionJob:
+        """
+        Submit an extraction to the pool.
+
+        Parameters:
+            name - str: Name of the extracted file
+            extract - Callable[[ProgressCallback], DataExtractor]: Function to
+                extract the data, receiving the progress callback of the job
+
+        Returns:
+            ExtractionJob: Job of the extraction
+        """
+        job = ExtractionJob(name)
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job, extract)
+        logger.debug(f"Extraction job {job.job_id} submitted for {name}")
+        return job
+
+    def get(self, job_id: str) -> ExtractionJob | None:
+        """
+        Get a job by identifier.
+
+        Parameters:
+            job_id - str: Identifier of the job
+
+        Returns:
+            ExtractionJob | None: Job, or None if it does not exist
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.accessed = time.monotonic()
+            return job
+
+    def cancel(self, job_id: str) -> None:
+        """
+        Cancel a job by identifier.
+
+        Parameters:
+            job_id - str: Identifier of the job
+        """
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def forget(self, job_id: str) -> None:
+        """
+        Remove a finished job, cancelling it if it is still running.
+
+        Parameters:
+            job_id - str: Identifier of the job
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None and not job.finished():
+            job.cancel()
+
+    def _prune(self) -> None:
+        """
+        Remove the finished jobs not accessed recently or over the limit.
+
+        Must be called with the lock held.
+        """
+        now = time.monotonic()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished()),
+            key=lambda job: job.accessed,
+        )
+        excess = len(finished) - self.max_finished
+        for idx, job in enumerate(finished):
+            if idx < excess or now - job.accessed > self.max_age:
+                del self._jobs[job.job_id]
+                logger.debug(f"Extraction job {job.job_id} of {job.name} pruned")
+
+    def _run(
+        self, job: ExtractionJob, extract: Callable[[ProgressCallback], DataExtractor]
+    ) -> None:
+        """
+        Run an extraction, recording its result on the job.
+
+        Parameters:
+            job - ExtractionJob: Job of the extraction
+            extract - Callable[[ProgressCallback], DataExtractor]: Function to
+                extract the data, receiving the progress callback of the job
+        """
+        job.status = "running"
+        try:
+            job.result = extract(job.progress)
+            job.status = "done"
+        except ExtractionCancelled as e:
+            logger.info(str(e))
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Extraction job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+
+
+# -- Jobs shared by the Streamlit reruns and sessions
+job_manager = JobManager(
+    settings.JOB_WORKERS, settings.JOB_MAX_AGE, settings.JOB_MAX_FINISHED
+)
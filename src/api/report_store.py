@@ -0,0 +1,368 @@
+import re
+import json
+import sqlite3
+import threading
+import pandas as pd
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+from src.analysis.line_items import to_numbers
+from src.extract.extractor import DataExtractor
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Names of the columns with the company, the period and the line item of a row
+COMPANY_COLUMNS = ["company", "company_name", "entity", "ticker"]
+PERIOD_COLUMNS = ["period", "date", "year", "quarter", "fiscal_year", "fiscal_period"]
+LINE_ITEM_COLUMNS = ["line_item", "item", "account", "metric", "description"]
+
+# -- Column names that are periods (e.g. "2024", "Q1 2024", "2024-Q1", "FY2023")
+PERIOD_NAME = re.compile(
+    r"^(FY\s?)?(19|20)\d{2}$|^Q[1-4][\s-]?(19|20)\d{2}$|^(19|20)\d{2}[\s-]?Q[1-4]$",
+    re.IGNORECASE,
+)
+
+# -- Schema of the store, with the indexes of the queries
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    report_id TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    file_format TEXT NOT NULL,
+    company TEXT COLLATE NOCASE,
+    period TEXT,
+    config TEXT NOT NULL,
+    tables INTEGER NOT NULL,
+    stored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS line_items (
+    report_id TEXT NOT NULL REFERENCES reports (report_id) ON DELETE CASCADE,
+    table_name TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    company TEXT COLLATE NOCASE,
+    period TEXT,
+    line_item TEXT COLLATE NOCASE,
+    metric TEXT NOT NULL COLLATE NOCASE,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS line_items_company ON line_items (company, period, line_item);
+CREATE INDEX IF NOT EXISTS line_items_period ON line_items (period, line_item);
+CREATE INDEX IF NOT EXISTS line_items_line_item ON line_items (line_item, period);
+CREATE INDEX IF NOT EXISTS line_items_report ON line_items (report_id);
+"""
+
+
+class ReportStore:
+    """
+    Local analytical store of the extracted reports, on an embedded SQLite database.
+
+    The tables of each report are normalized to line items: one row per numeric
+    value, with the company, the period, the line item (label of the row) and
+    the metric (name of the column). The database is only created on first use.
+
+    Attributes:
+        db_path - Path: Path of the database file
+
+    Methods:
+        add: Store the tables of a report, replacing a previous version
+        get: Get a stored report
+        delete: Remove a report and its line items
+        reports: List the stored reports
+        query: Query the line items by company, period, line item and metric
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Initialize the ReportStore class.
+
+        Parameters:
+            db_path - Path: Path of the database file
+        """
+        self.db_path = db_path
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        report_id: str,
+        extractor: DataExtractor,
+        tables: dict[str, pd.DataFrame],
+        company: str | None = None,
+        period: str | None = None,
+    ) -> int:
+        """
+        Store the tables of a report, replacing a previous version.
+
+        Parameters:
+            report_id - str: Identifier of the report (e.g. its cache key)
+            extractor - DataExtractor: Extractor object with the extracted data
+            tables - dict[str, pd.DataFrame]: Tables of the report by name
+            company - str | None: Company of the report (rows with a company
+                column use its value)
+            period - str | None: Period of the report (rows with a period column
+                and columns named after a period use their value)
+
+        Returns:
+            int: Number of line items stored
+        """
+        rows = [
+            (report_id, *row)
+            for table_name, df in tables.items()
+            for row in normalize_table(df, table_name, company, period)
+        ]
+        report = (
+            report_id,
+            extractor.file_name,
+            extractor.file_format,
+            company,
+            period,
+            json.dumps(extractor.config, sort_keys=True, default=str),
+            len(tables),
+            datetime.now(timezone.utc).isoformat(),
+        )
+
+        # -- Replace the report and its line items in one transaction
+        with self._connect() as conn:
+            conn.execute("DELETE FROM reports WHERE report_id = ?", (report_id,))
+            conn.execute("INSERT INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?)", report)
+            conn.executemany(
+                "INSERT INTO line_items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        logger.info(f"{len(rows)} line items of {extractor.file_name} stored")
+        return len(rows)
+
+    def get(self, report_id: str) -> dict | None:
+        """
+        Get a stored report.
+
+        Parameters:
+            report_id - str: Identifier of the report
+
+        Returns:
+            dict | None: File, format, company, period and number of tables of
+                the report, or None if it is not stored
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT file_name, file_format, company, period, tables "
+                "FROM reports WHERE report_id = ?",
+                (report_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(
+            zip(["file_name", "file_format", "company", "period", "tables"], row)
+        )
+
+    def delete(self, report_id: str) -> None:
+        """
+        Remove a report and its line items.
+
+        Parameters:
+            report_id - str: Identifier of the report
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM reports WHERE report_id = ?", (report_id,))
+
+    def reports(self) -> pd.DataFrame:
+        """
+        List the stored reports, most recent first.
+
+        Returns:
+            pd.DataFrame: Identifier, file, format, company, period, number of
+                tables and storage date of each report
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT report_id, file_name, file_format, company, period, tables, "
+                "stored_at FROM reports ORDER BY stored_at DESC",
+                conn,
+            )
+
+    def query(
+        self,
+        company: str | None = None,
+        period: str | None = None,
+        line_item: str | None = None,
+        metric: str | None = None,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Query the line items of the stored reports, using the indexes.
+
+        Company, line item and metric are matched ignoring the case, and the
+        period matches its prefix (e.g. "2023" matches "2023-05-01").
+
+        Parameters:
+            company - str | None: Company of the line items
+            period - str | None: Period, or prefix of the period
+            line_item - str | None: Label of the line items (e.g. "Revenue")
+            metric - str | None: Name of the column of the values
+            limit - int | None: Maximum number of line items
+
+        Returns:
+            pd.DataFrame: Line items with the file name of their report
+        """
+        conditions = []
+        params: list = []
+        for column, value in [
+            ("company", company),
+            ("line_item", line_item),
+            ("metric", metric),
+        ]:
+            if value is not None:
+                conditions.append(f"li.{column} = ?")
+                params.append(value)
+        if period is not None:
+            # -- Range of the prefix, so the index of the period is used
+            conditions.append("li.period >= ? AND li.period < ?")
+            params += [period, period + "\uffff"]
+
+        sql = (
+            "SELECT li.report_id, r.file_name, li.table_name, li.row, li.company, "
+            "li.period, li.line_item, li.metric, li.value "
+            "FROM line_items li JOIN reports r ON r.report_id = li.report_id"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY li.report_id, li.table_name, li.row"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection to the database, creating it on first use.
+
+        Each call opens its own connection, so the store is shared by the
+        threads of the extraction jobs. The changes are committed on exit.
+
+        Yields:
+            sqlite3.Connection: Connection to the database
+        """
+        with self._lock:
+            if not self._ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                with closing(sqlite3.connect(self.db_path)) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(SCHEMA)
+                self._ready = True
+
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+
+
+def normalize_table(
+    df: pd.DataFrame,
+    table_name: str,
+    company: str | None = None,
+    period: str | None = None,
+) -> list[tuple]:
+    """
+    Normalize a table to line items, one per numeric value.
+
+    The line item of a row is the value of its line item column (or of its
+    first text column), and each numeric column is a metric. Numbers written
+    as text (e.g. "1,234.5", "(120)", "$ 30") are parsed.
+
+    Parameters:
+        df - pd.DataFrame: Table of a report
+        table_name - str: Name of the table
+        company - str | None: Company of the rows without a company column
+        period - str | None: Period of the rows without a period column
+
+    Returns:
+        list[tuple]: Table name, row, company, period, line item, metric and
+            value of each line item
+    """
+    if df.empty:
+        return []
+    df = df.reset_index(drop=True)
+    df.columns = column_names(df.columns)
+    names = {column.lower(): column for column in df.columns}
+
+    # -- Get the columns of the company, the period and the line item
+    company_col = next((names[c] for c in COMPANY_COLUMNS if c in names), None)
+    period_col = next((names[c] for c in PERIOD_COLUMNS if c in names), None)
+    label_col = next((names[c] for c in LINE_ITEM_COLUMNS if c in names), None)
+    keys = {company_col, period_col, label_col} - {None}
+
+    # -- Parse the values of the other columns, keeping the numeric ones
+    values = {}
+    for column in df.columns:
+        if column in keys:
+            continue
+        parsed = to_numbers(df[column])
+        if parsed.notna().any():
+            values[column] = parsed
+        elif label_col is None:
+            label_col = column
+    if not values:
+        return []
+
+    # -- Build the line items
+    ids = pd.DataFrame(
+        {
+            "row": df.index,
+            "company": _as_text(df[company_col]) if company_col else company,
+            "period": _as_text(df[period_col]) if period_col else period,
+            "line_item": _as_text(df[label_col]) if label_col else None,
+        }
+    )
+    long = pd.concat([ids, pd.DataFrame(values)], axis=1).melt(
+        id_vars=list(ids.columns), var_name="metric", value_name="value"
+    )
+    long = long.dropna(subset=["value"])
+
+    # -- Columns named after a period (e.g. "2024") set the period of their values
+    if period_col is None:
+        named = long["metric"].map(lambda name: bool(PERIOD_NAME.match(name)))
+        long.loc[named, "period"] = long.loc[named, "metric"]
+
+    long = long.astype(object).where(long.notna(), None)
+    return [
+        (table_name, int(row), *rest)
+        for row, *rest in long.itertuples(index=False, name=None)
+    ]
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """
+    Convert the values of a key column to text, keeping the missing ones NULL.
+
+    Parameters:
+        series - pd.Series: Company, period or line item column
+
+    Returns:
+        pd.Series: Values as strings, with NaN for the missing values
+    """
+    return series.astype(str).where(series.notna())
+
+
+def column_names(columns) -> list[str]:
+    """
+    Convert the column names of a table to unique strings (e.g. for SQLite or
+    Parquet, which require them).
+
+    Parameters:
+        columns - Iterable: Column names (may be empty, None or repeated)
+
+    Returns:
+        list[str]: Unique column names
+    """
+    names = []
+    for idx, column in enumerate(columns):
+        name = str(column).strip() if column is not None else ""
+        name = name or f"column_{idx}"
+        while name in names:
+            name = f"{name}_{idx}"
+        names.append(name)
+    return names
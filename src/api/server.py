@@ -0,0 +1,582 @@
+"""
+Local HTTP service to extract data from files.
+
+Usage:
+    python -m src.api.server --port 8600 --workers 4 --max-queue 16
+
+Endpoints:
+    GET  /health          Status of the worker pool
+    POST /extract         Extract the file in the request body, returning JSON
+    POST /extract/stream  Extract the file, streaming NDJSON lines per page
+
+The file name is given by the "name" query argument (or derived from the
+Content-Type header) and the configuration of the extractor by the "scan",
+"normalize", "optimize_memory" and "sheets" ones.
+Extractions run on a pool of worker processes, so concurrent requests parse
+their files in parallel. Requests over the capacity of the worker pool and its
+queue get a 429 response, before their body is read.
+
+Each worker process has its own in-memory extraction cache and staging
+references, so a file repeated on different workers is extracted again
+(unless the disk tier of the cache is set with FINANCE_ANALYZER_CACHE_DIR).
+The text index on disk is shared by the workers through its file lock.
+"""
+
+import sys
+import json
+import queue
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Awaitable, Callable
+import tornado.web
+from tornado.iostream import StreamClosedError
+from src.api.file_processing import process_uploaded_file
+from src.config import settings
+from src.extract.extractor import DataExtractor
+from src.extract.progress import ExtractionCancelled, ProgressCallback
+from src.extract.registry import readers
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Seconds between the checks for the pages sent by the workers of a stream
+STREAM_POLL_INTERVAL = 0.05
+
+
+class WorkerPool:
+    """
+    Bounded pool of extraction processes with a limited queue of waiting requests.
+
+    The extractions run on worker processes, since parsing PDFs and building
+    DataFrames hold the GIL. Streamed extractions send their pages and receive
+    their cancellation through the queues and events of a manager process,
+    started on the first stream.
+
+    Attributes:
+        max_workers - int: Number of concurrent extractions
+        max_queue - int: Number of requests waiting for a worker
+        pending - int: Number of requests running or waiting
+
+    Methods:
+        acquire: Reserve a place on the pool, if there is capacity
+        release: Free a place reserved on the pool
+        run: Run an extraction on the pool and release its place
+        channel: Create the page queue and cancellation event of a stream
+        stats: Get the status of the pool
+        close: Stop the worker processes and the manager process
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        """
+        Initialize the WorkerPool class.
+
+        Parameters:
+            max_workers - int: Number of concurrent extractions
+            max_queue - int: Number of requests waiting for a worker
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._manager = None
+
+    def acquire(self) -> bool:
+        """
+        Reserve a place on the pool, if there is capacity.
+
+        Only called from the event loop, so the counter needs no lock.
+
+        Returns:
+            bool: True if the request was accepted
+        """
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            return False
+        self.pending += 1
+        return True
+
+    def release(self) -> None:
+        """
+        Free a place reserved on the pool, for requests that were not run.
+        """
+        self.pending -= 1
+
+    async def run(self, extract: Callable[..., DataExtractor], *args) -> DataExtractor:
+        """
+        Run an extraction on a worker process and release its place.
+
+        Parameters:
+            extract - Callable[..., DataExtractor]: Module-level function to
+                extract the data (pickled to the worker)
+            *args - Any: Arguments of the function
+
+        Returns:
+            DataExtractor: Extractor object with the extracted data
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, extract, *args)
+        finally:
+            self.release()
+
+    def channel(self) -> tuple:
+        """
+        Create the page queue and cancellation event of a streamed extraction.
+
+        Returns:
+            tuple: Queue of the extracted pages and event cancelling the extraction,
+                shared with the worker processes
+        """
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        return self._manager.Queue(), self._manager.Event()
+
+    def stats(self) -> dict:
+        """
+        Get the status of the pool.
+
+        Returns:
+            dict: Workers, queue size, requests in flight and rejected
+        """
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(self.pending, self.max_workers),
+            "queued": max(self.pending - self.max_workers, 0),
+            "rejected": self.rejected,
+        }
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and the manager process, cancelling the
+        queued extractions.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    """
+    Handler of the status of the worker pool.
+    """
+
+    def initialize(self, pool: WorkerPool) -> None:
+        """
+        Initialize the handler with the worker pool.
+
+        Parameters:
+            pool - WorkerPool: Pool of extraction workers
+        """
+        self.pool = pool
+
+    def get(self) -> None:
+        """
+        Write the status of the worker pool.
+        """
+        self.write(self.pool.stats())
+
+
+@tornado.web.stream_request_body
+class ExtractHandler(tornado.web.RequestHandler):
+    """
+    Handler extracting the file in the request body and returning its data as JSON.
+
+    The body is streamed to the handler, so requests rejected by the worker
+    pool are answered from their headers without reading their files.
+    """
+
+    def initialize(self, pool: WorkerPool) -> None:
+        """
+        Initialize the handler with the worker pool.
+
+        Parameters:
+            pool - WorkerPool: Pool of extraction workers
+        """
+        self.pool = pool
+        self.body = bytearray()
+        self.reserved = False
+
+    def prepare(self) -> None:
+        """
+        Reject the request when the worker pool is saturated, before its body is read.
+
+        Raises:
+            tornado.web.HTTPError: If the file name is missing or invalid
+        """
+        if not self.file_name():
+            raise tornado.web.HTTPError(400, reason="The file name is required")
+        if not self.pool.acquire():
+            self.set_status(429)
+            self.set_header("Retry-After", "1")
+            self.finish({"error": "Extraction queue is full"})
+            return
+        self.reserved = True
+        self.request.connection.set_max_body_size(settings.SERVER_MAX_BODY)
+
+    def data_received(self, chunk: bytes) -> None:
+        """
+        Keep a chunk of the request body.
+
+        Parameters:
+            chunk - bytes: Chunk of the body
+        """
+        if not self._finished:
+            self.body.extend(chunk)
+
+    def on_finish(self) -> None:
+        """
+        Free the place on the worker pool of a request that was not run.
+        """
+        if self.reserved:
+            self.reserved = False
+            self.pool.release()
+
+    def run(self, *args) -> Awaitable[DataExtractor]:
+        """
+        Run the extraction of the request on the worker pool, which frees its
+        place when the extraction ends.
+
+        Parameters:
+            *args - Any: Arguments of extract_body
+
+        Returns:
+            Awaitable[DataExtractor]: Extractor object with the extracted data
+        """
+        self.reserved = False
+        return self.pool.run(extract_body, *args)
+
+    async def post(self) -> None:
+        """
+        Extract the file and write its data.
+        """
+        try:
+            extractor = await self.run(*self.extraction())
+        except (KeyError, ValueError) as e:
+            self.set_status(400)
+            self.finish({"error": str(e)})
+            return
+        self.set_header("Content-Type", "application/json")
+        self.finish(_dumps(_describe(extractor)))
+
+    def file_name(self) -> str | None:
+        """
+        Get the name of the uploaded file, from the query or the content type.
+
+        Returns:
+            str | None: Name of the file, or None if it cannot be known
+        """
+        name = self.get_query_argument("name", None)
+        if name:
+            return name
+        extension = readers.extension(self.request.headers.get("Content-Type", ""))
+        return f"upload.{extension}" if extension else None
+
+    def extraction(self) -> tuple[bytes, str, dict]:
+        """
+        Get the arguments of the extraction of the request body.
+
+        Returns:
+            tuple[bytes, str, dict]: Body, file name and configuration of the
+                extractor, for extract_body
+        """
+        return (
+            bytes(self.body),
+            self.file_name(),
+            request_config(self.request.query_arguments),
+        )
+
+
+class StreamHandler(ExtractHandler):
+    """
+    Handler extracting the file in the request body and streaming its pages as NDJSON.
+
+    Each page is written as soon as it is extracted, followed by a last line
+    with the status of the extraction. The extraction is cancelled when the
+    client disconnects.
+    """
+
+    closed = False
+    cancelled = None
+
+    async def post(self) -> None:
+        """
+        Extract the file, writing a line for each page.
+        """
+        pages, self.cancelled = self.pool.channel()
+        if self.closed:
+            self.cancelled.set()
+
+        self.set_header("Content-Type", "application/x-ndjson")
+        task = asyncio.ensure_future(
+            self.run(*self.extraction(), (pages, self.cancelled))
+        )
+        written = set()
+
+        # -- Write the pages sent by the worker while the extraction runs
+        try:
+            while True:
+                done = task.done()
+                for line in _drain(pages):
+                    if line["text"] is None and line["table"] is None:
+                        continue
+                    written.add(line["page"])
+                    self.write(_dumps(line) + "\n")
+                    await self.flush()
+                if done:
+                    break
+                await asyncio.wait([task], timeout=STREAM_POLL_INTERVAL)
+        except StreamClosedError:
+            self.on_connection_close()
+            return
+
+        # -- Write the pages of cached results and the status line
+        try:
+            extractor = task.result()
+        except ExtractionCancelled:
+            return
+        except Exception as e:
+            logger.error(f"Error extracting {self.file_name()}: {e}")
+            self.write(_dumps({"status": "failed", "error": str(e)}) + "\n")
+            self.finish()
+            return
+        for line in _pages(extractor):
+            if line["page"] not in written:
+                self.write(_dumps(line) + "\n")
+        self.write(_dumps({"status": "done", **_describe(extractor, pages=False)}))
+        self.finish("\n")
+
+    def on_connection_close(self) -> None:
+        """
+        Cancel the extraction when the client disconnects.
+        """
+        self.closed = True
+        if self.cancelled is not None:
+            self.cancelled.set()
+
+
+def extract_body(
+    body: bytes, file_name: str, config: dict, channel: tuple | None = None
+) -> DataExtractor:
+    """
+    Extract the file of a request body, on a worker process.
+
+    Parameters:
+        body - bytes: Content of the file
+        file_name - str: Name of the file
+        config - dict: Configuration for the extractor
+        channel - tuple | None: Queue of the extracted pages and event cancelling
+            the extraction, for streamed extractions
+
+    Returns:
+        DataExtractor: Extractor object with the extracted data
+
+    Raises:
+        ExtractionCancelled: If the stream is cancelled
+    """
+    uploaded_file = BytesIO(body)
+    uploaded_file.name = file_name
+    progress: ProgressCallback | None = None
+    if channel is not None:
+        pages, cancelled = channel
+        is_pdf = file_name.lower().endswith(".pdf")
+
+        def progress(page: int, total: int, partial: dict) -> None:
+            if cancelled.is_set():
+                raise ExtractionCancelled("Client disconnected")
+            if not is_pdf:
+                return
+            pages.put(
+                {
+                    "page": page + 1,
+                    "total": total,
+                    "text": partial.get("texts", {}).get(page),
+                    "table": partial.get("tables", {}).get(page),
+                }
+            )
+
+    return process_uploaded_file(uploaded_file, config, progress=progress)
+
+
+def request_config(arguments: dict[str, list[bytes]]) -> dict:
+    """
+    Build the configuration of the extractor from the query arguments.
+
+    Parameters:
+        arguments - dict[str, list[bytes]]: Query arguments of the request
+
+    Returns:
+        dict: Configuration for the extractor
+    """
+
+    def flag(name: str) -> bool:
+        values = arguments.get(name, [b""])
+        return values[-1].decode().lower() in ["1", "true", "yes"]
+
+    config = {
+        "scan": flag("scan"),
+        "normalize": flag("normalize"),
+        "optimize_memory": flag("optimize_memory"),
+    }
+    sheets = [value.decode() for value in arguments.get("sheets", [])]
+    if sheets == ["all"]:
+        config["sheets"] = "all"
+    elif sheets:
+        config["sheets"] = sheets
+    return config
+
+
+def make_app(
+    max_workers: int = settings.SERVER_WORKERS,
+    max_queue: int = settings.SERVER_MAX_QUEUE,
+) -> tornado.web.Application:
+    """
+    Create the application of the extraction service.
+
+    Parameters:
+        max_workers - int: Number of concurrent extractions
+        max_queue - int: Number of requests waiting for a worker
+
+    Returns:
+        tornado.web.Application: Application of the service (with its worker
+            pool in the "pool" setting, to close it)
+    """
+    pool = WorkerPool(max_workers, max_queue)
+    return tornado.web.Application(
+        [
+            (r"/health", HealthHandler, {"pool": pool}),
+            (r"/extract", ExtractHandler, {"pool": pool}),
+            (r"/extract/stream", StreamHandler, {"pool": pool}),
+        ],
+        pool=pool,
+    )
+
+
+async def serve(port: int, max_workers: int, max_queue: int) -> None:
+    """
+    Run the extraction service until the process is stopped.
+
+    Parameters:
+        port - int: Port of the service
+        max_workers - int: Number of concurrent extractions
+        max_queue - int: Number of requests waiting for a worker
+    """
+    app = make_app(max_workers, max_queue)
+    app.listen(port, address="127.0.0.1", max_body_size=settings.SERVER_MAX_BODY)
+    logger.info(f"Extraction service listening on http://127.0.0.1:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        app.settings["pool"].close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Parse the command-line arguments and run the extraction service.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description="Local extraction service.")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--max-queue", type=int, default=settings.SERVER_MAX_QUEUE)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.port, args.workers, args.max_queue))
+    except KeyboardInterrupt:
+        logger.info("Extraction service stopped")
+    return 0
+
+
+def _describe(extractor: DataExtractor, pages: bool = True) -> dict:
+    """
+    Describe an extraction for the responses.
+
+    Parameters:
+        extractor - DataExtractor: Extractor object with the extracted data
+        pages - bool: Include the extracted data
+
+    Returns:
+        dict: File name, format and (optionally) extracted data
+    """
+    description = {
+        "file_name": extractor.file_name,
+        "file_format": extractor.file_format,
+    }
+    if pages:
+        description["data"] = extractor.data
+    return description
+
+
+def _pages(extractor: DataExtractor) -> list[dict]:
+    """
+    Split the data of an extraction into the lines of the stream.
+
+    Parameters:
+        extractor - DataExtractor: Extractor object with the extracted data
+
+    Returns:
+        list[dict]: Line of each page (PDFs) or a single line with the data
+    """
+    data = extractor.data
+    if extractor.file_format != "pdf":
+        return [{"page": 1, "total": 1, "data": data}] if data else []
+
+    texts = data.get("texts", {})
+    tables = data.get("tables", {})
+    pages = sorted(set(texts) | set(tables))
+    return [
+        {
+            "page": page + 1,
+            "total": None,
+            "text": texts.get(page),
+            "table": tables.get(page),
+        }
+        for page in pages
+    ]
+
+
+def _drain(pages) -> list[dict]:
+    """
+    Get the pages sent by a worker so far, without waiting.
+
+    Parameters:
+        pages - Queue: Queue of the extracted pages
+
+    Returns:
+        list[dict]: Lines of the pages, in the order they were extracted
+    """
+    lines = []
+    while True:
+        try:
+            lines.append(pages.get_nowait())
+        except queue.Empty:
+            return lines
+
+
+def _dumps(data: dict) -> str:
+    """
+    Serialize the data of a response, converting the values JSON does not support.
+
+    Parameters:
+        data - dict: Data of the response
+
+    Returns:
+        str: JSON document
+    """
+    return json.dumps(data, default=str, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
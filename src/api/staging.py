@@ -0,0 +1,259 @@
+import os
+import time
+import shutil
+import hashlib
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from src.api.blob_store import BlobStore
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+
+class UploadStaging:
+    """
+    Class responsible for staging uploads on disk for the backends that need a path.
+
+    Only the uploads whose backends need a path (scanned PDFs and Excel files
+    with many sheets) are staged, the others are extracted from memory.
+    Contents are written once to a content-addressed blob store and the files
+    of each session are hard links to the blobs, so concurrent uploads with the
+    same name never overwrite each other and identical staged uploads share
+    the disk.
+    Staged files are reference counted while in use and a background janitor
+    evicts the unused ones by age and total size.
+
+    Attributes:
+        root - Path: Directory of the staged files
+        blob_store - BlobStore: Content-addressed storage of the staged contents
+        max_age - float: Seconds before an unused file is evicted
+        max_bytes - int: Maximum size of the staged files
+        janitor_interval - float: Seconds between the janitor runs
+
+    Methods:
+        stage: Write an upload to the staging directory and acquire it
+        release: Release a staged file
+        staged: Context manager to stage and release an upload
+        evict: Remove the unused files over the age and size limits
+        start_janitor: Start the background janitor
+        stop_janitor: Stop the background janitor
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_age: float = 3600,
+        max_bytes: int = 1024**3,
+        janitor_interval: float = 60,
+    ) -> None:
+        """
+        Initialize the UploadStaging class.
+
+        Parameters:
+            root - Path: Directory of the staged files
+            max_age - float: Seconds before an unused file is evicted
+            max_bytes - int: Maximum size of the staged files
+            janitor_interval - float: Seconds between the janitor runs
+        """
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.janitor_interval = janitor_interval
+        self.blob_store = BlobStore(root / "blobs")
+        self._refs: Counter[Path] = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._janitor: threading.Thread | None = None
+
+    def stage(
+        self, content: bytes | memoryview, file_name: str, session_id: str | None = None
+    ) -> Path:
+        """
+        Write an upload to the staging directory and acquire it.
+
+        Parameters:
+            content - bytes | memoryview: Content of the file
+            file_name - str: Name of the file
+            session_id - str | None: Session of the upload (shared when None)
+
+        Returns:
+            Path: Path of the staged file
+        """
+        # -- Get the paths of the blob and of the session file
+        digest = hashlib.sha256(content).hexdigest()
+        suffix = Path(file_name).suffix.lower()
+        blob_path = self.blob_store.path(digest, suffix)
+        file_path = blob_path
+        if session_id:
+            session_dir = self.root / "sessions" / Path(session_id).name
+            file_path = session_dir / blob_path.name
+
+        with self._lock:
+            self._refs[blob_path] += 1
+            self._refs[file_path] += 1
+
+        try:
+            # -- Store the content once and link it to the session
+            self.blob_store.put(content, suffix, digest)
+            if file_path.exists():
+                os.utime(file_path)
+            elif file_path != blob_path:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                _link(blob_path, file_path)
+        except OSError:
+            self.release(file_path)
+            raise
+        finally:
+            self.release(blob_path)
+
+        logger.debug(f"Upload {file_name} staged at {file_path}")
+        return file_path
+
+    def release(self, file_path: Path) -> None:
+        """
+        Release a staged file, allowing the janitor to evict it.
+
+        Parameters:
+            file_path - Path: Path of the staged file
+        """
+        with self._lock:
+            self._refs[file_path] -= 1
+            if self._refs[file_path] <= 0:
+                del self._refs[file_path]
+
+    @contextmanager
+    def staged(
+        self, content: bytes | memoryview, file_name: str, session_id: str | None = None
+    ) -> Iterator[Path]:
+        """
+        Stage an upload while it is in use.
+
+        Parameters:
+            content - bytes | memoryview: Content of the file
+            file_name - str: Name of the file
+            session_id - str | None: Session of the upload (shared when None)
+
+        Yields:
+            Path: Path of the staged file
+        """
+        file_path = self.stage(content, file_name, session_id)
+        try:
+            yield file_path
+        finally:
+            self.release(file_path)
+
+    def evict(self) -> int:
+        """
+        Remove the unused files older than the maximum age, then the oldest
+        unused files while the staged files are over the maximum size.
+
+        Returns:
+            int: Number of files removed
+        """
+        if not self.root.exists():
+            return 0
+
+        # -- Get the staged files from the oldest to the newest
+        files = []
+        links = Counter()
+        for file_path in self.root.rglob("*"):
+            try:
+                if file_path.is_file():
+                    stat = file_path.stat()
+                    files.append((stat.st_mtime, stat.st_size, stat.st_ino, file_path))
+                    links[stat.st_ino] += 1
+            except FileNotFoundError:
+                continue
+        files.sort()
+
+        # -- Hard links of the same blob use the disk only once
+        sizes = {inode: size for _, size, inode, _ in files}
+        total_bytes = sum(sizes.values())
+
+        # -- Remove the files by age and size
+        removed = 0
+        now = time.time()
+        for mtime, size, inode, file_path in files:
+            expired = now - mtime > self.max_age
+            if not expired and total_bytes <= self.max_bytes:
+                break
+            if file_path.suffix == ".tmp" and not expired:
+                # -- Files being written are only removed when abandoned
+                continue
+            with self._lock:
+                if file_path in self._refs:
+                    continue
+                file_path.unlink(missing_ok=True)
+            links[inode] -= 1
+            if links[inode] == 0:
+                total_bytes -= size
+            removed += 1
+
+        # -- Remove the empty session directories
+        sessions = self.root / "sessions"
+        if sessions.exists():
+            with self._lock:
+                in_use = {file_path.parent for file_path in self._refs}
+                for directory in sessions.iterdir():
+                    if directory in in_use or not directory.is_dir():
+                        continue
+                    if not any(directory.iterdir()):
+                        directory.rmdir()
+
+        if removed:
+            logger.info(f"Staging janitor removed {removed} files")
+        return removed
+
+    def start_janitor(self) -> None:
+        """
+        Start the background janitor, if it is not running.
+        """
+        with self._lock:
+            if self._janitor is not None and self._janitor.is_alive():
+                return
+            self._stop.clear()
+            self._janitor = threading.Thread(
+                target=self._run_janitor, name="staging-janitor", daemon=True
+            )
+            self._janitor.start()
+
+    def stop_janitor(self) -> None:
+        """
+        Stop the background janitor.
+        """
+        self._stop.set()
+        if self._janitor is not None:
+            self._janitor.join()
+            self._janitor = None
+
+    def _run_janitor(self) -> None:
+        """
+        Evict the unused files periodically until the janitor is stopped.
+        """
+        while not self._stop.wait(self.janitor_interval):
+            try:
+                self.evict()
+            except OSError as e:
+                logger.error(f"Error evicting staged files: {e}")
+
+
+def _link(source: Path, destination: Path) -> None:
+    """
+    Link a file to a new path, copying it when hard links are not supported.
+
+    Parameters:
+        source - Path: Path of the existing file
+        destination - Path: New path of the file
+    """
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        pass
+    except OSError:
+        tmp_path = destination.with_suffix(destination.suffix + ".tmp")
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, destination)
@@ -0,0 +1,588 @@
+import os
+import re
+import zlib
+import bisect
+import pickle
+import tempfile
+import threading
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Collection, Iterator
+from src.utils.logger import get_logger
+
+# -- The segments are locked across processes on POSIX systems only
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Tokens of the texts (words and numbers)
+TOKEN = re.compile(r"\w+")
+
+# -- Number of tokens with decoded postings kept in memory
+DECODED_TOKENS = 256
+
+# -- Bits of the page and of the position in the keys of the occurrences
+PAGE_BITS = 20
+POSITION_BITS = 24
+
+# -- Files of the lock of the writers and of the number of changes on disk
+LOCK_FILE = "index.lock"
+GENERATION_FILE = "generation"
+
+
+class TextIndex:
+    """
+    Inverted index of the texts of the pages of extracted documents.
+
+    Each token maps to its postings: the document, page, position and offset of
+    each occurrence, stored as varints of the deltas from the previous one. The
+    postings of each document are appended to the ones in memory and written
+    to disk as a zlib-compressed segment, so the index is updated
+    incrementally by each upload. When there are too many segments of the same
+    size, they are merged into a larger one by concatenating their postings.
+
+    Queries are phrases of one or more tokens, matched ignoring the case, and
+    a trailing "*" matches the last token as a prefix (e.g. "net deb*").
+
+    The directory can be shared by several processes (e.g. the app, the CLI
+    and the workers of the service): the writers hold a file lock and load the
+    segments written by the others before adding theirs, and the readers load
+    them again when the generation of the directory changes.
+
+    Attributes:
+        index_dir - Path | None: Directory of the segments (in memory if None)
+        max_segments - int: Number of segments of the same size that are merged
+
+    Methods:
+        add: Index the texts of a document
+        has: Check if a document is indexed
+        documents: List the indexed documents
+        search: Find the occurrences of a phrase or prefix
+        compact: Merge the segments on disk into one
+    """
+
+    def __init__(self, index_dir: Path | None = None, max_segments: int = 16) -> None:
+        """
+        Initialize the TextIndex class.
+
+        Parameters:
+            index_dir - Path | None: Directory of the segments (in memory if None)
+            max_segments - int: Number of segments of the same size that are merged
+        """
+        self.index_dir = index_dir
+        self.max_segments = max_segments
+        self._documents: dict[int, dict] = {}
+        self._ids: dict[str, int] = {}
+        self._postings: dict[str, bytearray] = {}
+        self._last: dict[str, tuple[int, int, int, int]] = {}
+        self._tokens: list[str] | None = None
+        self._decoded: OrderedDict[str, tuple] = OrderedDict()
+        self._segments: list[tuple[int, int]] = []
+        self._loaded = False
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._file_locked = False
+
+    def add(self, key: str, name: str, texts: dict[int, str]) -> bool:
+        """
+        Index the texts of a document, unless it is already indexed.
+
+        Parameters:
+            key - str: Identifier of the document (e.g. its cache key)
+            name - str: Name of the document
+            texts - dict[int, str]: Text of each page (starting at 0)
+
+        Returns:
+            bool: True if the document was indexed
+        """
+        with self._lock, self._locked():
+            self._load()
+            if key in self._ids:
+                return False
+
+            doc_id = len(self._documents)
+            document = {"key": key, "name": name, "pages": len(texts)}
+            postings, last = _encode_document(doc_id, texts, self._last)
+            segment = {
+                "documents": {doc_id: document},
+                "postings": postings,
+                "last": last,
+                "level": 0,
+            }
+            self._merge(segment)
+            if self.index_dir is not None:
+                self._write(segment, doc_id)
+                self._segments.append((doc_id, 0))
+                self._merge_segments()
+                self._bump_generation()
+        logger.info(f"{len(postings)} tokens of {name} indexed")
+        return True
+
+    def has(self, key: str) -> bool:
+        """
+        Check if a document is indexed.
+
+        Parameters:
+            key - str: Identifier of the document
+
+        Returns:
+            bool: True if the document is indexed
+        """
+        with self._lock:
+            self._load()
+            return key in self._ids
+
+    def documents(self) -> list[dict]:
+        """
+        List the indexed documents, in the order they were indexed.
+
+        Returns:
+            list[dict]: Key, name and number of pages of each document
+        """
+        with self._lock:
+            self._load()
+            return [dict(document) for document in self._documents.values()]
+
+    def search(
+        self,
+        query: str,
+        documents: Collection[str] | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Find the occurrences of a phrase, or of a prefix ending with "*".
+
+        Parameters:
+            query - str: Phrase to find (e.g. "net debt" or "EBIT*")
+            documents - Collection[str] | None: Keys of the documents to search
+                (defaults to every document)
+            limit - int | None: Maximum number of occurrences
+
+        Returns:
+            list[dict]: Key and name of the document, page, offset and length
+                of each occurrence, by document, page and offset
+        """
+        terms = [token for token, _ in tokenize(query)]
+        if not terms:
+            return []
+        prefix = query.rstrip().endswith("*")
+
+        with self._lock:
+            self._load()
+
+            # -- Get the occurrences of each term, expanding the prefix
+            occurrences = [self._occurrences(term) for term in terms[:-1]]
+            occurrences.append(self._occurrences(terms[-1], prefix))
+
+            # -- Keep the occurrences of the first term followed by the others
+            keys, offsets, _ = occurrences[0]
+            match = np.ones(len(keys), dtype=bool)
+            for idx, (term_keys, _, _) in enumerate(occurrences[1:], start=1):
+                match &= np.isin(keys + idx, term_keys, assume_unique=True)
+            if documents is not None:
+                allowed = [self._ids[key] for key in documents if key in self._ids]
+                match &= np.isin(keys >> (PAGE_BITS + POSITION_BITS), allowed)
+            starts = np.flatnonzero(match)[:limit]
+
+            # -- Get the end of each phrase from the occurrence of its last term
+            last_keys, last_offsets, last_lengths = occurrences[-1]
+            ends = np.searchsorted(last_keys, keys[starts] + len(terms) - 1)
+            ends = last_offsets[ends] + last_lengths[ends]
+
+            hits = []
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                key = int(keys[start])
+                document = self._documents[key >> (PAGE_BITS + POSITION_BITS)]
+                hits.append(
+                    {
+                        "document": document["key"],
+                        "name": document["name"],
+                        "page": (key >> POSITION_BITS) & ((1 << PAGE_BITS) - 1),
+                        "offset": int(offsets[start]),
+                        "length": end - int(offsets[start]),
+                    }
+                )
+            return hits
+
+    def compact(self) -> None:
+        """
+        Merge the segments on disk into one.
+        """
+        with self._lock, self._locked():
+            self._load()
+            if len(self._segments) > 1:
+                level = max(level for _, level in self._segments) + 1
+                self._merge_files(self._segments, level)
+                self._bump_generation()
+                logger.info(f"Text index compacted: {len(self._documents)} documents")
+
+    def _occurrences(self, term: str, prefix: bool = False) -> tuple:
+        """
+        Get the occurrences of a term, or of the tokens starting with it.
+
+        Parameters:
+            term - str: Token of the query
+            prefix - bool: Flag to match the tokens starting with the term
+
+        Returns:
+            tuple: Sorted keys (document, page and position), offsets and
+                lengths of the occurrences
+        """
+        if not prefix:
+            return self._decode(term)
+
+        # -- Expand the prefix with the sorted tokens
+        if self._tokens is None:
+            self._tokens = sorted(self._postings)
+        start = bisect.bisect_left(self._tokens, term)
+        end = bisect.bisect_left(self._tokens, term + "\uffff")
+        decoded = [self._decode(token) for token in self._tokens[start:end]]
+        if not decoded:
+            return self._decode(term)
+        keys, offsets, lengths = (np.concatenate(part) for part in zip(*decoded))
+        order = np.argsort(keys, kind="stable")
+        return keys[order], offsets[order], lengths[order]
+
+    def _decode(self, token: str) -> tuple:
+        """
+        Decode the postings of a token, keeping the most recently used ones.
+
+        Parameters:
+            token - str: Token of the index
+
+        Returns:
+            tuple: Sorted keys (document, page and position), offsets and
+                lengths of the occurrences
+        """
+        if token in self._decoded:
+            self._decoded.move_to_end(token)
+            return self._decoded[token]
+
+        values = _decode_varints(self._postings.get(token, b""))
+        deltas = ((values >> 1) ^ -(values & 1)).reshape(-1, 4)
+        values = np.cumsum(deltas, axis=0)
+        keys = (
+            values[:, 0] << (PAGE_BITS + POSITION_BITS)
+            | values[:, 1] << POSITION_BITS
+            | values[:, 2]
+        )
+        decoded = (keys, values[:, 3], np.full(len(keys), len(token)))
+        self._decoded[token] = decoded
+        while len(self._decoded) > DECODED_TOKENS:
+            self._decoded.popitem(last=False)
+        return decoded
+
+    def _merge(self, segment: dict) -> None:
+        """
+        Merge a segment into the index in memory.
+
+        Parameters:
+            segment - dict: Documents, postings and last occurrences of the segment
+        """
+        for doc_id, document in segment["documents"].items():
+            self._documents[doc_id] = document
+            self._ids[document["key"]] = doc_id
+        for token, data in segment["postings"].items():
+            self._postings.setdefault(token, bytearray()).extend(data)
+            self._decoded.pop(token, None)
+        self._last.update(segment["last"])
+        self._tokens = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the lock of the directory across processes, while writing to it.
+
+        Yields:
+            None: The lock is held until the block exits
+        """
+        if self.index_dir is None or fcntl is None or self._file_locked:
+            yield
+            return
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_dir / LOCK_FILE, "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._file_locked = True
+            try:
+                yield
+            finally:
+                self._file_locked = False
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        """
+        Load the segments on disk in order, on first use and whenever another
+        process changed them.
+
+        The postings are deltas from the previous segments, so a segment that
+        can not be read is removed with the ones after it, whose documents are
+        indexed again on their next upload.
+        """
+        if self.index_dir is None:
+            self._loaded = True
+            return
+        if self._loaded and self._read_generation() == self._generation:
+            return
+
+        with self._locked():
+            self._reset()
+            self._generation = self._read_generation()
+            self._loaded = True
+            self._load_segments()
+
+    def _load_segments(self) -> None:
+        """
+        Load the segments on disk in order, holding the lock of the directory.
+        """
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        files = sorted(self.index_dir.glob("*.seg"))
+        for idx, file_path in enumerate(files):
+            try:
+                segment = _read_segment(file_path)
+            except (OSError, zlib.error, pickle.UnpicklingError, EOFError) as e:
+                logger.error(f"Error loading index segment {file_path}: {e}")
+                for stale in files[idx:]:
+                    stale.unlink(missing_ok=True)
+                self._bump_generation()
+                return
+
+            # -- Skip the segments already merged by an interrupted merge
+            if min(segment["documents"]) in self._documents:
+                file_path.unlink(missing_ok=True)
+                continue
+            self._merge(segment)
+            self._segments.append((min(segment["documents"]), segment["level"]))
+
+    def _reset(self) -> None:
+        """
+        Clear the index in memory, before loading the segments again.
+        """
+        self._documents = {}
+        self._ids = {}
+        self._postings = {}
+        self._last = {}
+        self._tokens = None
+        self._decoded = OrderedDict()
+        self._segments = []
+
+    def _read_generation(self) -> int:
+        """
+        Read the number of changes of the segments on disk.
+
+        Returns:
+            int: Generation of the directory (0 when nothing was written)
+        """
+        try:
+            return int((self.index_dir / GENERATION_FILE).read_text())
+        except (OSError, ValueError):
+            return 0
+
+    def _bump_generation(self) -> None:
+        """
+        Count a change of the segments on disk, so the other processes load them.
+        """
+        self._generation = self._read_generation() + 1
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(str(self._generation))
+            os.replace(tmp_path, self.index_dir / GENERATION_FILE)
+        except OSError as e:
+            logger.error(f"Error writing index generation: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def _merge_segments(self) -> None:
+        """
+        Merge the newest segments while there are too many of the same size.
+        """
+        while len(self._segments) >= self.max_segments:
+            newest = self._segments[-self.max_segments :]
+            level = newest[0][1]
+            if any(segment_level != level for _, segment_level in newest):
+                return
+            self._merge_files(newest, level + 1)
+
+    def _merge_files(self, segments: list[tuple[int, int]], level: int) -> None:
+        """
+        Merge consecutive segments on disk into one, concatenating their postings.
+
+        Parameters:
+            segments - list[tuple[int, int]]: First document and level of the
+                segments, in order
+            level - int: Level of the merged segment
+        """
+        merged = {"documents": {}, "postings": {}, "last": {}, "level": level}
+        postings: dict[str, list[bytes]] = {}
+        for doc_id, _ in segments:
+            segment = _read_segment(self.index_dir / _segment_name(doc_id))
+            merged["documents"].update(segment["documents"])
+            merged["last"].update(segment["last"])
+            for token, data in segment["postings"].items():
+                postings.setdefault(token, []).append(data)
+        merged["postings"] = {token: b"".join(data) for token, data in postings.items()}
+
+        # -- Replace the first segment, then remove the merged ones
+        first = segments[0][0]
+        self._write(merged, first)
+        for doc_id, _ in segments[1:]:
+            (self.index_dir / _segment_name(doc_id)).unlink(missing_ok=True)
+        self._segments = self._segments[: -len(segments)] + [(first, level)]
+
+    def _write(self, segment: dict, doc_id: int) -> None:
+        """
+        Write a segment to disk atomically.
+
+        Parameters:
+            segment - dict: Documents, postings and last occurrences of the segment
+            doc_id - int: First document of the segment
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(pickle.dumps(segment, pickle.HIGHEST_PROTOCOL)))
+            os.replace(tmp_path, self.index_dir / _segment_name(doc_id))
+        except OSError as e:
+            logger.error(f"Error writing index segment: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+def tokenize(text: str) -> list[tuple[str, int]]:
+    """
+    Split a text into lowercase tokens.
+
+    Parameters:
+        text - str: Text to split
+
+    Returns:
+        list[tuple[str, int]]: Each token with its offset in the text
+    """
+    return [(match.group().lower(), match.start()) for match in TOKEN.finditer(text)]
+
+
+def _encode_document(
+    doc_id: int, texts: dict[int, str], last: dict[str, tuple[int, int, int, int]]
+) -> tuple[dict[str, bytes], dict[str, tuple[int, int, int, int]]]:
+    """
+    Encode the postings of the tokens of a document.
+
+    Each occurrence is the delta of its document, page, position and offset
+    from the previous occurrence of the token, zigzag-encoded as varints.
+
+    Parameters:
+        doc_id - int: Document of the texts
+        texts - dict[int, str]: Text of each page
+        last - dict[str, tuple[int, int, int, int]]: Last occurrence of each
+            token in the previous documents
+
+    Returns:
+        tuple[dict, dict]: Postings of each token, and its last occurrence
+    """
+    # -- Get the occurrences of the tokens, in the order of the pages
+    ids: dict[str, int] = {}
+    rows = []
+    for page in sorted(texts):
+        for position, (token, offset) in enumerate(tokenize(texts[page] or "")):
+            rows.append((ids.setdefault(token, len(ids)), page, position, offset))
+    if not rows:
+        return {}, {}
+
+    # -- Group the occurrences by token and get the previous one of each
+    occurrences = np.array(rows, dtype=np.int64)
+    occurrences = occurrences[np.argsort(occurrences[:, 0], kind="stable")]
+    token_ids = occurrences[:, 0].copy()
+    occurrences[:, 0] = doc_id
+    groups = np.flatnonzero(np.diff(token_ids, prepend=-1))
+    previous = np.roll(occurrences, 1, axis=0)
+    tokens = list(ids)
+    previous[groups] = [
+        last.get(tokens[token], (0, 0, 0, 0)) for token in token_ids[groups]
+    ]
+
+    # -- Encode the deltas and split them by token
+    deltas = occurrences - previous
+    data, sizes = _encode_varints((deltas << 1) ^ (deltas >> 63))
+    bounds = np.add.reduceat(sizes.reshape(-1, 4).sum(axis=1), groups).cumsum()
+    postings, lasts = {}, {}
+    ends = np.append(groups[1:], len(occurrences)) - 1
+    for idx, token_id in enumerate(token_ids[groups].tolist()):
+        token = tokens[token_id]
+        postings[token] = data[(bounds[idx - 1] if idx else 0) : bounds[idx]]
+        lasts[token] = tuple(occurrences[ends[idx]].tolist())
+    return postings, lasts
+
+
+def _encode_varints(values: np.ndarray) -> tuple[bytes, np.ndarray]:
+    """
+    Encode unsigned integers as varints (7 bits per byte).
+
+    Parameters:
+        values - np.ndarray: Unsigned integers
+
+    Returns:
+        tuple[bytes, np.ndarray]: Varints, and the number of bytes of each value
+    """
+    values = values.ravel().astype(np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    for bits in range(7, 64, 7):
+        sizes += values >= np.uint64(1 << bits)
+    starts = np.cumsum(sizes) - sizes
+    data = np.zeros(int(sizes.sum()), dtype=np.uint8)
+    for byte in range(int(sizes.max(initial=1))):
+        rows = sizes > byte
+        chunk = (values[rows] >> np.uint64(7 * byte)) & np.uint64(0x7F)
+        more = (sizes[rows] > byte + 1).astype(np.uint64) << np.uint64(7)
+        data[starts[rows] + byte] = chunk | more
+    return data.tobytes(), sizes
+
+
+def _decode_varints(data: bytes | bytearray) -> np.ndarray:
+    """
+    Decode varints (7 bits per byte) to integers.
+
+    Parameters:
+        data - bytes | bytearray: Varints
+
+    Returns:
+        np.ndarray: Integers
+    """
+    raw = np.frombuffer(bytes(data), dtype=np.uint8)
+    if not len(raw):
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shifts = (np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)) * 7
+    chunks = (raw & 0x7F).astype(np.int64) << shifts
+    return np.add.reduceat(chunks, starts)
+
+
+def _read_segment(file_path: Path) -> dict:
+    """
+    Read a segment from disk.
+
+    Parameters:
+        file_path - Path: Path of the segment
+
+    Returns:
+        dict: Documents, postings, last occurrences and level of the segment
+    """
+    return pickle.loads(zlib.decompress(file_path.read_bytes()))
+
+
+def _segment_name(doc_id: int) -> str:
+    """
+    Get the file name of a segment, sorted by its first document.
+
+    Parameters:
+        doc_id - int: First document of the segment
+
+    Returns:
+        str: File name of the segment
+    """
+    return f"{doc_id:010d}.seg"
@@ -0,0 +1,405 @@
+"""
+Command-line entry point to extract data from directories of reports.
+
+Usage:
+    python -m src.cli.batch_extract data/reports "archive/**/*.pdf" -o data/extracted
+
+Files are extracted on a pool of processes and the results are written as
+Parquet (tables) and JSONL (page texts and JSON documents). Every finished file
+is recorded on a manifest in the output directory, so an interrupted run
+resumes from the files that were not extracted yet (or extracted with another
+configuration).
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import functools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from src.api.file_processing import extracted_tables
+from src.api.report_store import column_names
+from src.extract.extractor import DataExtractor
+from src.extract.registry import readers
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Name of the checkpoint manifest in the output directory
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def find_files(inputs: list[str]) -> list[Path]:
+    """
+    Find the supported files of directories and glob patterns.
+
+    Parameters:
+        inputs - list[str]: Directories, files or glob patterns
+
+    Returns:
+        list[Path]: Sorted paths of the files, without duplicates
+    """
+    files = set()
+    suffixes = {f".{extension}" for extension in readers.formats()}
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = path.rglob("*")
+        else:
+            candidates = (Path(match) for match in glob.glob(pattern, recursive=True))
+        for candidate in candidates:
+            if candidate.suffix.lower() in suffixes and candidate.is_file():
+                files.add(candidate.resolve())
+    return sorted(files)
+
+
+def load_manifest(manifest_path: Path) -> dict[str, dict]:
+    """
+    Load the records of the files extracted by previous runs.
+
+    Parameters:
+        manifest_path - Path: Path of the checkpoint manifest
+
+    Returns:
+        dict[str, dict]: Last record of each file, by path
+    """
+    records = {}
+    if not manifest_path.exists():
+        return records
+
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # -- Lines cut by an interrupted run are ignored
+                logger.warning(f"Ignoring invalid line of {manifest_path}")
+                continue
+            records[record["file"]] = record
+    return records
+
+
+def is_extracted(file_path: Path, records: dict[str, dict], config: dict) -> bool:
+    """
+    Check if a file was extracted by a previous run with the same configuration,
+    and did not change since.
+
+    Parameters:
+        file_path - Path: Path of the file
+        records - dict[str, dict]: Records of the manifest, by path
+        config - dict: Configuration for the extractor
+
+    Returns:
+        bool: True if the file can be skipped
+    """
+    record = records.get(str(file_path))
+    if record is None or record["status"] != "done":
+        return False
+    if record.get("config") != config_hash(config):
+        return False
+    stat = file_path.stat()
+    return record["size"] == stat.st_size and record["mtime"] == stat.st_mtime
+
+
+def config_hash(config: dict) -> str:
+    """
+    Get a hash of the configuration of the extractor, recorded on the manifest.
+
+    Parameters:
+        config - dict: Configuration for the extractor
+
+    Returns:
+        str: Hash of the configuration
+    """
+    content = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
+def extract_file(file_path: Path, config: dict, output_dir: Path, fmt: str) -> dict:
+    """
+    Extract a file and write its results to the output directory.
+
+    Runs on the worker processes, returning only the record of the manifest.
+
+    Parameters:
+        file_path - Path: Path of the file
+        config - dict: Configuration for the extractor
+        output_dir - Path: Directory of the results
+        fmt - str: Format of the tables ("parquet" or "jsonl")
+
+    Returns:
+        dict: Record of the file for the manifest
+    """
+    stat = file_path.stat()
+    record = {
+        "file": str(file_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "config": config_hash(config),
+        "pages": 0,
+        "outputs": [],
+    }
+    pages = []
+
+    try:
+        # -- Extract the file, counting its pages
+        extractor = DataExtractor(
+            file_path, config, progress=lambda page, total, _: pages.append(total)
+        ).load()
+        record["pages"] = pages[-1] if pages else 0
+
+        # -- Write the results
+        prefix = output_prefix(file_path)
+        outputs = write_texts(extractor, output_dir / f"{prefix}.texts.jsonl")
+        slugs = set()
+        for name, df in extracted_tables(extractor).items():
+            df.columns = column_names(df.columns)
+            table_path = output_dir / f"{prefix}.{_slug(name, slugs)}.{fmt}"
+            _write_atomic(table_path, functools.partial(_write_table, df, fmt=fmt))
+            outputs.append(table_path.name)
+        record.update(status="done", outputs=outputs)
+    except Exception as e:
+        logger.error(f"Error extracting {file_path}: {e}")
+        record.update(status="failed", error=str(e))
+
+    return record
+
+
+def write_texts(extractor: DataExtractor, file_path: Path) -> list[str]:
+    """
+    Write the page texts of PDFs and the content of JSON documents as JSONL.
+
+    Parameters:
+        extractor - DataExtractor: Extractor object with the extracted data
+        file_path - Path: Path of the JSONL file
+
+    Returns:
+        list[str]: Name of the written file (empty if there was nothing to write)
+    """
+    if extractor.file_format == "pdf":
+        lines = [
+            {"page": page + 1, "text": text} for page, text in extractor.texts.items()
+        ]
+    elif extractor.file_format == "json" and "tables" not in extractor.data:
+        lines = [extractor.data] if extractor.data else []
+    else:
+        lines = []
+    if not lines:
+        return []
+
+    def write(path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+
+    _write_atomic(file_path, write)
+    return [file_path.name]
+
+
+def output_prefix(file_path: Path) -> str:
+    """
+    Get the prefix of the results of a file, unique for files with the same name.
+
+    Parameters:
+        file_path - Path: Path of the file
+
+    Returns:
+        str: Name of the file followed by a hash of its path
+    """
+    digest = hashlib.sha1(str(file_path).encode("utf-8")).hexdigest()[:8]
+    return f"{file_path.stem}-{digest}"
+
+
+def run(
+    files: list[Path],
+    config: dict,
+    output_dir: Path,
+    fmt: str = "parquet",
+    workers: int | None = None,
+) -> dict:
+    """
+    Extract the files on a pool of processes, skipping the ones already extracted.
+
+    Parameters:
+        files - list[Path]: Paths of the files
+        config - dict: Configuration for the extractor
+        output_dir - Path: Directory of the results and of the manifest
+        fmt - str: Format of the tables ("parquet" or "jsonl")
+        workers - int | None: Number of processes (defaults to the CPU count)
+
+    Returns:
+        dict: Summary with the number of files and pages and the throughput
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    records = load_manifest(manifest_path)
+    pending = [file for file in files if not is_extracted(file, records, config)]
+    summary = {
+        "files": len(files),
+        "skipped": len(files) - len(pending),
+        "done": 0,
+        "failed": 0,
+        "pages": 0,
+    }
+    logger.info(f"Extracting {len(pending)} files ({summary['skipped']} skipped)")
+
+    # -- Extract the files and record each one as soon as it finishes
+    start = time.perf_counter()
+    with (
+        ProcessPoolExecutor(max_workers=workers) as executor,
+        open(manifest_path, "a", encoding="utf-8") as manifest,
+    ):
+        futures = [
+            executor.submit(extract_file, file, config, output_dir, fmt)
+            for file in pending
+        ]
+        try:
+            for future in as_completed(futures):
+                record = future.result()
+                manifest.write(json.dumps(record) + "\n")
+                manifest.flush()
+                os.fsync(manifest.fileno())
+                summary[record["status"]] += 1
+                summary["pages"] += record["pages"]
+        except KeyboardInterrupt:
+            logger.warning("Extraction interrupted, run again to resume it")
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    # -- Compute the throughput
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = elapsed
+    summary["files_per_second"] = summary["done"] / elapsed if elapsed else 0.0
+    summary["pages_per_second"] = summary["pages"] / elapsed if elapsed else 0.0
+    return summary
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse the command-line arguments.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Extract data from directories of financial reports."
+    )
+    parser.add_argument("inputs", nargs="+", help="Directories, files or globs")
+    parser.add_argument(
+        "-o", "--output", type=Path, required=True, help="Directory of the results"
+    )
+    parser.add_argument(
+        "-f", "--format", choices=["parquet", "jsonl"], default="parquet"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--scan", action="store_true", help="OCR the PDF files")
+    parser.add_argument(
+        "--normalize", action="store_true", help="Flatten nested JSON records"
+    )
+    parser.add_argument(
+        "--all-sheets", action="store_true", help="Read all Excel sheets"
+    )
+    parser.add_argument(
+        "--optimize-memory", action="store_true", help="Optimize the table dtypes"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the batch extraction and print its throughput.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        int: Exit code (1 if any file failed)
+    """
+    args = parse_args(argv)
+    config = {
+        "scan": args.scan,
+        "normalize": args.normalize,
+        "optimize_memory": args.optimize_memory,
+    }
+    if args.all_sheets:
+        config["sheets"] = "all"
+
+    files = find_files(args.inputs)
+    summary = run(files, config, args.output, args.format, args.workers)
+    print(
+        f"{summary['done']} extracted, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped in {summary['seconds']:.1f}s "
+        f"({summary['files_per_second']:.2f} files/s, "
+        f"{summary['pages_per_second']:.2f} pages/s)"
+    )
+    return 1 if summary["failed"] else 0
+
+
+def _write_table(df, file_path: Path, fmt: str) -> None:
+    """
+    Write a table as Parquet or JSONL.
+
+    Parameters:
+        df - pd.DataFrame: Table to write
+        file_path - Path: Path of the file
+        fmt - str: Format of the table ("parquet" or "jsonl")
+    """
+    if fmt == "parquet":
+        df.to_parquet(file_path, index=False)
+    else:
+        df.to_json(file_path, orient="records", lines=True, date_format="iso")
+
+
+def _write_atomic(file_path: Path, write) -> None:
+    """
+    Write a file through a temporary file, so interrupted runs leave no partial results.
+
+    Parameters:
+        file_path - Path: Path of the file
+        write - Callable[[Path], None]: Function writing the content to a path
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(Path(tmp_path))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _slug(name: str, used: set[str]) -> str:
+    """
+    Convert a table name to a file name, unique among the tables of a file.
+
+    Parameters:
+        name - str: Name of the table
+        used - set[str]: Names already used by the other tables (updated)
+
+    Returns:
+        str: Name with only letters, digits, dashes and underscores, with a
+            number when another table has the same one (e.g. "Q1_2024-2")
+    """
+    slug = "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
+    slug = slug.strip("_") or "table"
+
+    # -- Names are compared ignoring the case, for case-insensitive file systems
+    unique, count = slug, 1
+    while unique.lower() in used:
+        count += 1
+        unique = f"{slug}-{count}"
+    used.add(unique.lower())
+    return unique
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Load test of the local extraction service.
+
+Usage:
+    python -m src.api.server --workers 4 --max-queue 16 &
+    python -m src.cli.load_test data/reports/q1.pdf --requests 200 --concurrency 32
+
+Sends the same file concurrently to a running instance and prints the
+throughput, the latency percentiles and the number of rejected requests.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from urllib.parse import urlencode
+from tornado.httpclient import AsyncHTTPClient
+from src.config import settings
+
+
+async def load_test(
+    url: str, body: bytes, requests: int, concurrency: int, timeout: float
+) -> dict:
+    """
+    Send requests to the extraction service with a fixed number of concurrent clients.
+
+    Parameters:
+        url - str: URL of the extraction endpoint, with the query arguments
+        body - bytes: Content of the file
+        requests - int: Total number of requests
+        concurrency - int: Number of concurrent clients
+        timeout - float: Seconds before a request is abandoned
+
+    Returns:
+        dict: Number of requests by status, throughput and latency percentiles
+    """
+    AsyncHTTPClient.configure(None, max_clients=concurrency)
+    client = AsyncHTTPClient()
+    latencies = []
+    codes: dict[int, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.fetch(
+                url,
+                method="POST",
+                body=body,
+                raise_error=False,
+                request_timeout=timeout,
+            )
+            codes[response.code] = codes.get(response.code, 0) + 1
+            if response.code == 200:
+                latencies.append(time.perf_counter() - start)
+
+    # -- Run the clients until every request is sent
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "codes": codes,
+        "seconds": elapsed,
+        "requests_per_second": codes.get(200, 0) / elapsed,
+        "p50": _percentile(latencies, 0.50),
+        "p95": _percentile(latencies, 0.95),
+        "p99": _percentile(latencies, 0.99),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Parse the command-line arguments and run the load test.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        int: Exit code (1 if any request failed with an error other than 429)
+    """
+    parser = argparse.ArgumentParser(description="Load test the extraction service.")
+    parser.add_argument("file", type=Path, help="File sent on every request")
+    parser.add_argument("--host", default=f"http://127.0.0.1:{settings.SERVER_PORT}")
+    parser.add_argument("-n", "--requests", type=int, default=100)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--stream", action="store_true", help="Use the NDJSON stream")
+    parser.add_argument("--scan", action="store_true", help="OCR the PDF files")
+    args = parser.parse_args(argv)
+
+    # -- Build the URL of the endpoint
+    endpoint = "/extract/stream" if args.stream else "/extract"
+    query = {"name": args.file.name, "scan": str(args.scan).lower()}
+    url = f"{args.host}{endpoint}?{urlencode(query)}"
+
+    summary = asyncio.run(
+        load_test(
+            url, args.file.read_bytes(), args.requests, args.concurrency, args.timeout
+        )
+    )
+    print(
+        f"{summary['requests']} requests in {summary['seconds']:.1f}s "
+        f"({summary['requests_per_second']:.2f} req/s), status codes: {summary['codes']}"
+    )
+    print(
+        f"Latency p50 {summary['p50'] * 1000:.0f} ms, "
+        f"p95 {summary['p95'] * 1000:.0f} ms, p99 {summary['p99'] * 1000:.0f} ms"
+    )
+    return 1 if set(summary["codes"]) - {200, 429} else 0
+
+
+def _percentile(values: list[float], quantile: float) -> float:
+    """
+    Get a percentile of sorted values by the nearest rank.
+
+    Parameters:
+        values - list[float]: Sorted values
+        quantile - float: Quantile between 0 and 1
+
+    Returns:
+        float: Value of the percentile (0 if there are no values)
+    """
+    if not values:
+        return 0.0
+    return values[min(int(quantile * len(values)), len(values) - 1)]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+This file contains the settings of the project, read from environment variables.
+"""
+
+import os
+from pathlib import Path
+
+# -- Directory for the uploaded files
+TEMP_DIR = Path(os.getenv("FINANCE_ANALYZER_TEMP_DIR", "data/temp"))
+
+# -- Limits of the staged uploads (age in seconds and total size in bytes)
+STAGING_MAX_AGE = float(os.getenv("FINANCE_ANALYZER_STAGING_MAX_AGE", "3600"))
+STAGING_MAX_BYTES = int(os.getenv("FINANCE_ANALYZER_STAGING_MAX_BYTES", str(1024**3)))
+STAGING_JANITOR_INTERVAL = float(
+    os.getenv("FINANCE_ANALYZER_STAGING_JANITOR_INTERVAL", "60")
+)
+
+# -- Extraction cache (the disk tier is disabled when no directory is set)
+CACHE_MAX_ENTRIES = int(os.getenv("FINANCE_ANALYZER_CACHE_MAX_ENTRIES", "32"))
+CACHE_DIR = (
+    Path(os.environ["FINANCE_ANALYZER_CACHE_DIR"])
+    if os.getenv("FINANCE_ANALYZER_CACHE_DIR")
+    else None
+)
+CACHE_ARROW = os.getenv("FINANCE_ANALYZER_CACHE_ARROW", "1").lower() in [
+    "1",
+    "true",
+    "yes",
+]
+
+# -- Local store of the extracted reports (disabled when no path is set)
+STORE_PATH = (
+    Path(os.environ["FINANCE_ANALYZER_STORE_PATH"])
+    if os.getenv("FINANCE_ANALYZER_STORE_PATH")
+    else None
+)
+
+# -- Full-text index of the PDF texts (kept in memory when set to an empty
+#    value) and number of segments on disk that triggers their merge
+INDEX_DIR = (
+    Path(os.environ.get("FINANCE_ANALYZER_INDEX_DIR", "data/index"))
+    if os.getenv("FINANCE_ANALYZER_INDEX_DIR", "data/index")
+    else None
+)
+INDEX_MAX_SEGMENTS = int(os.getenv("FINANCE_ANALYZER_INDEX_MAX_SEGMENTS", "16"))
+
+# -- Maximum number of extractions running in the background at the same time,
+#    and seconds and number of the finished ones kept for the sessions
+JOB_WORKERS = int(os.getenv("FINANCE_ANALYZER_JOB_WORKERS", "4"))
+JOB_MAX_AGE = float(os.getenv("FINANCE_ANALYZER_JOB_MAX_AGE", "3600"))
+JOB_MAX_FINISHED = int(os.getenv("FINANCE_ANALYZER_JOB_MAX_FINISHED", "64"))
+
+# -- Local extraction service (port, workers, queued requests and body size)
+SERVER_PORT = int(os.getenv("FINANCE_ANALYZER_SERVER_PORT", "8600"))
+SERVER_WORKERS = int(os.getenv("FINANCE_ANALYZER_SERVER_WORKERS", "4"))
+SERVER_MAX_QUEUE = int(os.getenv("FINANCE_ANALYZER_SERVER_MAX_QUEUE", "16"))
+SERVER_MAX_BODY = int(os.getenv("FINANCE_ANALYZER_SERVER_MAX_BODY", str(200 * 1024**2)))
+
+# -- Log the duration of the startup steps of the app
+PROFILE_STARTUP = os.getenv("FINANCE_ANALYZER_PROFILE_STARTUP", "").lower() in [
+    "1",
+    "true",
+    "yes",
+]
+
+# -- Logging: file, level of the app and levels per module (e.g.
+#    "src.extract=INFO,src.api.server=WARNING"), writer thread, rotation and
+#    records logged per line of code each second (0 for no limit)
+LOG_FILE = os.getenv("FINANCE_ANALYZER_LOG_FILE", "app.log")
+LOG_LEVEL = os.getenv("FINANCE_ANALYZER_LOG_LEVEL", "DEBUG").upper()
+LOG_LEVELS = {
+    module.strip(): level.strip().upper()
+    for module, _, level in (
+        entry.partition("=")
+        for entry in os.getenv("FINANCE_ANALYZER_LOG_LEVELS", "").split(",")
+        if "=" in entry
+    )
+}
+LOG_ASYNC = os.getenv("FINANCE_ANALYZER_LOG_ASYNC", "").lower() in ["1", "true", "yes"]
+LOG_MAX_BYTES = int(os.getenv("FINANCE_ANALYZER_LOG_MAX_BYTES", str(10 * 1024**2)))
+LOG_BACKUP_COUNT = int(os.getenv("FINANCE_ANALYZER_LOG_BACKUP_COUNT", "5"))
+LOG_RATE_LIMIT = int(os.getenv("FINANCE_ANALYZER_LOG_RATE_LIMIT", "20"))
+
+# -- Tracing of the pipeline stages: flag, files written at exit (JSON trace and
+#    Prometheus totals) and spans kept for the trace
+TRACE = os.getenv("FINANCE_ANALYZER_TRACE", "").lower() in ["1", "true", "yes"]
+TRACE_FILE = os.getenv("FINANCE_ANALYZER_TRACE_FILE", "trace.json")
+TRACE_METRICS_FILE = os.getenv("FINANCE_ANALYZER_TRACE_METRICS_FILE", "metrics.prom")
+TRACE_MAX_SPANS = int(os.getenv("FINANCE_ANALYZER_TRACE_MAX_SPANS", "100000"))
+
+# -- Performance panel of the uploads (stage timings, memory and cache) and
+#    number of allocations shown on it
+PERF_PANEL = os.getenv("FINANCE_ANALYZER_PERF_PANEL", "").lower() in [
+    "1",
+    "true",
+    "yes",
+]
+PERF_TOP_ALLOCATIONS = int(os.getenv("FINANCE_ANALYZER_PERF_TOP_ALLOCATIONS", "10"))
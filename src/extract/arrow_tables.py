@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import pandas as pd
+from pathlib import Path
+from typing import TYPE_CHECKING
+from src.utils.logger import get_logger
+
+# -- pyarrow is imported on first use, since the tables are only written and
+#    opened by the disk tier of the extraction cache
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Key of the schema metadata with the path of a table in the extracted data
+PATH_KEY = b"finance_analyzer.path"
+
+
+def table_paths(data: dict, file_format: str, config: dict) -> list[tuple]:
+    """
+    Get the paths of the tables in the data extracted from a file.
+
+    Parameters:
+        data - dict: Data extracted from the file
+        file_format - str: File format
+        config - dict: Configuration for the extractor
+
+    Returns:
+        list[tuple]: Keys from the data to each table (an empty path when the
+            data is the table itself)
+    """
+    if not data:
+        return []
+    if file_format == "pdf":
+        return [("tables", page) for page in data.get("tables", {})]
+    if file_format == "json":
+        if not config.get("normalize"):
+            return []
+        return [("tables", name) for name in data.get("tables", {})]
+    sheets = config.get("sheets")
+    if sheets == "all" or isinstance(sheets, list):
+        return [(sheet,) for sheet in data]
+    return [()]
+
+
+def get_table(data: dict, path: tuple) -> dict:
+    """
+    Get a table from the extracted data.
+
+    Parameters:
+        data - dict: Data extracted from the file
+        path - tuple: Keys from the data to the table
+
+    Returns:
+        dict: Table, as columns of values by row
+    """
+    for key in path:
+        data = data[key]
+    return data
+
+
+def set_table(data: dict, path: tuple, table: dict | None) -> dict:
+    """
+    Replace a table of the extracted data, in place.
+
+    Parameters:
+        data - dict: Data extracted from the file
+        path - tuple: Keys from the data to the table
+        table - dict | None: New table (None to leave a placeholder)
+
+    Returns:
+        dict: Updated data (the table itself for an empty path)
+    """
+    if not path:
+        return table if table is not None else {}
+    parent = get_table(data, path[:-1])
+    parent[path[-1]] = table
+    return data
+
+
+def split_tables(data: dict, paths: list[tuple]) -> tuple[dict, dict[tuple, dict]]:
+    """
+    Split the tables from the rest of the extracted data.
+
+    Parameters:
+        data - dict: Data extracted from the file
+        paths - list[tuple]: Paths of the tables to split
+
+    Returns:
+        tuple[dict, dict[tuple, dict]]: Data with placeholders instead of the
+            tables (the order of the keys is kept), and the tables by path
+    """
+    tables = {path: get_table(data, path) for path in paths}
+    rest = _copy_parents(data, paths)
+    for path in paths:
+        rest = set_table(rest, path, None)
+    return rest, tables
+
+
+def write_tables(
+    directory: Path, tables: dict[tuple, dict | pd.DataFrame]
+) -> list[tuple]:
+    """
+    Write tables as Arrow IPC files, one per table.
+
+    Tables that Arrow can not represent (e.g. columns mixing numbers and text),
+    with nested values or that are not columns of values by row are skipped,
+    so they are kept with the rest of the data.
+
+    Parameters:
+        directory - Path: Directory of the files (created if missing)
+        tables - dict[tuple, dict | pd.DataFrame]: Tables by path
+
+    Returns:
+        list[tuple]: Paths of the written tables
+    """
+    import pyarrow as pa
+
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for path, table in tables.items():
+        if isinstance(table, pd.DataFrame):
+            df = table
+        elif isinstance(table, dict) and all(
+            isinstance(column, dict) for column in table.values()
+        ):
+            df = pd.DataFrame(table)
+        else:
+            continue
+        if len({type(column) for column in df.columns}) > 1:
+            continue
+        try:
+            arrow_table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.debug("Table %s not written as Arrow: %s", path, e)
+            continue
+
+        # -- Nested values (e.g. lists of JSON records) are not restored as-is
+        if any(pa.types.is_nested(field.type) for field in arrow_table.schema):
+            continue
+
+        metadata = {**(arrow_table.schema.metadata or {})}
+        metadata[PATH_KEY] = json.dumps(list(path)).encode("utf-8")
+        arrow_table = arrow_table.replace_schema_metadata(metadata)
+        file_path = directory / f"{len(written)}.arrow"
+        with pa.OSFile(str(file_path), "wb") as sink:
+            with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+        written.append(path)
+    return written
+
+
+def open_tables(directory: Path) -> dict[tuple, pa.Table]:
+    """
+    Open the Arrow IPC files of a directory, memory-mapped.
+
+    The tables reference the pages of the files instead of copying them, so
+    opening them is near-instant and processes opening the same files share
+    their memory through the OS page cache.
+
+    Parameters:
+        directory - Path: Directory of the files
+
+    Returns:
+        dict[tuple, pa.Table]: Tables by path
+    """
+    import pyarrow as pa
+
+    tables = {}
+    for file_path in sorted(directory.glob("*.arrow"), key=lambda f: int(f.stem)):
+        source = pa.memory_map(str(file_path), "r")
+        table = pa.ipc.open_file(source).read_all()
+        path = json.loads(table.schema.metadata[PATH_KEY])
+        tables[tuple(path)] = table
+    return tables
+
+
+def to_frame(table: pa.Table | pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert an Arrow table to a DataFrame without copying its columns.
+
+    Parameters:
+        table - pa.Table | pd.DataFrame: Arrow table (DataFrames are returned as-is)
+
+    Returns:
+        pd.DataFrame: Table with Arrow-backed columns
+    """
+    if isinstance(table, pd.DataFrame):
+        return table
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def to_dict(table: pa.Table | pd.DataFrame) -> dict:
+    """
+    Convert an Arrow table to the columns of values by row of the extracted data.
+
+    Parameters:
+        table - pa.Table | pd.DataFrame: Arrow table or DataFrame
+
+    Returns:
+        dict: Table, as columns of values by row
+    """
+    if isinstance(table, pd.DataFrame):
+        return table.to_dict()
+    return table.to_pandas().to_dict()
+
+
+def _copy_parents(data: dict, paths: list[tuple]) -> dict:
+    """
+    Copy the dictionaries that contain the tables, so they can be replaced.
+
+    Parameters:
+        data - dict: Data extracted from the file
+        paths - list[tuple]: Paths of the tables
+
+    Returns:
+        dict: Copy of the data down to the parents of the tables
+    """
+    if not paths or () in paths:
+        return data
+    copy = dict(data)
+    for key in {path[0] for path in paths}:
+        children = [path[1:] for path in paths if path[0] == key]
+        if any(children):
+            copy[key] = _copy_parents(data[key], [c for c in children if c])
+    return copy
@@ -1,31 +1,605 @@
+import os
+import re
+import csv
+import codecs
+import threading
+import importlib.util
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import BinaryIO
+from src.extract.progress import ProgressCallback
+from src.extract.source import (
+    Source,
+    as_path,
+    open_source,
+    read_head,
+    source_size,
+    to_buffer,
+)
 from src.utils.logger import get_logger
+from src.utils.tracing import tracer
 
 # -- Get the logger
 logger = get_logger()
 
+# -- Number of rows per chunk on the streaming mode
+STREAMING_CHUNK_SIZE = 10_000
 
-def extract_data(file_path: Path) -> dict:
+# -- Maximum ratio of unique values for a text column to become categorical
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# -- Number of bytes sampled to detect the CSV dialect
+SNIFF_SAMPLE_SIZE = 64 * 1024
+
+# -- Patterns of numbers with comma and dot decimals
+COMMA_DECIMAL = re.compile(r"^-?\d{1,3}(\.\d{3})*,\d+$|^-?\d+,\d+$")
+DOT_DECIMAL = re.compile(r"^-?\d{1,3}(,\d{3})*\.\d+$|^-?\d+\.\d+$")
+DOT_THOUSANDS = re.compile(r"^-?\d{1,3}(\.\d{3})+(,\d+)?$")
+COMMA_THOUSANDS = re.compile(r"^-?\d{1,3}(,\d{3})+(\.\d+)?$")
+
+# -- Minimum size of a workbook to parse its sheets in processes (smaller
+# -- workbooks are parsed faster than the workers start)
+PARALLEL_SHEETS_MIN_SIZE = 1024 * 1024
+
+# -- CSV dialects cached by source
+_dialect_cache: dict[str, dict] = {}
+
+# -- Process pools to parse sheets, shared by the reads with the same workers
+_sheet_pools: dict[int, ProcessPoolExecutor] = {}
+_sheet_pools_lock = threading.Lock()
+
+
+def extract_data(
+    source: Source, config: dict | None = None, file_name: str | None = None
+) -> dict:
     """
     Extract data from a table-like file.
 
+    Supported configuration for Excel files:
+        sheets - None | str | int | list: Sheets to read ("all" for every sheet)
+        usecols - str | list: Columns to read
+        nrows - int: Number of rows to read
+        engine - str: Excel engine (defaults to calamine when available)
+        read_only - bool: Stream the rows of huge workbooks
+        max_workers - int: Maximum number of processes to parse the sheets of
+            large workbooks (the processes are reused between reads)
+
+    Supported configuration for CSV files:
+        sep, decimal, thousands, encoding - str: Dialect (detected when missing)
+        csv_source - str: Key to cache the detected dialect (not cached when missing)
+
+    Supported configuration for every table-like file:
+        optimize_memory - bool: Infer compact dtypes for the columns (the memory
+            is only saved by read_frames, since the tables become dictionaries)
+
     Parameters:
-        file_path - Path: Path of the file
+        source - Source: Path of the file or buffer with its content
+        config - dict | None: Configuration for the reader
+        file_name - str | None: Name of the file (required for buffers)
 
     Returns:
-        dict: Data extracted from the file
+        dict: Data extracted from the file (by sheet when reading many sheets)
     """
+    frames = read_frames(source, config, file_name, report=False)
+    with tracer.span("table.to_dict"):
+        return _to_dict(frames)
+
+
+def read_frames(
+    source: Source,
+    config: dict | None = None,
+    file_name: str | None = None,
+    report: bool = True,
+) -> pd.DataFrame | dict:
+    """
+    Read the tables of a table-like file as DataFrames.
+
+    The configuration is the same as for extract_data.
+
+    Parameters:
+        source - Source: Path of the file or buffer with its content
+        config - dict | None: Configuration for the reader
+        file_name - str | None: Name of the file (required for buffers)
+        report - bool: Flag to log the memory saved by the optimization
+
+    Returns:
+        pd.DataFrame | dict: Table, or tables by sheet when reading many sheets
+            (empty dict when the file can not be read)
+    """
+    config = config or {}
+    name = file_name or getattr(source, "name", "")
+    source = to_buffer(source)
     try:
         # -- Read the file based on the file extension
-        df = {}
-        match file_path.suffix:
-            case ".csv":
-                df = pd.read_csv(file_path).to_dict()
-            case ".xlsx" | ".xls" | ".xlsm" | ".xlsb":
-                df = pd.read_excel(file_path).to_dict()
+        suffix = Path(name).suffix.lower()
+        with tracer.span(f"table.read{suffix}") as span:
+            if span.recording:
+                span.set(bytes=source_size(source))
+            match suffix:
+                case ".csv":
+                    frames = _read_csv(source, config, name)
+                case ".xlsx" | ".xls" | ".xlsm" | ".xlsb":
+                    frames = _read_excel(source, config, suffix)
+                case _:
+                    return {}
+
+        # -- Optimize the memory usage of the tables
+        if config.get("optimize_memory", False):
+            with tracer.span("table.optimize"):
+                frames = _optimize_frames(frames, name, report)
+        return frames
     except pd.errors.ParserError as e:
         logger.error(f"Error parsing the file: {e}")
     except pd.errors.EmptyDataError as e:
         logger.error(f"Empty file: {e}")
-    return df
+    return {}
+
+
+def read(
+    source: Source,
+    config: dict,
+    file_name: str,
+    progress: ProgressCallback | None = None,
+) -> pd.DataFrame | dict:
+    """
+    Read a table-like file for the reader registry.
+
+    Optimized tables are kept as DataFrames, so the extractor keeps their
+    compact dtypes instead of converting them to dictionaries.
+
+    Parameters:
+        source - Source: Path to the file or buffer with its content
+        config - dict: Configuration for the extractor
+        file_name - str: Name of the file
+        progress - ProgressCallback | None: Unused, tables are read at once
+
+    Returns:
+        pd.DataFrame | dict: Data of the table (or of each sheet), as
+            DataFrames when the memory is optimized
+    """
+    if config.get("optimize_memory", False):
+        return read_frames(source, config, file_name)
+    return extract_data(source, config, file_name)
+
+
+def optimize_memory(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    Infer compact dtypes for the columns of a table.
+
+    - Text columns with ISO dates are parsed as datetimes.
+    - Text columns with few unique values become categoricals.
+    - Other text columns use the pyarrow-backed string dtype when available.
+    - Integer columns are downcast to the smallest integer type.
+    - Float columns are downcast to float32 only when no value loses precision.
+
+    Parameters:
+        df - pd.DataFrame: Table to optimize
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Optimized table and memory report in bytes
+    """
+    # -- Get the memory usage before the optimization
+    before = int(df.memory_usage(deep=True).sum())
+    string_dtype = (
+        "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
+    )
+
+    # -- Infer the dtype of each column once
+    optimized = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            optimized[col] = _optimize_text(series, string_dtype)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            optimized[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series.dtype):
+            downcast = series.astype("float32")
+            lossless = downcast.astype(series.dtype).equals(series)
+            optimized[col] = downcast if lossless else series
+        else:
+            optimized[col] = series
+    df = pd.DataFrame(optimized, index=df.index)
+
+    # -- Get the memory usage after the optimization
+    after = int(df.memory_usage(deep=True).sum())
+    return df, {"before": before, "after": after}
+
+
+def sniff_csv(
+    file_path: Source, source: str | None = None, file_name: str = "CSV file"
+) -> dict:
+    """
+    Detect the dialect of a CSV file from a sample of its first bytes.
+
+    The dialect is cached by source, so files exported from the same system
+    skip the detection. Without a source, the dialect is detected for each file,
+    since files sharing a header may still use different number formats.
+
+    Parameters:
+        file_path - Source: Path of the CSV file or buffer with its content
+        source - str | None: Key to cache the dialect
+        file_name - str: Name of the file for the logs
+
+    Returns:
+        dict: Encoding, separator, decimal and thousands separator of the file
+    """
+    # -- Read a sample of the file
+    sample = read_head(to_buffer(file_path), SNIFF_SAMPLE_SIZE)
+    if not sample.strip():
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+
+    # -- Get the dialect cached for the source
+    if len(sample) == SNIFF_SAMPLE_SIZE:
+        sample = sample[: sample.rfind(b"\n") + 1] or sample
+    if source is not None and source in _dialect_cache:
+        return _dialect_cache[source]
+
+    # -- Detect the encoding
+    try:
+        text = sample.decode("utf-8-sig")
+        encoding = "utf-8-sig" if sample.startswith(codecs.BOM_UTF8) else "utf-8"
+    except UnicodeDecodeError:
+        encoding = "cp1252"
+        text = sample.decode(encoding, errors="replace")
+
+    # -- Detect the separator
+    lines = text.splitlines()[:100]
+    try:
+        sep = csv.Sniffer().sniff("\n".join(lines), delimiters=",;\t|").delimiter
+    except csv.Error:
+        sep = ","
+
+    # -- Detect the decimal and thousands separators from the values
+    values = [
+        value.strip().strip('"') for line in lines[1:] for value in line.split(sep)
+    ]
+    comma_decimals = sum(1 for value in values if COMMA_DECIMAL.match(value))
+    dot_decimals = sum(1 for value in values if DOT_DECIMAL.match(value))
+    decimal = "," if sep != "," and comma_decimals > dot_decimals else "."
+    thousands = None
+    if decimal == "," and any(DOT_THOUSANDS.match(value) for value in values):
+        thousands = "."
+    elif sep != "," and any(COMMA_THOUSANDS.match(value) for value in values):
+        thousands = ","
+
+    # -- Cache the dialect of the source
+    dialect = {
+        "encoding": encoding,
+        "sep": sep,
+        "decimal": decimal,
+        "thousands": thousands,
+    }
+    if source is not None:
+        _dialect_cache[source] = dialect
+    logger.debug(f"CSV dialect detected for {file_name}: {dialect}")
+
+    return dialect
+
+
+def clear_dialect_cache() -> None:
+    """
+    Clear the CSV dialects cached by source.
+    """
+    _dialect_cache.clear()
+
+
+def excel_engine() -> str | None:
+    """
+    Get the fastest Excel engine available.
+
+    Returns:
+        str | None: Engine name, or None to let pandas choose it
+    """
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return None
+
+
+def _read_csv(source: Path | memoryview, config: dict, name: str) -> pd.DataFrame:
+    """
+    Read a CSV file with its detected dialect.
+
+    The multi-threaded pyarrow engine is used when it is available and supports
+    the dialect (it does not handle thousands separators).
+
+    Parameters:
+        source - Path | memoryview: Path of the CSV file or buffer with its content
+        config - dict: Configuration for the reader
+        name - str: Name of the file
+
+    Returns:
+        pd.DataFrame: Data of the file
+    """
+    # -- Get the dialect of the file
+    keys = ["encoding", "sep", "decimal", "thousands"]
+    dialect = {key: config[key] for key in keys if key in config}
+    if len(dialect) < len(keys):
+        detected = sniff_csv(source, config.get("csv_source"), name)
+        dialect = {**detected, **dialect}
+
+    # -- Read the file with the fastest engine for the dialect
+    engine = "c"
+    if importlib.util.find_spec("pyarrow") and dialect["thousands"] is None:
+        engine = "pyarrow"
+        dialect.pop("thousands")
+    with open_source(source) as f:
+        return pd.read_csv(f, engine=engine, **dialect)
+
+
+def _read_excel(
+    source: Path | memoryview, config: dict, suffix: str
+) -> pd.DataFrame | dict:
+    """
+    Read the sheets of an Excel file.
+
+    Parameters:
+        source - Path | memoryview: Path of the Excel file or buffer with its content
+        config - dict: Configuration for the reader
+        suffix - str: Extension of the file
+
+    Returns:
+        pd.DataFrame | dict: Sheet, or sheets by name when reading many sheets
+    """
+    # -- Get the sheets to read
+    sheets = config.get("sheets")
+    engine = config.get("engine") or excel_engine()
+    options = {"usecols": config.get("usecols"), "nrows": config.get("nrows")}
+    streaming = config.get("read_only", False) and suffix in [".xlsx", ".xlsm"]
+
+    # -- Read a single sheet
+    if sheets is None or isinstance(sheets, (str, int)) and sheets != "all":
+        sheet = 0 if sheets is None else sheets
+        return _read_sheet(source, sheet, engine, options, streaming)
+
+    # -- Get the names of the sheets
+    if sheets == "all":
+        with open_source(source) as f, pd.ExcelFile(f, engine=engine) as excel_file:
+            sheets = excel_file.sheet_names
+
+    # -- Parse the sheets of large workbooks in parallel
+    max_workers = min(len(sheets), config.get("max_workers") or os.cpu_count() or 1)
+    if source_size(source) < PARALLEL_SHEETS_MIN_SIZE:
+        max_workers = 1
+    logger.debug(f"Reading {len(sheets)} sheets with {max_workers} workers")
+    if max_workers > 1:
+        # -- The workers read the file from disk instead of copying the buffer
+        executor = _sheet_pool(max_workers)
+        with as_path(source, suffix) as file_path:
+            futures = {
+                sheet: executor.submit(
+                    _read_sheet, file_path, sheet, engine, options, streaming
+                )
+                for sheet in sheets
+            }
+            try:
+                return {sheet: future.result() for sheet, future in futures.items()}
+            except BrokenProcessPool:
+                _discard_sheet_pool(max_workers, executor)
+                raise
+
+    return {
+        sheet: _read_sheet(source, sheet, engine, options, streaming)
+        for sheet in sheets
+    }
+
+
+def _sheet_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the process pool to parse sheets, starting it on the first use.
+
+    Parameters:
+        max_workers - int: Number of processes of the pool
+
+    Returns:
+        ProcessPoolExecutor: Pool shared by the reads with the same workers
+    """
+    with _sheet_pools_lock:
+        if max_workers not in _sheet_pools:
+            _sheet_pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+        return _sheet_pools[max_workers]
+
+
+def _discard_sheet_pool(max_workers: int, executor: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken process pool so the next read starts a new one.
+
+    Parameters:
+        max_workers - int: Number of processes of the pool
+        executor - ProcessPoolExecutor: Broken pool
+    """
+    with _sheet_pools_lock:
+        if _sheet_pools.get(max_workers) is executor:
+            del _sheet_pools[max_workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_sheet(
+    source: Path | memoryview,
+    sheet: str | int,
+    engine: str | None,
+    options: dict,
+    streaming: bool,
+) -> pd.DataFrame:
+    """
+    Read a sheet of an Excel file.
+
+    Parameters:
+        source - Path | memoryview: Path of the Excel file or buffer with its content
+        sheet - str | int: Name or index of the sheet
+        engine - str | None: Excel engine
+        options - dict: Options for reading the sheet (usecols and nrows)
+        streaming - bool: Flag to stream the rows of the sheet
+
+    Returns:
+        pd.DataFrame: Data of the sheet
+    """
+    with open_source(source) as f:
+        if streaming:
+            return _stream_sheet(f, sheet, **options)
+        return pd.read_excel(f, sheet_name=sheet, engine=engine, **options)
+
+
+def _stream_sheet(
+    file: BinaryIO,
+    sheet: str | int,
+    usecols: str | list | None = None,
+    nrows: int | None = None,
+) -> pd.DataFrame:
+    """
+    Read a sheet of a huge workbook row by row with the openpyxl read-only mode.
+
+    Parameters:
+        file - BinaryIO: Binary stream of the Excel file
+        sheet - str | int: Name or index of the sheet
+        usecols - str | list | None: Columns to read (names, indexes or letters)
+        nrows - int | None: Number of rows to read
+
+    Returns:
+        pd.DataFrame: Data of the sheet
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        worksheet = (
+            workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+        )
+        rows = worksheet.iter_rows(values_only=True)
+
+        # -- Get the header and the columns to read
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        indexes = _column_indexes(list(header), usecols)
+        columns = [header[i] for i in indexes]
+
+        # -- Read the rows in chunks
+        chunks = []
+        chunk = []
+        for count, row in enumerate(rows):
+            if nrows is not None and count >= nrows:
+                break
+            chunk.append([row[i] if i < len(row) else None for i in indexes])
+            if len(chunk) == STREAMING_CHUNK_SIZE:
+                chunks.append(pd.DataFrame(chunk, columns=columns))
+                chunk = []
+        chunks.append(pd.DataFrame(chunk, columns=columns))
+    finally:
+        workbook.close()
+
+    return pd.concat(chunks, ignore_index=True).infer_objects()
+
+
+def _column_indexes(header: list, usecols: str | list | None) -> list[int]:
+    """
+    Get the indexes of the columns to read from a sheet.
+
+    Parameters:
+        header - list: Header of the sheet
+        usecols - str | list | None: Columns to read (names, indexes or letters)
+
+    Returns:
+        list[int]: Indexes of the columns to read
+
+    Raises:
+        ValueError: If some of the columns are not in the sheet
+    """
+    if usecols is None:
+        return list(range(len(header)))
+
+    # -- Columns as Excel letters (e.g. "A:C,E")
+    if isinstance(usecols, str):
+        from openpyxl.utils import column_index_from_string
+
+        indexes = []
+        for part in usecols.replace(" ", "").split(","):
+            start, _, end = part.partition(":")
+            first = column_index_from_string(start) - 1
+            last = column_index_from_string(end) - 1 if end else first
+            indexes.extend(range(first, last + 1))
+        return indexes
+
+    # -- Columns as names or indexes
+    missing = [
+        col
+        for col in usecols
+        if not (isinstance(col, int) and 0 <= col < len(header)) and col not in header
+    ]
+    if missing:
+        raise ValueError(
+            f"Usecols do not match columns, columns expected but not found: {missing}"
+        )
+    return [col if isinstance(col, int) else header.index(col) for col in usecols]
+
+
+def _optimize_text(series: pd.Series, string_dtype: str) -> pd.Series:
+    """
+    Infer a compact dtype for a text column.
+
+    Parameters:
+        series - pd.Series: Text column
+        string_dtype - str: Dtype for columns with free text
+
+    Returns:
+        pd.Series: Column with the inferred dtype
+    """
+    values = series.dropna()
+    if values.empty or not values.map(type).eq(str).all():
+        return series
+
+    # -- Parse columns with dates
+    try:
+        return pd.to_datetime(series, format="ISO8601")
+    except (ValueError, TypeError):
+        pass
+
+    # -- Use categoricals for columns with repeated values
+    if values.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(values):
+        return series.astype("category")
+    return series.astype(string_dtype)
+
+
+def _optimize_frames(
+    frames: pd.DataFrame | dict, name: str, report: bool = True
+) -> pd.DataFrame | dict:
+    """
+    Optimize the memory usage of the tables read from a file.
+
+    Parameters:
+        frames - pd.DataFrame | dict: Table, or tables by sheet
+        name - str: Name of the file (and sheet) for the memory report
+        report - bool: Flag to log the memory report
+
+    Returns:
+        pd.DataFrame | dict: Optimized table, or tables by sheet
+    """
+    if isinstance(frames, dict):
+        return {
+            sheet: _optimize_frames(df, f"{name} [{sheet}]", report)
+            for sheet, df in frames.items()
+        }
+
+    frames, usage = optimize_memory(frames)
+    if report:
+        logger.info(
+            f"Memory usage of {name}: {usage['before'] / 1024:.1f} KB "
+            f"before, {usage['after'] / 1024:.1f} KB after optimization"
+        )
+    return frames
+
+
+def _to_dict(frames: pd.DataFrame | dict) -> dict:
+    """
+    Convert the tables read from a file to dictionaries.
+
+    Parameters:
+        frames - pd.DataFrame | dict: Table, or tables by sheet
+
+    Returns:
+        dict: Data of the table, or data by sheet
+    """
+    if isinstance(frames, dict):
+        return {sheet: df.to_dict() for sheet, df in frames.items()}
+    return frames.to_dict()
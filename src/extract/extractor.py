@@ -1,8 +1,18 @@
+from __future__ import annotations
+
+import copy
 from pathlib import Path
-from src.extract.pdf_reader import extract_data as extract_from_pdf
-from src.extract.dataframe_reader import extract_data as extract_from_dataframe
-from src.extract.json_reader import extract_data as extract_from_json
+from typing import TYPE_CHECKING
+from src.extract.progress import ProgressCallback
+from src.extract.source import Source, source_size, to_buffer
+from src.extract.registry import readers
 from src.utils.logger import get_logger
+from src.utils.tracing import tracer
+
+# -- pandas and pyarrow are only needed for the tables of the extraction cache
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 # -- Get the logger
 logger = get_logger()
@@ -18,35 +28,386 @@ class DataExtractor:
     - JSON
     - PDF
 
+    Files are read from a path or directly from an in-memory buffer (bytes,
+    memoryview or binary file-like object), without a temporary file.
+
+    The extraction is lazy: creating the extractor only checks the file and its
+    configuration, and the data, the texts, the tables or a single page are
+    extracted on first access and kept for the next ones. Tables memory-mapped
+    from the extraction cache, and the DataFrames of the memory optimization,
+    are only converted to dictionaries when the data is accessed.
+
     Attributes:
-        file_path - Path: Path to the file
+        file_path - Path | None: Path to the file (None for in-memory sources)
+        file_name - str: Name of the file
         file_format - str: File format
+        source - Path | memoryview | None: Content to extract (buffers are released)
         config - dict: Configuration for the extractor
         data - dict: Data extracted from the file (text and tables)
+        texts - dict: Texts of the pages of PDF files
+        tables - dict: Tables of the file
 
     Methods:
+        load: Extract all the data of the file
+        page: Get the text and table of a page of a PDF file
+        release: Free the in-memory content of the file
+        frames: Get the tables of the data as DataFrames
+        frame: Get a table of the data as a DataFrame
+        table_paths: Get the keys of the tables of the data
+        dump_tables: Write the tables of the data as Arrow IPC files
+        map_tables: Set the tables of the data from memory-mapped Arrow tables
         extract: Extract data from the file
         validate_config: Validate the configuration based on the file format
     """
 
-    def __init__(self, file_path: Path, config: dict = {}) -> None:
+    __slots__ = (
+        "file_path",
+        "file_name",
+        "file_format",
+        "source",
+        "config",
+        "_data",
+        "_sections",
+        "_pages",
+        "_progress",
+        "_frames",
+    )
+
+    def __init__(
+        self,
+        file_path: Source,
+        config: dict | None = None,
+        file_name: str | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> None:
         """
         Initialize the DataExtractor class.
 
         Parameters:
-            file_path - Path: Path to the file
-            config - dict: Configuration for the extractor
+            file_path - Source: Path to the file or buffer with its content
+            config - dict | None: Configuration for the extractor
+            file_name - str | None: Name of the file (required for buffers)
+            progress - ProgressCallback | None: Callback called after each page
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the name of an in-memory file is missing or the
+                file format is not supported
         """
-        # -- Set the file path and format
-        self.file_path = file_path
-        self.file_format = file_path.suffix[1:]
+        # -- Set the file path, name and format
+        if isinstance(file_path, Path):
+            self.file_path = file_path
+            self.file_name = file_name or file_path.name
+        else:
+            self.file_path = None
+            self.file_name = file_name or getattr(file_path, "name", None)
+            if not self.file_name:
+                raise ValueError("File name is required for in-memory files")
+        self.file_format = Path(self.file_name).suffix[1:]
+        self.source = to_buffer(file_path)
+
+        # -- Check the file before any extraction
+        if self.file_path is not None and not self.file_path.exists():
+            logger.error(f"File not found: {self.file_path}")
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+        if not readers.supports(self.file_format):
+            logger.error(f"File format not supported: {self.file_format}")
+            raise ValueError(f"File format not supported: {self.file_format}")
 
         # -- Validate the configuration and set it
+        config = config or {}
         self.validate_config(config)
         self.config = config
 
-        # -- Extract data from the file
-        self.data = self.extract()
+        # -- The data is extracted on first access
+        self._data: dict | None = None
+        self._sections: dict[str, dict] = {}
+        self._pages: dict[int, dict] = {}
+        self._progress = progress
+        self._frames: dict[tuple, pa.Table | pd.DataFrame] = {}
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state to pickle, without the progress callback and the buffer.
+
+        Memory-mapped and optimized tables are pickled as Arrow tables and
+        DataFrames, so they are not converted to dictionaries.
+
+        Returns:
+            dict: Attributes of the extractor
+        """
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["_progress"] = None
+        state["source"] = self.file_path
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the pickled state.
+
+        Parameters:
+            state - dict: Attributes of the extractor
+        """
+        self._frames = {}
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def data(self) -> dict:
+        """
+        Get the data of the file, extracting it on first access.
+
+        The in-memory content is released once all the data is extracted.
+
+        Memory-mapped and optimized tables are converted to dictionaries, so
+        callers that only need the tables should use frames instead.
+
+        Returns:
+            dict: Data extracted from the file with text and tables
+        """
+        self._ensure_loaded()
+        self._restore_tables()
+        return self._data
+
+    @property
+    def texts(self) -> dict:
+        """
+        Get the texts of the pages of a PDF file, without extracting its tables.
+
+        Returns:
+            dict: Text of each page (empty for other formats)
+        """
+        if self.file_format != "pdf":
+            return {}
+        if self._data is not None:
+            # -- The texts are never memory-mapped, so the tables are not restored
+            return self._data.get("texts", {})
+        if "texts" not in self._sections:
+            extracted = self._read(self._progress, tables=False)
+            self._sections["texts"] = extracted.get("texts", {})
+        return self._sections["texts"]
+
+    @property
+    def tables(self) -> dict:
+        """
+        Get the tables of the file, without running OCR on scanned PDFs.
+
+        Returns:
+            dict: Tables of the pages of PDF files, of the records of normalized
+                JSON files, or the data of CSV and Excel files
+        """
+        if self.file_format == "pdf":
+            if self.config["scan"] and self._data is None:
+                return {}
+            return self.data.get("tables", {})
+        if self.file_format == "json":
+            return self.data.get("tables", {}) if self.config.get("normalize") else {}
+        return self.data
+
+    def load(self) -> "DataExtractor":
+        """
+        Extract all the data of the file, releasing its in-memory content.
+
+        Returns:
+            DataExtractor: The extractor itself
+        """
+        self._ensure_loaded()
+        return self
+
+    def page(self, index: int) -> dict:
+        """
+        Get the text and table of a page of a PDF file, reading only that page.
+
+        Parameters:
+            index - int: Index of the page (starting at 0)
+
+        Returns:
+            dict: Text and table of the page (None when missing)
+
+        Raises:
+            ValueError: If the file is not a PDF or its content was released
+        """
+        if self.file_format != "pdf":
+            raise ValueError("Pages are only available for PDF files")
+
+        # -- Get the page from the extracted data or sections, converting only
+        #    its own table when it is memory-mapped
+        if self._data is not None:
+            table = self._data.get("tables", {}).get(index)
+            if ("tables", index) in self._frames:
+                from src.extract import arrow_tables
+
+                table = arrow_tables.to_dict(self._frames[("tables", index)])
+            return {"text": self._data.get("texts", {}).get(index), "table": table}
+        if index not in self._pages:
+            if "texts" in self._sections and self.config["scan"]:
+                self._pages[index] = {
+                    "text": self._sections["texts"].get(index),
+                    "table": None,
+                }
+                return self._pages[index]
+            extracted = self._read(pages=[index])
+            self._pages[index] = {
+                "text": extracted.get("texts", {}).get(index),
+                "table": extracted.get("tables", {}).get(index),
+            }
+        return self._pages[index]
+
+    def release(self, data: bool = False) -> None:
+        """
+        Free the in-memory content of the file and the memoized sections.
+
+        Sections not extracted yet are read again from the path of the file,
+        and are no longer available for in-memory files.
+
+        Parameters:
+            data - bool: Flag to also free the extracted data
+        """
+        self.source = self.file_path
+        self._progress = None
+        self._sections = {}
+        self._pages = {}
+        if data:
+            self._data = None
+            self._frames = {}
+
+    def has_data(self) -> bool:
+        """
+        Check if any data was extracted from the file, extracting it on first access.
+
+        Returns:
+            bool: True if the file has data (memory-mapped tables are not converted)
+        """
+        self._ensure_loaded()
+        return bool(self._data) or bool(self._frames)
+
+    def frames(self) -> dict[tuple, pd.DataFrame]:
+        """
+        Get the tables of the data as DataFrames, extracting it on first access.
+
+        Memory-mapped tables are wrapped without being copied or converted to
+        dictionaries, so they are shared with the other processes that map them,
+        and optimized tables keep their compact dtypes.
+
+        Returns:
+            dict[tuple, pd.DataFrame]: Tables by their keys in the data (an
+                empty key when the data is the table itself)
+        """
+        return {path: self.frame(path) for path in self.table_paths()}
+
+    def frame(self, path: tuple) -> pd.DataFrame:
+        """
+        Get a table of the data as a DataFrame, without converting the others.
+
+        Parameters:
+            path - tuple: Key of the table in the data (from table_paths)
+
+        Returns:
+            pd.DataFrame: Table of the data
+        """
+        import pandas as pd
+        from src.extract import arrow_tables
+
+        self._ensure_loaded()
+        if path in self._frames:
+            return arrow_tables.to_frame(self._frames[path])
+        return pd.DataFrame(arrow_tables.get_table(self._data, path))
+
+    def table_paths(self) -> list[tuple]:
+        """
+        Get the keys of the tables of the data, extracting it on first access.
+
+        Returns:
+            list[tuple]: Keys of the tables (an empty key when the data is the
+                table itself)
+        """
+        self._ensure_loaded()
+        return self._table_paths()
+
+    def dump_tables(self, directory: Path) -> tuple[DataExtractor, list[tuple]]:
+        """
+        Write the tables of the data as Arrow IPC files, extracting it on first access.
+
+        Parameters:
+            directory - Path: Directory of the files
+
+        Returns:
+            tuple[DataExtractor, list[tuple]]: Copy of the extractor with
+                placeholders (None) instead of the written tables, to store with
+                the files, and the keys of the written tables
+        """
+        from src.extract import arrow_tables
+
+        # -- The tables kept out of the data are written without converting them
+        self._ensure_loaded()
+        paths = self._table_paths()
+        rest, tables = arrow_tables.split_tables(self._data, paths)
+        for path, table in self._frames.items():
+            tables[path] = arrow_tables.to_frame(table)
+        written = arrow_tables.write_tables(directory, tables)
+
+        # -- Keep the tables that were not written with the rest of the data
+        for path in paths:
+            if path not in written:
+                table = tables[path]
+                if path in self._frames:
+                    table = arrow_tables.to_dict(self._frames[path])
+                rest = arrow_tables.set_table(rest, path, table)
+        stripped = copy.copy(self)
+        stripped._data = rest
+        stripped._frames = {}
+        return stripped, written
+
+    def map_tables(self, tables: dict[tuple, pa.Table]) -> None:
+        """
+        Set the tables of the data from Arrow tables memory-mapped from disk.
+
+        The data must have a placeholder (None) at the key of each table, and
+        the tables are only converted to dictionaries when the data is accessed.
+
+        Parameters:
+            tables - dict[tuple, pa.Table]: Tables by their keys in the data
+
+        Raises:
+            ValueError: If the tables do not match the placeholders of the data
+        """
+        from src.extract import arrow_tables
+
+        # -- A table that is the whole data leaves it empty
+        if () in tables:
+            placeholders = {()} if self._data == {} else set()
+        else:
+            placeholders = {
+                path
+                for path in self._table_paths()
+                if arrow_tables.get_table(self._data, path) is None
+            }
+        if placeholders != set(tables):
+            raise ValueError(f"Tables do not match the data of {self.file_name}")
+        self._frames = tables
+
+    @staticmethod
+    def requires_path(file_name: str, config: dict) -> bool:
+        """
+        Check if the extraction of a file needs it on disk.
+
+        Scanned PDFs are rasterized by pdf2image and Excel sheets are parsed by
+        worker processes, both reading the file from a path.
+
+        Parameters:
+            file_name - str: Name of the file
+            config - dict: Configuration for the extractor
+
+        Returns:
+            bool: True if the file must be on disk
+        """
+        file_format = Path(file_name).suffix[1:]
+        if file_format == "pdf":
+            return config.get("scan", False)
+        if file_format in ["xlsx", "xls", "xlsm", "xlsb"]:
+            sheets = config.get("sheets")
+            return sheets == "all" or isinstance(sheets, list) and len(sheets) > 1
+        return False
 
     def validate_config(self, config: dict) -> None:
         """
@@ -70,41 +431,148 @@ class DataExtractor:
                 if not isinstance(config["scan"], bool):
                     raise ValueError("Scan flag must be a boolean")
 
-            # -- Validation for CSV files
-            # elif self.file_format == "csv":
+            # -- Validation for CSV and Excel files
+            elif self.file_format in ["csv", "xlsx", "xls", "xlsm", "xlsb"]:
+                if "optimize_memory" in config and not isinstance(
+                    config["optimize_memory"], bool
+                ):
+                    raise ValueError("Optimize memory flag must be a boolean")
 
-            # -- Validation for Excel files
-            # elif self.file_format in ["xlsx", "xls", "xlsm", "xlsb"]:
+                # -- Validation for Excel files
+                sheets = config.get("sheets")
+                if sheets is not None and not isinstance(sheets, (str, int, list)):
+                    raise ValueError("Sheets must be a name, an index or a list")
+                if "nrows" in config and not isinstance(config["nrows"], int):
+                    raise ValueError("Number of rows must be an integer")
+                if "read_only" in config and not isinstance(config["read_only"], bool):
+                    raise ValueError("Read-only flag must be a boolean")
 
             # -- Validation for JSON files
-            # elif self.file_format == "json":
+            elif self.file_format == "json":
+                if "normalize" in config and not isinstance(config["normalize"], bool):
+                    raise ValueError("Normalize flag must be a boolean")
+                if "json_paths" in config and not isinstance(
+                    config["json_paths"], dict
+                ):
+                    raise ValueError("JSON paths must be a dictionary")
         logger.debug(f"Configuration validated for {self.file_format} file")
 
-    def extract(self) -> dict:
+    def extract(self, progress: ProgressCallback | None = None) -> dict:
         """
         Extract data from the file.
 
+        Parameters:
+            progress - ProgressCallback | None: Callback called after each page
+
         Returns:
-            dict: Data extracted from the file with text and tables
+            dict: Data extracted from the file with text and tables (with
+                placeholders for the optimized tables, kept as DataFrames)
         """
-        # -- Check if the file exists
-        if not self.file_path.exists():
-            logger.error(f"File not found: {self.file_path}")
-            raise FileNotFoundError(f"File not found: {self.file_path}")
+        # -- Extract data with the reader of the file format
+        with tracer.span("extract", format=self.file_format) as span:
+            extracted_data = self._keep_frames(self._read(progress))
+            if span.recording:
+                span.set(bytes=source_size(self.source))
 
-        # -- Extract data based on the file format
-        extracted_data = {}
-        if self.file_format == "pdf":
-            extracted_data = extract_from_pdf(self.file_path, self.config["scan"])
-        elif self.file_format in ["csv", "xlsx", "xls", "xlsm", "xlsb"]:
-            extracted_data = extract_from_dataframe(self.file_path)
-        elif self.file_format == "json":
-            extracted_data = extract_from_json(self.file_path)
-        else:
-            logger.error(f"File format not supported: {self.file_format}")
-            raise ValueError(f"File format not supported: {self.file_format}")
+        # -- Files without pages are reported as a single step
+        if progress is not None and self.file_format != "pdf":
+            progress(0, 1, extracted_data)
 
-        if extracted_data:
-            logger.info(f"Data extracted from {self.file_path}")
+        if extracted_data or self._frames:
+            logger.info(f"Data extracted from {self.file_path or self.file_name}")
 
         return extracted_data
+
+    def _read(self, progress: ProgressCallback | None = None, **options) -> dict:
+        """
+        Read the source with the reader of the file format, importing it on first use.
+
+        Parameters:
+            progress - ProgressCallback | None: Callback called after each page
+            options - dict: Options of the reader (e.g. the pages of PDF files)
+
+        Returns:
+            dict: Data extracted by the reader
+
+        Raises:
+            ValueError: If the file format is not supported
+        """
+        self._check_source()
+        reader = readers.get(self.file_format)
+        return reader(self.source, self.config, self.file_name, progress, **options)
+
+    def _ensure_loaded(self) -> None:
+        """
+        Extract all the data of the file if it is not extracted yet.
+
+        The in-memory content is released once all the data is extracted.
+        """
+        if self._data is None:
+            self._data = self.extract(self._progress)
+            self.release()
+
+    def _table_paths(self) -> list[tuple]:
+        """
+        Get the keys of the tables in the data, including the ones kept out of it.
+
+        Returns:
+            list[tuple]: Keys of the tables
+        """
+        from src.extract import arrow_tables
+
+        if () in self._frames:
+            return [()]
+        return arrow_tables.table_paths(self._data, self.file_format, self.config)
+
+    def _keep_frames(self, data: dict | pd.DataFrame) -> dict:
+        """
+        Keep the DataFrames of the memory optimization out of the data.
+
+        Parameters:
+            data - dict | pd.DataFrame: Data extracted from the file
+
+        Returns:
+            dict: Data with placeholders (None) instead of the DataFrames
+        """
+        if not self.config.get("optimize_memory"):
+            return data
+
+        # -- pandas is already imported by the reader of the optimized tables
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            self._frames = {(): data}
+            return {}
+        for sheet, table in data.items():
+            if isinstance(table, pd.DataFrame):
+                self._frames[(sheet,)] = table
+                data[sheet] = None
+        return data
+
+    def _restore_tables(self) -> None:
+        """
+        Convert the memory-mapped and optimized tables to dictionaries in the data.
+        """
+        if not self._frames:
+            return
+        from src.extract import arrow_tables
+
+        for path, table in self._frames.items():
+            self._data = arrow_tables.set_table(
+                self._data, path, arrow_tables.to_dict(table)
+            )
+        self._frames = {}
+
+    def _check_source(self) -> None:
+        """
+        Check if the content of the file is still available for an extraction.
+
+        Raises:
+            ValueError: If the in-memory content was already released
+            FileNotFoundError: If the file does not exist
+        """
+        if self.source is None:
+            raise ValueError("The in-memory content was already released")
+        if self.file_path is not None and not self.file_path.exists():
+            logger.error(f"File not found: {self.file_path}")
+            raise FileNotFoundError(f"File not found: {self.file_path}")
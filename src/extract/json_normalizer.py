@@ -0,0 +1,182 @@
+import hashlib
+import json
+import pandas as pd
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Path mappings (table name -> record path) cached by schema signature
+_mapping_cache: dict[str, dict[str, str]] = {}
+
+
+def normalize_json(
+    data: dict | list, mappings: dict[str, str] | None = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Flatten the record-like paths of a nested JSON document into typed tables.
+
+    A record-like path is a list of objects, written as "statements.income[*]".
+    When no mappings are provided, the mappings cached for the document schema
+    are used and, if there are none, the record paths are detected automatically.
+
+    Parameters:
+        data - dict | list: JSON document
+        mappings - dict[str, str] | None: Table name to record path mappings
+
+    Returns:
+        dict[str, pd.DataFrame]: Tables flattened from the document
+
+    Raises:
+        KeyError: If a mapped path is not present in the document
+    """
+    # -- Get the mappings for the document schema
+    signature = schema_signature(data)
+    if mappings is not None:
+        _mapping_cache[signature] = dict(mappings)
+    elif signature in _mapping_cache:
+        mappings = _mapping_cache[signature]
+    else:
+        mappings = {path: path for path in find_record_paths(data)}
+        _mapping_cache[signature] = mappings
+
+    # -- Flatten each record path in bulk
+    tables = {}
+    for name, path in mappings.items():
+        records = _resolve_path(data, path)
+        df = pd.json_normalize(records, sep=".")
+        tables[name] = _coerce_types(df)
+        logger.debug(f"Flattened {len(df)} records from {path}")
+
+    return tables
+
+
+def find_record_paths(data: dict | list, prefix: str = "") -> list[str]:
+    """
+    Find the paths of the lists of objects in a JSON document.
+
+    Parameters:
+        data - dict | list: JSON document
+        prefix - str: Path of the current node
+
+    Returns:
+        list[str]: Record paths found in the document
+    """
+    paths = []
+    if _is_record_list(data):
+        paths.append(f"{prefix}[*]")
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            paths.extend(find_record_paths(value, path))
+    return paths
+
+
+def schema_signature(data: dict | list) -> str:
+    """
+    Compute a signature of the structure of a JSON document.
+
+    Documents with the same keys and value types share the same signature,
+    regardless of the number of records in their lists.
+
+    Parameters:
+        data - dict | list: JSON document
+
+    Returns:
+        str: Signature of the document schema
+    """
+    schema = json.dumps(_schema(data), sort_keys=True)
+    return hashlib.sha1(schema.encode("utf-8")).hexdigest()
+
+
+def clear_mapping_cache() -> None:
+    """
+    Clear the path mappings cached by schema.
+    """
+    _mapping_cache.clear()
+
+
+def _schema(node: object) -> object:
+    """
+    Get the structure of a JSON node.
+
+    Parameters:
+        node - object: JSON node
+
+    Returns:
+        object: Structure of the node
+    """
+    if isinstance(node, dict):
+        return {str(key): _schema(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_schema(node[0])] if node else []
+    return type(node).__name__
+
+
+def _is_record_list(node: object) -> bool:
+    """
+    Check if a JSON node is a non-empty list of objects.
+
+    Parameters:
+        node - object: JSON node
+
+    Returns:
+        bool: True if the node is a list of records
+    """
+    return (
+        isinstance(node, list)
+        and len(node) > 0
+        and all(isinstance(item, dict) for item in node)
+    )
+
+
+def _resolve_path(data: dict | list, path: str) -> list[dict]:
+    """
+    Get the records of a path in a JSON document.
+
+    Parameters:
+        data - dict | list: JSON document
+        path - str: Record path (e.g. "statements.income[*]")
+
+    Returns:
+        list[dict]: Records found in the path
+
+    Raises:
+        KeyError: If the path is not present in the document
+    """
+    node = data
+    keys = path.removesuffix("[*]")
+    for key in keys.split(".") if keys else []:
+        if not isinstance(node, dict) or key not in node:
+            logger.error(f"Path not found in JSON document: {path}")
+            raise KeyError(f"Path not found in JSON document: {path}")
+        node = node[key]
+
+    # -- A single object is a table with one record
+    if isinstance(node, dict):
+        return [node]
+    if not _is_record_list(node):
+        logger.error(f"Path does not contain records: {path}")
+        raise KeyError(f"Path does not contain records: {path}")
+    return node
+
+
+def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the text columns of a table with only numeric values to numbers.
+
+    Parameters:
+        df - pd.DataFrame: Flattened table
+
+    Returns:
+        pd.DataFrame: Table with typed columns
+    """
+    for col in df.select_dtypes(include="object").columns:
+        try:
+            converted = pd.to_numeric(df[col], errors="coerce")
+        except (TypeError, ValueError):
+            # -- Columns with nested lists are kept as they are
+            continue
+        if converted.notna().sum() == df[col].notna().sum():
+            df[col] = converted
+    return df
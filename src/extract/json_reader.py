@@ -1,17 +1,20 @@
 import json
-from pathlib import Path
+from src.extract.json_normalizer import normalize_json
+from src.extract.progress import ProgressCallback
+from src.extract.source import Source, open_source, source_size, to_buffer
 from src.utils.logger import get_logger
+from src.utils.tracing import tracer
 
 # -- Get logger
 logger = get_logger()
 
 
-def extract_data(file_path: Path) -> dict:
+def extract_data(file_path: Source) -> dict:
     """
     Extract data from JSON file.
 
     Parameters:
-        file_path - Path : Path to JSON file.
+        file_path - Source : Path to JSON file or buffer with its content.
 
     Returns:
         dict: Dictionary with data from JSON file
@@ -20,9 +23,43 @@ def extract_data(file_path: Path) -> dict:
 
     try:
         # -- Open and read JSON file
-        with open(file_path, "r", encoding="utf-8") as f:
+        source = to_buffer(file_path)
+        with tracer.span("json.parse") as span, open_source(source) as f:
+            if span.recording:
+                span.set(bytes=source_size(source))
             data_json = json.load(f)
     except json.JSONDecodeError as e:
         logger.error(f"Failed to decode JSON from the file {file_path}: {e}")
 
     return data_json
+
+
+def read(
+    source: Source,
+    config: dict,
+    file_name: str,
+    progress: ProgressCallback | None = None,
+) -> dict:
+    """
+    Read a JSON file for the reader registry, flattening it when configured.
+
+    Parameters:
+        source - Source: Path to JSON file or buffer with its content
+        config - dict: Configuration for the extractor
+        file_name - str: Name of the file
+        progress - ProgressCallback | None: Unused, documents are read at once
+
+    Returns:
+        dict: Data of the file, or its tables of records when normalized (the
+            data itself when it has no records)
+    """
+    data = extract_data(source)
+    if data and config.get("normalize", False):
+        with tracer.span("json.normalize"):
+            tables = normalize_json(data, config.get("json_paths"))
+        if not tables:
+            logger.warning(f"No records to flatten in {file_name}, keeping the data")
+            return data
+        with tracer.span("json.to_dict"):
+            return {"tables": {name: df.to_dict() for name, df in tables.items()}}
+    return data
@@ -1,38 +1,101 @@
 import pandas as pd
 import pdfplumber
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pathlib import Path
+from src.extract.progress import ExtractionCancelled, ProgressCallback
+from src.extract.source import (
+    Source,
+    as_path,
+    open_source,
+    source_size,
+    to_buffer,
+)
 from src.utils.logger import get_logger
+from src.utils.tracing import tracer
 
 # -- Get the logger
 logger = get_logger()
 
 
-def extract_data(pdf_path: Path, scan: bool) -> dict:
+def extract_data(
+    pdf_path: Source,
+    scan: bool,
+    progress: ProgressCallback | None = None,
+    pages: list[int] | None = None,
+    tables: bool = True,
+) -> dict:
     """
     Extract the text from a PDF file.
 
     Parameters:
-        pdf_path - Path: Path to the PDF file
+        pdf_path - Source: Path to the PDF file or buffer with its content
         scan - bool: Flag to indicate if the PDF file is scanned
+        progress - ProgressCallback | None: Callback called after each page
+        pages - list[int] | None: Indexes of the pages to read (all when None)
+        tables - bool: Flag to extract the tables (scanned PDFs have no tables)
 
     Returns:
         dict: Dictionary with the text and tables extracted from the PDF file
+
+    Raises:
+        ExtractionCancelled: If the progress callback cancels the extraction
     """
     # -- Log the process
     logger.debug(f"Extracting data from {pdf_path}...")
 
     # -- Read the PDF file based on the scan flag
-    return _read_scanned_pdf(pdf_path) if scan else _read_pdf(pdf_path)
+    source = to_buffer(pdf_path)
+    with tracer.span("pdf.extract", scan=scan) as span:
+        if span.recording:
+            span.set(bytes=source_size(source))
+        if scan:
+            data = _read_scanned_pdf(source, progress, pages)
+        else:
+            data = _read_pdf(source, progress, pages, tables)
+        if span.recording:
+            read = data.get("texts", {}).keys() | data.get("tables", {}).keys()
+            span.set(pages=len(read))
+    return data
+
+
+def read(
+    source: Source,
+    config: dict,
+    file_name: str,
+    progress: ProgressCallback | None = None,
+    **options,
+) -> dict:
+    """
+    Read a PDF file for the reader registry.
 
+    Parameters:
+        source - Source: Path to the PDF file or buffer with its content
+        config - dict: Configuration for the extractor (with the scan flag)
+        file_name - str: Name of the file
+        progress - ProgressCallback | None: Callback called after each page
+        options - dict: Pages to read and flag to extract the tables
 
-def _read_scanned_pdf(file_path: Path) -> dict:
+    Returns:
+        dict: Dictionary with the text and tables extracted from the PDF file
+    """
+    return extract_data(source, config.get("scan", False), progress, **options)
+
+
+def _read_scanned_pdf(
+    source: Path | memoryview,
+    progress: ProgressCallback | None = None,
+    pages: list[int] | None = None,
+) -> dict:
     """
     Read scanned PDF file and get the text data.
 
+    The pages are rasterized one at a time, so only one page image is in memory.
+
     Parameters:
-        file_path - Path: Path to the PDF file
+        source - Path | memoryview: Path to the PDF file or buffer with its content
+        progress - ProgressCallback | None: Callback called after each page
+        pages - list[int] | None: Indexes of the pages to read (all when None)
 
     Returns:
         dict: Text data from the file
@@ -40,26 +103,46 @@ def _read_scanned_pdf(file_path: Path) -> dict:
     texts = {}
 
     try:
-        # -- Get images from PDF conversion
-        images = convert_from_path(file_path)
-
-        # -- Get text from the images
-        for idx, img in enumerate(images):
-            text = pytesseract.image_to_string(img)
-            if text:
-                texts[idx] = text
+        # -- Get images from PDF conversion (pdf2image only reads from disk)
+        with as_path(source, ".pdf") as file_path:
+            total = pdfinfo_from_path(file_path)["Pages"]
+            for idx in _selected_pages(total, pages):
+                with tracer.span("pdf.rasterize", page=idx, pages=1):
+                    images = convert_from_path(
+                        file_path, first_page=idx + 1, last_page=idx + 1
+                    )
+
+                # -- Get text from the image
+                with tracer.span("pdf.ocr", page=idx, pages=1):
+                    text = pytesseract.image_to_string(images[0])
+                if text:
+                    texts[idx] = text
+                # -- Arguments are only formatted if the record is logged
+                logger.debug("Page %d of %d scanned", idx + 1, total)
+                if progress is not None:
+                    progress(idx, total, {"texts": texts})
+    except ExtractionCancelled:
+        raise
     except Exception as e:
         logger.error(f"Error reading scanned PDF: {e}")
 
     return {"texts": texts} if texts else {}
 
 
-def _read_pdf(file_path: Path) -> dict:
+def _read_pdf(
+    source: Path | memoryview,
+    progress: ProgressCallback | None = None,
+    pages: list[int] | None = None,
+    read_tables: bool = True,
+) -> dict:
     """
     Read PDF file and get text data and tables.
 
     Parameters:
-        file_path - Path: Path to the PDF file
+        source - Path | memoryview: Path to the PDF file or buffer with its content
+        progress - ProgressCallback | None: Callback called after each page
+        pages - list[int] | None: Indexes of the pages to read (all when None)
+        read_tables - bool: Flag to extract the tables
 
     Returns:
         dict: Text data and tables from the file
@@ -69,17 +152,49 @@ def _read_pdf(file_path: Path) -> dict:
 
     try:
         # -- Open the file and read data
-        with pdfplumber.open(file_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                # -- Extract text from the page
-                text = page.extract_text()
-                if text is not None and text.strip():
-                    texts[i] = text
-                # -- Extract tables from the page
-                for table in page.extract_tables():
-                    df_table = pd.DataFrame(table[1:], columns=table[0])
-                    tables[i] = df_table.to_dict()
+        with open_source(source) as f, pdfplumber.open(f) as pdf:
+            for i in _selected_pages(len(pdf.pages), pages):
+                page = pdf.pages[i]
+                try:
+                    # -- Extract text from the page
+                    with tracer.span("pdf.text", page=i, pages=1):
+                        text = page.extract_text()
+                    if text is not None and text.strip():
+                        texts[i] = text
+                    # -- Extract tables from the page
+                    if read_tables:
+                        with tracer.span("pdf.tables", page=i, pages=1):
+                            page_tables = page.extract_tables()
+                        for table in page_tables:
+                            with tracer.span("pdf.to_dict", page=i):
+                                df_table = pd.DataFrame(table[1:], columns=table[0])
+                                tables[i] = df_table.to_dict()
+                finally:
+                    # -- Free the objects parsed from the page, which pdfplumber
+                    #    keeps until the file is closed
+                    page.close()
+                logger.debug("Page %d of %d read", i + 1, len(pdf.pages))
+                if progress is not None:
+                    progress(i, len(pdf.pages), {"texts": texts, "tables": tables})
+    except ExtractionCancelled:
+        raise
     except Exception as e:
         logger.error(f"Error reading PDF: {e}")
 
     return {"texts": texts, "tables": tables} if texts or tables else {}
+
+
+def _selected_pages(total: int, pages: list[int] | None) -> list[int]:
+    """
+    Get the indexes of the pages to read, ignoring the ones out of the file.
+
+    Parameters:
+        total - int: Number of pages of the file
+        pages - list[int] | None: Indexes of the pages to read (all when None)
+
+    Returns:
+        list[int]: Sorted indexes of the pages
+    """
+    if pages is None:
+        return list(range(total))
+    return sorted({page for page in pages if 0 <= page < total})
@@ -0,0 +1,11 @@
+from typing import Callable
+
+# -- Callback for the progress of an extraction, called after each page with
+#    the index of the page, the number of pages and the data extracted so far
+ProgressCallback = Callable[[int, int, dict], None]
+
+
+class ExtractionCancelled(Exception):
+    """
+    Exception raised by a progress callback to stop an extraction.
+    """
@@ -0,0 +1,234 @@
+import importlib
+import threading
+from typing import Callable
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Reader of a file format, called with the source, the configuration, the
+#    file name, the progress callback and the options of the format
+Reader = Callable[..., dict]
+
+# -- Group of the entry points of third-party readers, named by extension:
+#    [project.entry-points."finance_analyzer.readers"]
+#    xml = "my_package.xml_reader:read"
+ENTRY_POINT_GROUP = "finance_analyzer.readers"
+
+
+class ReaderRegistry:
+    """
+    Registry of the readers by file extension and MIME type.
+
+    Readers are registered by the import path of their function and are only
+    imported on first use, so the heavy backends (pdfplumber, pandas, OCR) are
+    not loaded until a file of their format is extracted. Third-party readers
+    are discovered from the entry points of the installed packages.
+
+    Attributes:
+        entry_point_group - str | None: Group of the entry points of readers
+
+    Methods:
+        register: Register a reader for extensions and MIME types
+        get: Get the reader of an extension or MIME type, importing it
+        formats: Get the supported extensions
+        supports: Check if a reader is registered for an extension
+        extension: Get the extension of a MIME type
+        is_loaded: Check if the reader of an extension was imported
+    """
+
+    def __init__(self, entry_point_group: str | None = ENTRY_POINT_GROUP) -> None:
+        """
+        Initialize the ReaderRegistry class.
+
+        Parameters:
+            entry_point_group - str | None: Group of the entry points of readers
+                (None to ignore third-party readers)
+        """
+        self.entry_point_group = entry_point_group
+        self._specs: dict[str, str | Reader] = {}
+        self._readers: dict[str, Reader] = {}
+        self._mime_types: dict[str, str] = {}
+        self._discovered = entry_point_group is None
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        reader: str | Reader,
+        extensions: list[str],
+        mime_types: list[str] | None = None,
+    ) -> None:
+        """
+        Register a reader for extensions and MIME types.
+
+        Parameters:
+            reader - str | Reader: Reader function or its import path
+                ("package.module:function")
+            extensions - list[str]: Extensions of the format (e.g. ["xlsx"])
+            mime_types - list[str] | None: MIME types of the format, mapped to
+                the first extension
+        """
+        with self._lock:
+            for extension in extensions:
+                extension = _normalize(extension)
+                self._specs[extension] = reader
+                self._readers.pop(extension, None)
+            for mime_type in mime_types or []:
+                self._mime_types[mime_type.lower()] = _normalize(extensions[0])
+
+    def get(self, key: str) -> Reader:
+        """
+        Get the reader of an extension or MIME type, importing it on first use.
+
+        Parameters:
+            key - str: Extension (with or without the dot) or MIME type
+
+        Returns:
+            Reader: Reader of the format
+
+        Raises:
+            ValueError: If no reader is registered for the format
+        """
+        extension = (self.extension(key) or key) if "/" in key else _normalize(key)
+        if extension not in self._specs:
+            self._discover()
+
+        with self._lock:
+            if extension in self._readers:
+                return self._readers[extension]
+            if extension not in self._specs:
+                logger.error(f"File format not supported: {extension}")
+                raise ValueError(f"File format not supported: {extension}")
+
+            # -- Import the reader
+            spec = self._specs[extension]
+            if isinstance(spec, str):
+                module_name, _, function = spec.partition(":")
+                reader = getattr(importlib.import_module(module_name), function)
+            elif hasattr(spec, "load"):
+                reader = spec.load()
+            else:
+                reader = spec
+            self._readers[extension] = reader
+            logger.debug(f"Reader of {extension} files loaded")
+            return reader
+
+    def formats(self) -> list[str]:
+        """
+        Get the supported extensions, including the third-party ones.
+
+        Returns:
+            list[str]: Extensions without the dot
+        """
+        self._discover()
+        with self._lock:
+            return list(self._specs)
+
+    def supports(self, extension: str) -> bool:
+        """
+        Check if a reader is registered for an extension.
+
+        Parameters:
+            extension - str: Extension of the format
+
+        Returns:
+            bool: True if the format is supported
+        """
+        extension = _normalize(extension)
+        if extension not in self._specs:
+            self._discover()
+        return extension in self._specs
+
+    def extension(self, mime_type: str) -> str | None:
+        """
+        Get the extension of a MIME type.
+
+        Parameters:
+            mime_type - str: MIME type (parameters like the charset are ignored)
+
+        Returns:
+            str | None: Extension of the format, or None if it is not registered
+        """
+        mime_type = mime_type.split(";")[0].strip().lower()
+        if mime_type not in self._mime_types:
+            self._discover()
+        return self._mime_types.get(mime_type)
+
+    def is_loaded(self, extension: str) -> bool:
+        """
+        Check if the reader of an extension was imported.
+
+        Parameters:
+            extension - str: Extension of the format
+
+        Returns:
+            bool: True if the reader was imported
+        """
+        return _normalize(extension) in self._readers
+
+    def _discover(self) -> None:
+        """
+        Register the readers of the entry points, without importing them.
+
+        Built-in readers are kept when an entry point has the same extension.
+        The entry points are only read when a format is not registered or
+        when the formats are listed.
+        """
+        with self._lock:
+            if self._discovered:
+                return
+            self._discovered = True
+            for entry_point in entry_points(group=self.entry_point_group):
+                extension = _normalize(entry_point.name)
+                if extension in self._specs:
+                    logger.warning(
+                        f"Ignoring reader {entry_point.value} of {extension}"
+                    )
+                    continue
+                self._specs[extension] = entry_point
+                logger.debug(f"Reader {entry_point.value} registered for {extension}")
+
+
+def entry_points(group: str) -> list:
+    """
+    Get the installed entry points of a group.
+
+    importlib.metadata scans the installed packages, so it is only imported
+    when third-party readers are looked up.
+
+    Parameters:
+        group - str: Group of the entry points
+
+    Returns:
+        list: Entry points of the group
+    """
+    from importlib import metadata
+
+    return list(metadata.entry_points(group=group))
+
+
+def _normalize(extension: str) -> str:
+    """
+    Normalize an extension to lowercase without the dot.
+
+    Parameters:
+        extension - str: Extension (e.g. ".PDF")
+
+    Returns:
+        str: Normalized extension (e.g. "pdf")
+    """
+    return extension.lower().lstrip(".")
+
+
+# -- Readers of the built-in formats
+readers = ReaderRegistry()
+readers.register("src.extract.pdf_reader:read", ["pdf"], ["application/pdf"])
+readers.register("src.extract.dataframe_reader:read", ["csv"], ["text/csv"])
+for extension, mime_type in {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "xls": "application/vnd.ms-excel",
+    "xlsm": "application/vnd.ms-excel.sheet.macroenabled.12",
+    "xlsb": "application/vnd.ms-excel.sheet.binary.macroenabled.12",
+}.items():
+    readers.register("src.extract.dataframe_reader:read", [extension], [mime_type])
+readers.register("src.extract.json_reader:read", ["json"], ["application/json"])
@@ -0,0 +1,182 @@
+import io
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+from src.config import settings
+
+# -- Sources accepted by the readers: a path or an in-memory buffer
+Source = Path | bytes | bytearray | memoryview | BinaryIO
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable binary stream over a memory buffer that reads without copying it.
+
+    Attributes:
+        buffer - memoryview: Buffer with the file content
+        position - int: Current position of the stream
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview) -> None:
+        """
+        Initialize the BufferReader class.
+
+        Parameters:
+            buffer - bytes | bytearray | memoryview: Buffer with the file content
+        """
+        self.buffer = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def readable(self) -> bool:
+        """
+        Check if the stream can be read.
+
+        Returns:
+            bool: Always True
+        """
+        return True
+
+    def seekable(self) -> bool:
+        """
+        Check if the stream supports random access.
+
+        Returns:
+            bool: Always True
+        """
+        return True
+
+    def readinto(self, b: bytearray | memoryview) -> int:
+        """
+        Read bytes of the buffer into a pre-allocated object.
+
+        Parameters:
+            b - bytearray | memoryview: Object to receive the bytes
+
+        Returns:
+            int: Number of bytes read
+        """
+        size = min(len(b), len(self.buffer) - self.position)
+        b[:size] = self.buffer[self.position : self.position + size]
+        self.position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Change the position of the stream.
+
+        Parameters:
+            offset - int: Offset relative to the reference position
+            whence - int: Reference position (start, current or end)
+
+        Returns:
+            int: New position of the stream
+        """
+        reference = {io.SEEK_SET: 0, io.SEEK_CUR: self.position}
+        self.position = max(0, reference.get(whence, len(self.buffer)) + offset)
+        return self.position
+
+    def tell(self) -> int:
+        """
+        Get the position of the stream.
+
+        Returns:
+            int: Current position of the stream
+        """
+        return self.position
+
+
+def to_buffer(source: Source) -> Path | memoryview:
+    """
+    Normalize a source to a path or a memory buffer.
+
+    Buffers of in-memory files (like the Streamlit UploadedFile) are shared
+    without copying their content.
+
+    Parameters:
+        source - Source: Path, buffer or binary file-like object
+
+    Returns:
+        Path | memoryview: Path of the file or buffer with its content
+    """
+    if isinstance(source, Path):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    source.seek(0)
+    return memoryview(source.read())
+
+
+def open_source(source: Path | memoryview) -> BinaryIO:
+    """
+    Open a binary stream over a source.
+
+    Parameters:
+        source - Path | memoryview: Path of the file or buffer with its content
+
+    Returns:
+        BinaryIO: Binary stream positioned at the start of the content
+    """
+    if isinstance(source, Path):
+        return open(source, "rb")
+    return io.BufferedReader(BufferReader(source))
+
+
+def read_head(source: Path | memoryview, size: int) -> bytes:
+    """
+    Read the first bytes of a source.
+
+    Parameters:
+        source - Path | memoryview: Path of the file or buffer with its content
+        size - int: Maximum number of bytes to read
+
+    Returns:
+        bytes: First bytes of the content
+    """
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            return f.read(size)
+    return bytes(source[:size])
+
+
+def source_size(source: Path | memoryview) -> int:
+    """
+    Get the size of a source in bytes.
+
+    Parameters:
+        source - Path | memoryview: Path of the file or buffer with its content
+
+    Returns:
+        int: Size of the content
+    """
+    if isinstance(source, Path):
+        return source.stat().st_size
+    return source.nbytes
+
+
+@contextmanager
+def as_path(source: Path | memoryview, suffix: str) -> Iterator[Path]:
+    """
+    Get a path for a source, spilling buffers to a temporary file.
+
+    Used by the backends that only read files from disk (e.g. pdf2image).
+
+    Parameters:
+        source - Path | memoryview: Path of the file or buffer with its content
+        suffix - str: Suffix of the temporary file
+
+    Yields:
+        Path: Path of the file with the content
+    """
+    if isinstance(source, Path):
+        yield source
+        return
+
+    # -- Write the buffer to a temporary file removed after use
+    settings.TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=settings.TEMP_DIR, suffix=suffix) as f:
+        f.write(source)
+        f.flush()
+        yield Path(f.name)
@@ -1,6 +1,32 @@
+import re
+import json
+import functools
+from typing import Callable, Sequence
+import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from src.extract.extractor import DataExtractor
-from src.api.file_processing import process_uploaded_file
+from src.extract.registry import readers
+from src.api.file_processing import (
+    combine_tables,
+    extracted_tables,
+    extraction_cache,
+    process_uploaded_file,
+    text_index,
+)
+from src.api.jobs import ExtractionJob, job_manager
+from src.config import settings
+from src.utils.profiling import TaskProfile
+
+# -- Maximum number of search results shown
+SEARCH_LIMIT = 100
+
+# -- Maximum number of pages or tables, and of table rows, shown at a time
+PAGE_SIZE = 10
+TABLE_ROWS = 1000
+
+# -- Characters of the extracted texts escaped before showing them as markdown
+MARKDOWN_CHARS = re.compile(r"([\\`*_{}\[\]()#+\-.!|$~<>:])")
 
 
 def page_setup() -> None:
@@ -9,17 +35,19 @@ def page_setup() -> None:
 
     - Allows users to upload financial reports in CSV, Excel, JSON, or PDF format.
     - If a PDF is scanned, enables OCR processing.
-    - Extracts and displays text and tables from the uploaded document.
+    - Extracts the files concurrently and displays their text and tables.
+    - Combines the tables of all files into one dataset.
+    - Searches the texts of the PDF files and shows the pages of the results.
     """
     # -- Page title
     st.title("Upload File")
-    st.write("Upload your file to start analyzing your financial data.")
+    st.write("Upload your files to start analyzing your financial data.")
 
     # -- File uploader
-    uploaded_file = st.file_uploader(
-        "Choose a file",
-        type=["csv", "xlsx", "xls", "xlsm", "xlsb", "json", "pdf"],
-        accept_multiple_files=False,
+    uploaded_files = st.file_uploader(
+        "Choose files",
+        type=readers.formats(),
+        accept_multiple_files=True,
         label_visibility="hidden",
     )
 
@@ -27,41 +55,458 @@ def page_setup() -> None:
     # TODO: Add advanced configuration options for the extractor
     scan_pdf = st.checkbox("Scanned PDF file")
 
-    # -- Check if the file was uploaded
-    if uploaded_file:
-        st.success("File uploaded successfully!")
+    # -- Checkbox for flattening nested JSON files
+    normalize_json = st.checkbox("Flatten nested JSON records")
+
+    # -- Checkbox for reading every sheet of Excel files
+    all_sheets = st.checkbox("Read all Excel sheets")
+
+    # -- Checkbox for optimizing the memory usage of tables
+    optimize_memory = st.checkbox("Optimize memory usage of tables")
+
+    # -- Company and period of the reports, for the report store
+    report = {}
+    if settings.STORE_PATH:
+        company_col, period_col = st.columns(2)
+        report["company"] = company_col.text_input("Company") or None
+        report["period"] = (
+            period_col.text_input("Period (e.g. 2024 or 2024-Q1)") or None
+        )
+
+    # -- Check if the files were uploaded
+    if uploaded_files:
+        st.success(f"{len(uploaded_files)} file(s) uploaded successfully!")
         st.divider()
 
-        # -- Extract data from the file
+        # -- Extract data from the files
         # TODO: Set the configuration based on the user's selection
         # TODO: Include file format on the configuration
-        config = {"scan": scan_pdf}
-        extractor = process_uploaded_file(uploaded_file, config)
+        config = {
+            "scan": scan_pdf,
+            "normalize": normalize_json,
+            "optimize_memory": optimize_memory,
+        }
+        if all_sheets:
+            config["sheets"] = "all"
+        jobs = submit_extractions(uploaded_files, config, report)
 
-        # -- Show the file content
+        # -- Show the performance of the extractions on the sidebar
+        if settings.PERF_PANEL:
+            with st.sidebar:
+                show_perf_panel(jobs)
+
+        # -- Show the files content, polling the jobs while they run
         st.header("File Content")
-        if extractor.data:
-            show_extracted_content(extractor)
+        if all(job.finished() for job in jobs):
+            show_jobs(jobs)
+        else:
+            st.fragment(show_jobs, run_every=1)(jobs)
+
+        # -- Search the texts of the extracted PDF files
+        pdf_uploads = [
+            (uploaded_file, job)
+            for uploaded_file, job in zip(uploaded_files, jobs)
+            if uploaded_file.name.lower().endswith(".pdf")
+        ]
+        if pdf_uploads:
+            st.header("Search")
+            show_search(pdf_uploads, config)
+
+
+def submit_extractions(
+    uploaded_files: list, config: dict, report: dict | None = None
+) -> list[ExtractionJob]:
+    """
+    Submit the extraction of the uploaded files to the background jobs.
+
+    The jobs are kept on the session state by file and configuration, so reruns
+    of the page poll the running jobs instead of extracting the files again.
+    With the performance panel enabled, each extraction is profiled and its
+    profile is kept on the session state by job.
+
+    Parameters:
+        uploaded_files - list[UploadedFile]: Uploaded files
+        config - dict: Configuration for the extractor
+        report - dict | None: Company and period of the reports, for the store
+
+    Returns:
+        list[ExtractionJob]: Jobs of the extractions, in the order of the files
+    """
+    previous = st.session_state.get("extraction_jobs", {})
+    profiles = st.session_state.get("extraction_profiles", {})
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx else None
+
+    report = report or {}
+    jobs = {}
+    submitted = []
+    for uploaded_file in uploaded_files:
+        job_key = (
+            f"{uploaded_file.file_id}:{json.dumps([config, report], sort_keys=True)}"
+        )
+        job = job_manager.get(previous.get(job_key, ""))
+        if job is None:
+            profile = (
+                TaskProfile(settings.PERF_TOP_ALLOCATIONS)
+                if settings.PERF_PANEL
+                else None
+            )
+
+            def extract(progress, uploaded_file=uploaded_file, profile=profile):
+                task = functools.partial(
+                    process_uploaded_file,
+                    uploaded_file,
+                    config,
+                    session_id=session_id,
+                    progress=progress,
+                    **report,
+                )
+                return profile.run(task) if profile is not None else task()
+
+            job = job_manager.submit(uploaded_file.name, extract)
+            if profile is not None:
+                profiles[job.job_id] = profile
+        jobs[job_key] = job.job_id
+        submitted.append(job)
+
+    # -- Forget the jobs of the removed files and previous configurations
+    for job_key, job_id in previous.items():
+        if job_key not in jobs:
+            job_manager.forget(job_id)
+    st.session_state["extraction_jobs"] = jobs
+    st.session_state["extraction_profiles"] = {
+        job_id: profiles[job_id] for job_id in jobs.values() if job_id in profiles
+    }
+
+    return submitted
+
+
+def show_jobs(jobs: list[ExtractionJob]) -> None:
+    """
+    Show the status of the extraction jobs and the combined dataset.
+
+    Parameters:
+        jobs - list[ExtractionJob]: Jobs of the extractions
+    """
+    # -- Show the status of each file
+    st.dataframe(
+        [
+            {
+                "File": job.name,
+                "Status": job.status,
+                "Pages": f"{job.pages_done}/{job.total_pages}"
+                if job.total_pages
+                else "",
+                "Error": job.error or "",
+            }
+            for job in jobs
+        ],
+        hide_index=True,
+    )
+    if len(jobs) > 1:
+        done = sum(job.finished() for job in jobs)
+        st.progress(done / len(jobs), text=f"{done} of {len(jobs)} files extracted")
+
+    # -- Show the combined dataset once every file is extracted
+    finished = all(job.finished() for job in jobs)
+    results = {job.job_id: job.result for job in jobs if job.status == "done"}
+    if finished and len(results) > 1:
+        st.subheader("Combined Dataset")
+        st.session_state["combined_dataset"] = combine_tables(results)
+        st.dataframe(st.session_state["combined_dataset"], hide_index=True)
+
+    # -- Show each file
+    for job in jobs:
+        with st.expander(job.name, expanded=len(jobs) == 1):
+            show_job(job)
+
+    # -- Render the final results on a full rerun, once the jobs finish
+    if finished and st.session_state.get("extraction_polling"):
+        st.session_state["extraction_polling"] = False
+        st.rerun()
+    st.session_state["extraction_polling"] = not finished
+
+
+def show_job(job: ExtractionJob) -> None:
+    """
+    Show the progress of an extraction job, with its partial or final result.
+
+    Parameters:
+        job - ExtractionJob: Job of the extraction
+    """
+    if job.status == "done":
+        if job.result.has_data():
+            show_extracted_content(job.result, job.job_id)
         else:
             st.error("No data extracted from the file.")
+        return
+    if job.status == "failed":
+        st.error(f"Error extracting the file: {job.error}")
+        return
+    if job.status == "cancelled":
+        st.warning("Extraction cancelled.")
+        if st.button("Restart extraction", key=f"restart-{job.job_id}"):
+            job_manager.forget(job.job_id)
+            st.rerun()
+        return
+
+    # -- Show the progress and the pages extracted so far
+    if job.total_pages:
+        st.progress(
+            job.pages_done / job.total_pages,
+            text=f"Extracting page {job.pages_done} of {job.total_pages}",
+        )
+    else:
+        st.progress(0, text="Extracting file...")
+    if st.button("Cancel extraction", key=f"cancel-{job.job_id}"):
+        job.cancel()
+        st.rerun()
+    texts = dict(job.partial.get("texts", {}))
+    pages = _paginate(
+        list(texts),
+        f"{job.job_id}-partial",
+        PAGE_SIZE,
+        lambda page: str(page + 1),
+        "Pages",
+    )
+    for page in pages:
+        st.subheader(f"Page {page + 1}")
+        st.write(texts[page])
+
+
+def show_search(uploads: list[tuple], config: dict) -> None:
+    """
+    Search the texts of the extracted PDF files and show the page of a result.
+
+    Parameters:
+        uploads - list[tuple]: Uploaded PDF files with the jobs of their extractions
+        config - dict: Configuration for the extractor
+    """
+    query = st.text_input(
+        "Search the PDF texts", placeholder='e.g. "net debt" or EBIT* for a prefix'
+    )
+    if not query:
+        return
+
+    # -- Search the uploads by their cache keys, which identify them on the index
+    #    (files with the same name are told apart by their keys)
+    results = {
+        extraction_cache.key(f.getbuffer(), f.name, config): job.result
+        for f, job in uploads
+        if job.status == "done"
+    }
+    hits = text_index.search(query, list(results), limit=SEARCH_LIMIT)
+    hits = [hit for hit in hits if hit["document"] in results]
+    if not hits:
+        st.info("No results in the extracted files.")
+        return
+
+    # -- Go to the page of the selected result, with the match highlighted
+    st.caption(f"{len(hits)} result(s){'+' if len(hits) == SEARCH_LIMIT else ''}")
+    texts = {hit["document"]: results[hit["document"]].texts for hit in hits}
+    idx = st.selectbox(
+        "Results",
+        range(len(hits)),
+        format_func=lambda idx: _search_label(hits[idx], texts),
+    )
+    hit = hits[idx]
+    text = texts[hit["document"]].get(hit["page"]) or ""
+    start, end = hit["offset"], hit["offset"] + hit["length"]
+    st.subheader(f"{hit['name']} - Page {hit['page'] + 1}")
+    st.markdown(
+        _escape(text[:start])
+        + f":orange-background[{_escape(text[start:end])}]"
+        + _escape(text[end:])
+    )
+    table = results[hit["document"]].page(hit["page"])["table"]
+    if table:
+        st.dataframe(table)
 
 
-def show_extracted_content(extractor: DataExtractor) -> None:
+def _search_label(hit: dict, texts: dict) -> str:
     """
-    Show the extracted content from the file.
+    Build the label of a search result, with the text around the match.
+
+    Parameters:
+        hit - dict: Search result
+        texts - dict: Texts of the pages of each file, by cache key
+
+    Returns:
+        str: File, page and snippet of the result
+    """
+    text = texts[hit["document"]].get(hit["page"]) or ""
+    start, end = hit["offset"], hit["offset"] + hit["length"]
+    snippet = " ".join(text[max(start - 40, 0) : end + 40].split())
+    return f"{hit['name']} - page {hit['page'] + 1}: ...{snippet}..."
+
+
+def _escape(text: str) -> str:
+    """
+    Escape the markdown characters of an extracted text.
+
+    Parameters:
+        text - str: Extracted text
+
+    Returns:
+        str: Text shown as-is by st.markdown
+    """
+    return MARKDOWN_CHARS.sub(r"\\\1", text).replace("\n", "  \n")
+
+
+def show_perf_panel(jobs: list[ExtractionJob]) -> None:
+    """
+    Show the performance of the extractions of the current uploads.
+
+    - Wall time of each extraction stage and of each page.
+    - Peak RSS of the app and its growth during the extraction.
+    - Top allocations traced during the extraction.
+    - Cache tier that served the upload and hits and misses of the cache.
+
+    Parameters:
+        jobs - list[ExtractionJob]: Jobs of the extractions
+    """
+    st.header("⏱️ Performance")
+    profiles = st.session_state.get("extraction_profiles", {})
+    for job in jobs:
+        profile = profiles.get(job.job_id)
+        with st.expander(job.name):
+            if profile is None or not job.finished():
+                st.caption("Profile available once the extraction finishes.")
+                continue
+            tier = profile.cache_tier()
+            st.metric("Wall time", f"{profile.seconds:.2f} s")
+            st.metric(
+                "Peak RSS",
+                f"{profile.peak_rss / 1024**2:.0f} MB",
+                f"{profile.rss_growth / 1024**2:+.0f} MB",
+                delta_color="inverse",
+            )
+            st.caption(f"Cache: {tier.replace('_', ' ') if tier else 'not used'}")
+            st.subheader("Stages")
+            st.dataframe(profile.stages(), hide_index=True)
+            if profile.pages():
+                st.subheader("Pages")
+                st.dataframe(profile.pages(), hide_index=True)
+            st.subheader("Top allocations")
+            st.dataframe(profile.allocations, hide_index=True)
+
+    # -- Hits and misses of the shared cache
+    stats = extraction_cache.stats
+    st.caption(
+        f"Extraction cache: {stats['memory_hits']} memory hits, "
+        f"{stats['disk_hits']} disk hits, {stats['misses']} misses "
+        f"({extraction_cache.hit_rate():.0%} hit rate)"
+    )
+
+
+def show_extracted_content(extractor: DataExtractor, key: str = "content") -> None:
+    """
+    Show the extracted content from the file, a group of pages or tables at a time.
+
+    Only the visible group is sent to the browser, so large files are shown
+    without serializing all their pages on every rerun.
 
     Parameters:
         extractor - DataExtractor: Extractor object with the extracted data
+        key - str: Prefix of the keys of the widgets (unique for each file)
     """
-    # -- Show the file content
+    # -- Show the pages of PDF files
     if extractor.file_format == "pdf":
-        for page, text in extractor.data["texts"].items():
-            st.subheader(f"Page {page + 1}")
-            st.write(text)
-            if "tables" in extractor.data and extractor.data["tables"]:
-                st.write(extractor.data["tables"][page])
-    else:
+        show_pages(extractor, key)
+        return
+
+    # -- Show the tables of the sheets, of the records or of the file
+    tables = extracted_tables(extractor)
+    if not tables:
         st.dataframe(extractor.data)
+    elif len(tables) == 1:
+        show_table(next(iter(tables.values())), key)
+    else:
+        names = _paginate(list(tables), f"{key}-tables", PAGE_SIZE, str, "Tables")
+        for name in names:
+            st.subheader(name)
+            show_table(tables[name], f"{key}-{name}")
+
+
+def show_pages(extractor: DataExtractor, key: str) -> None:
+    """
+    Show the pages of a PDF file, with a filter by text and navigation by group.
+
+    Pages are collapsed and their tables are only loaded when shown.
+
+    Parameters:
+        extractor - DataExtractor: Extractor object with the extracted data
+        key - str: Prefix of the keys of the widgets
+    """
+    texts = extractor.texts
+    tables = {path[-1]: path for path in extractor.table_paths()}
+    pages = sorted(set(texts) | set(tables))
+    query = st.text_input(
+        "Filter pages", placeholder="Text in the page", key=f"{key}-filter"
+    )
+    if query:
+        pages = [
+            page for page in pages if query.lower() in (texts.get(page) or "").lower()
+        ]
+        if not pages:
+            st.info("No pages with this text.")
+            return
+
+    visible = _paginate(
+        pages, f"{key}-pages", PAGE_SIZE, lambda page: str(page + 1), "Pages"
+    )
+    for page in visible:
+        with st.expander(f"Page {page + 1}"):
+            if texts.get(page):
+                st.write(texts[page])
+            if page in tables and st.toggle("Show table", key=f"{key}-table-{page}"):
+                st.dataframe(extractor.frame(tables[page]))
+
+
+def show_table(df: pd.DataFrame, key: str) -> None:
+    """
+    Show a table, a group of rows at a time.
+
+    Parameters:
+        df - pd.DataFrame: Table
+        key - str: Prefix of the keys of the widgets
+    """
+    rows = _paginate(
+        range(len(df)), f"{key}-rows", TABLE_ROWS, lambda row: str(row + 1), "Rows"
+    )
+    st.dataframe(df.iloc[rows.start : rows.stop])
+
+
+def _paginate(
+    items: Sequence, key: str, size: int, name: Callable, label: str
+) -> Sequence:
+    """
+    Show the navigation between the groups of items and get the selected one.
+
+    Parameters:
+        items - Sequence: Items to show (e.g. pages, tables or rows)
+        key - str: Key of the navigation widget
+        size - int: Maximum number of items of a group
+        name - Callable: Name of an item in the labels of the groups
+        label - str: Label of the navigation widget
+
+    Returns:
+        Sequence: Items of the selected group
+    """
+    if len(items) <= size:
+        return items
+    groups = range(0, len(items), size)
+    start = st.selectbox(
+        f"{label} ({len(items)})",
+        groups,
+        format_func=lambda start: (
+            f"{name(items[start])} - {name(items[min(start + size, len(items)) - 1])}"
+        ),
+        # -- A new key when the items change (e.g. filtered), so the first
+        #    group is selected instead of one that may no longer exist
+        key=f"{key}-{len(items)}",
+    )
+    return items[start : start + size]
 
 
 page_setup()
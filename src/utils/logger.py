@@ -1,42 +1,218 @@
+import os
+import sys
+import time
+import queue
+import atexit
 import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from src.config import settings
+
+# -- Name of the logger of the app (the loggers of the modules are its children)
+LOGGER_NAME = "finance-analyzer"
+
+# -- Writer thread of the asynchronous logging
+_listener: QueueListener | None = None
+
+# -- Entries of settings.LOG_LEVELS already warned as invalid
+_invalid_levels: set[str] = set()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Filter limiting the records logged by each line of code, like the per-page
+    messages of the extractors.
+
+    Warnings and errors are never dropped. The number of dropped records of a
+    line is set on the `dropped` attribute of its next logged record, shown
+    after the message by the formatter of the handlers. The filter is shared by
+    the handlers and decides once for each record.
+
+    Attributes:
+        max_records - int: Records of a line logged per interval (0 for no limit)
+        interval - float: Seconds of each interval
+    """
+
+    def __init__(self, max_records: int, interval: float = 1.0) -> None:
+        """
+        Initialize the RateLimitFilter class.
+
+        Parameters:
+            max_records - int: Records of a line logged per interval (0 for no limit)
+            interval - float: Seconds of each interval
+        """
+        super().__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self._windows: dict[tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Check if a record is within the limit of its line.
+
+        Parameters:
+            record - logging.LogRecord: Record to log
+
+        Returns:
+            bool: True if the record must be logged
+        """
+        if not self.max_records or record.levelno >= logging.WARNING:
+            return True
+
+        # -- Records already seen by another handler keep their decision
+        logged = getattr(record, "rate_limited", None)
+        if logged is not None:
+            return logged
+
+        # -- Count the record on the window of its line
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.setdefault(key, [now, 0, 0])
+            if now - window[0] >= self.interval:
+                dropped = window[2]
+                window[:] = [now, 0, 0]
+                if dropped:
+                    record.dropped = f" ({dropped} similar messages dropped)"
+            window[1] += 1
+            record.rate_limited = window[1] <= self.max_records
+            if not record.rate_limited:
+                window[2] += 1
+        return record.rate_limited
 
 
 def get_logger(
-    file_name: str = "app.log", level: int = logging.DEBUG
+    file_name: str = settings.LOG_FILE, level: int | str = settings.LOG_LEVEL
 ) -> logging.Logger:
     """
-    Get a logger with the specified name and level.
+    Get the logger of the module calling it.
+
+    The handlers are attached once to the logger of the app and the loggers of
+    the modules are its children, with the levels of settings.LOG_LEVELS. In the
+    asynchronous mode, the records are put on a queue and written to the console
+    and to the rotating log file by a background thread.
 
     Parameters:
         file_name - str: Name of the log file
-        level - int: Logging level
+        level - int | str: Logging level of the app
 
     Returns:
         logging.Logger: Logger object
     """
     # -- Create a logger
-    logger = logging.getLogger("finance-analyzer")
+    logger = logging.getLogger(LOGGER_NAME)
     logger.setLevel(level)
 
     # -- Check if handlers are already added
     if not logger.handlers:
         # -- Create a formatter
         formatter = logging.Formatter(
-            "{asctime} - {levelname}: {message}", style="{", datefmt="%d-%m-%Y %H:%M:%S"
+            "{asctime} - {levelname}: {message}{dropped}",
+            style="{",
+            datefmt="%d-%m-%Y %H:%M:%S",
+            defaults={"dropped": ""},
         )
 
         # -- Create a console handler
         ch = logging.StreamHandler()
-        ch.setLevel(level)
         ch.setFormatter(formatter)
 
-        # -- Create a file handler
-        fh = logging.FileHandler(file_name)
-        fh.setLevel(level)
+        # -- Create a file handler (the file is only opened on the first record)
+        fh = RotatingFileHandler(
+            file_name,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            delay=True,
+        )
         fh.setFormatter(formatter)
 
-        # -- Add the handlers to the logger
-        logger.addHandler(ch)
-        logger.addHandler(fh)
+        # -- Add the handlers to the logger, through the queue when asynchronous
+        handlers: list[logging.Handler] = [ch, fh]
+        if settings.LOG_ASYNC:
+            handlers = [_start_listener(handlers)]
+        rate_limit = RateLimitFilter(settings.LOG_RATE_LIMIT)
+        for handler in handlers:
+            handler.addFilter(rate_limit)
+            logger.addHandler(handler)
+
+    # -- Get the logger of the calling module with its level
+    module = sys._getframe(1).f_globals.get("__name__", "")
+    if module in ["", "__main__"]:
+        return logger
+    child = logger.getChild(module)
+    child.setLevel(_module_level(module))
+    return child
+
+
+def stop_logging() -> None:
+    """
+    Write the queued records and stop the writer thread of the asynchronous logging.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener() -> None:
+    """
+    Restart the writer thread on forked processes, which do not inherit threads.
+    """
+    global _listener
+    if _listener is not None:
+        _listener = QueueListener(
+            _listener.queue, *_listener.handlers, respect_handler_level=True
+        )
+        _listener.start()
+
+
+def _start_listener(handlers: list[logging.Handler]) -> QueueHandler:
+    """
+    Start the writer thread of the asynchronous logging.
+
+    Parameters:
+        handlers - list[logging.Handler]: Handlers writing the records
+
+    Returns:
+        QueueHandler: Handler putting the records on the queue of the writer
+    """
+    global _listener
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    os.register_at_fork(after_in_child=_restart_listener)
+    return QueueHandler(records)
+
+
+def _module_level(module: str) -> int:
+    """
+    Get the level of a module from the most specific entry of settings.LOG_LEVELS.
+
+    Parameters:
+        module - str: Name of the module (e.g. "src.extract.pdf_reader")
+
+    Returns:
+        int: Level of the module (NOTSET to use the level of the app, also when
+            the level of its entry is not valid)
+    """
+    matches = [
+        prefix
+        for prefix in settings.LOG_LEVELS
+        if module == prefix or module.startswith(f"{prefix}.")
+    ]
+    if not matches:
+        return logging.NOTSET
 
-    return logger
+    # -- Unknown names are returned as "Level <name>" instead of a number
+    prefix = max(matches, key=len)
+    level = logging.getLevelName(settings.LOG_LEVELS[prefix])
+    if not isinstance(level, int):
+        if prefix not in _invalid_levels:
+            _invalid_levels.add(prefix)
+            logging.getLogger(LOGGER_NAME).warning(
+                f"Invalid log level for {prefix}: {settings.LOG_LEVELS[prefix]}"
+            )
+        return logging.NOTSET
+    return level
@@ -0,0 +1,213 @@
+"""
+Profiling of single tasks, like the extraction of an upload, for the
+performance panel of the app.
+
+The profile records the spans of the task (see src.utils.tracing), its wall
+time, the peak RSS of the process and the top allocations traced by
+tracemalloc while the task runs. tracemalloc slows down the allocations, so it
+is only started while profiled tasks run. It traces the whole process, so the
+allocations of concurrent tasks are mixed.
+"""
+
+import sys
+import time
+import threading
+import tracemalloc
+from typing import Callable, TypeVar
+from src.utils.tracing import Span, tracer
+
+try:
+    import resource
+except ImportError:  # -- Not available on Windows
+    resource = None
+
+# -- Result of a profiled task
+T = TypeVar("T")
+
+# -- Number of profiled tasks using tracemalloc, and flag of a tracemalloc
+#    started by them (and not by the user, e.g. with PYTHONTRACEMALLOC)
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+_tracemalloc_lock = threading.Lock()
+
+
+class TaskProfile:
+    """
+    Class recording the performance of a task.
+
+    Attributes:
+        top_allocations - int: Number of allocations kept
+        seconds - float: Wall time of the task
+        spans - list[Span]: Spans of the stages of the task
+        peak_rss - int: Peak RSS of the process in bytes after the task
+        rss_growth - int: Growth of the peak RSS during the task in bytes
+        allocations - list[dict]: Top allocations by line (file, line and bytes)
+
+    Methods:
+        run: Run the task, recording its performance
+        stages: Get the wall time of each stage
+        pages: Get the wall time of each page
+        cache_tier: Get the cache tier that served the task
+    """
+
+    def __init__(self, top_allocations: int = 10) -> None:
+        """
+        Initialize the TaskProfile class.
+
+        Parameters:
+            top_allocations - int: Number of allocations kept
+        """
+        self.top_allocations = top_allocations
+        self.seconds = 0.0
+        self.spans: list[Span] = []
+        self.peak_rss = 0
+        self.rss_growth = 0
+        self.allocations: list[dict] = []
+
+    def run(self, task: Callable[[], T]) -> T:
+        """
+        Run the task, recording its performance.
+
+        Parameters:
+            task - Callable[[], T]: Task to run
+
+        Returns:
+            T: Result of the task
+        """
+        _start_tracemalloc()
+        rss_before = peak_rss()
+        start = time.perf_counter()
+        try:
+            with tracer.collect() as spans:
+                return task()
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.spans = spans
+            self.peak_rss = peak_rss()
+            self.rss_growth = self.peak_rss - rss_before
+            self.allocations = _top_allocations(self.top_allocations)
+            _stop_tracemalloc()
+
+    def stages(self) -> list[dict]:
+        """
+        Get the wall time of each stage, slowest first.
+
+        Returns:
+            list[dict]: Stage, runs, seconds, pages and bytes of each stage
+        """
+        stages: dict[str, dict] = {}
+        for span in self.spans:
+            stage = stages.setdefault(
+                span.name,
+                {"stage": span.name, "runs": 0, "seconds": 0.0, "pages": 0, "bytes": 0},
+            )
+            stage["runs"] += 1
+            stage["seconds"] += span.duration
+            stage["pages"] += span.attributes.get("pages", 0)
+            stage["bytes"] += span.attributes.get("bytes", 0)
+        return sorted(stages.values(), key=lambda stage: stage["seconds"], reverse=True)
+
+    def pages(self) -> list[dict]:
+        """
+        Get the wall time of each page, from the stages of the pages.
+
+        Returns:
+            list[dict]: Page number and seconds of each page, in page order
+        """
+        pages: dict[int, float] = {}
+        for span in self.spans:
+            page = span.attributes.get("page")
+            if page is not None:
+                pages[page] = pages.get(page, 0.0) + span.duration
+        return [
+            {"page": page + 1, "seconds": seconds}
+            for page, seconds in sorted(pages.items())
+        ]
+
+    def cache_tier(self) -> str | None:
+        """
+        Get the cache tier that served the task.
+
+        Returns:
+            str | None: "memory_hits", "disk_hits" or "misses" (None if the
+                task did not use the extraction cache)
+        """
+        for span in self.spans:
+            if "tier" in span.attributes:
+                return span.attributes["tier"]
+        return None
+
+
+def peak_rss() -> int:
+    """
+    Get the peak resident set size of the process.
+
+    On Linux, the high-water mark of the address space is used, since the
+    peak RSS of getrusage is kept across exec and includes the memory of the
+    parent of subprocesses.
+
+    Returns:
+        int: Peak RSS in bytes (0 where it is not available)
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # -- Linux reports kilobytes and macOS bytes
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def _start_tracemalloc() -> None:
+    """
+    Start tracemalloc for a profiled task, if it is not tracing yet.
+    """
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc() -> None:
+    """
+    Stop tracemalloc once no profiled task is running.
+    """
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+def _top_allocations(limit: int) -> list[dict]:
+    """
+    Get the lines of code holding the most traced memory.
+
+    Parameters:
+        limit - int: Number of lines
+
+    Returns:
+        list[dict]: File, line, size in bytes and count of the allocations
+    """
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+    return [
+        {
+            "file": stat.traceback[0].filename,
+            "line": stat.traceback[0].lineno,
+            "bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
@@ -0,0 +1,195 @@
+"""
+Instrumentation of the startup time of the app.
+
+Usage:
+    FINANCE_ANALYZER_PROFILE_STARTUP=1 streamlit run app.py
+    python -m src.utils.startup src.extract.extractor src.analysis.financial_metrics
+
+With the environment variable, the app logs the duration of each startup step.
+The command imports each module on a new interpreter with "-X importtime" and
+prints its import time with the slowest modules it imports.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+from contextlib import contextmanager
+from typing import Iterator
+from src.config import settings
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Line of the "-X importtime" report: self and cumulative microseconds, module
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+class StartupTimer:
+    """
+    Class recording the duration of the startup steps.
+
+    Attributes:
+        enabled - bool: Flag to record the steps (steps are free when disabled)
+        steps - list[tuple[str, float]]: Name and seconds of each step
+
+    Methods:
+        step: Context manager timing a step
+        report: Format the durations of the steps
+        log: Log the report once and stop recording
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        """
+        Initialize the StartupTimer class.
+
+        Parameters:
+            enabled - bool: Flag to record the steps
+        """
+        self.enabled = enabled
+        self.steps: list[tuple[str, float]] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Time a startup step.
+
+        Parameters:
+            name - str: Name of the step
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - start))
+
+    def report(self) -> str:
+        """
+        Format the durations of the steps.
+
+        Returns:
+            str: Line with the duration of each step and the total
+        """
+        total = sum(seconds for _, seconds in self.steps)
+        steps = ", ".join(
+            f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.steps
+        )
+        return f"Startup took {total * 1000:.0f} ms ({steps})"
+
+    def log(self) -> None:
+        """
+        Log the report of the recorded steps and stop recording.
+
+        Streamlit runs the app script again on every interaction, so only the
+        first run of the process is the startup.
+        """
+        if self.enabled and self.steps:
+            logger.info(self.report())
+            self.steps = []
+            self.enabled = False
+
+
+def profile_imports(module: str) -> list[dict]:
+    """
+    Profile the import of a module on a new interpreter with "-X importtime".
+
+    Parameters:
+        module - str: Name of the module (e.g. "src.extract.extractor")
+
+    Returns:
+        list[dict]: Module, depth, self and cumulative seconds of each import,
+            in the order they finished (the module itself is the last one)
+
+    Raises:
+        RuntimeError: If the module cannot be imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if result.returncode != 0:
+        logger.error(f"Error importing {module}: {result.stderr}")
+        raise RuntimeError(f"Error importing {module}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            imports.append(
+                {
+                    "module": match.group(4),
+                    "depth": len(match.group(3)) // 2,
+                    "self": int(match.group(1)) / 1e6,
+                    "cumulative": int(match.group(2)) / 1e6,
+                }
+            )
+    return imports
+
+
+def imported_modules(module: str) -> set[str]:
+    """
+    Get the modules loaded by the import of a module on a new interpreter.
+
+    Parameters:
+        module - str: Name of the module
+
+    Returns:
+        set[str]: Names of the loaded modules (with the ones of the interpreter)
+
+    Raises:
+        RuntimeError: If the module cannot be imported
+    """
+    code = f"import sys; import {module}; print('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if result.returncode != 0:
+        logger.error(f"Error importing {module}: {result.stderr}")
+        raise RuntimeError(f"Error importing {module}")
+    return set(result.stdout.split())
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Print the import time of modules with their slowest imports.
+
+    Parameters:
+        argv - list[str] | None: Arguments (defaults to the ones of the process)
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description="Profile the import of modules.")
+    parser.add_argument("modules", nargs="+", help="Modules to import")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports shown")
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        imports = profile_imports(module)
+        print(f"{module}: {imports[-1]['cumulative'] * 1000:.0f} ms")
+        slowest = sorted(imports, key=lambda item: item["self"], reverse=True)
+        for item in slowest[: args.top]:
+            print(
+                f"  {item['module']:<50} self {item['self'] * 1000:7.1f} ms"
+                f"  cumulative {item['cumulative'] * 1000:7.1f} ms"
+            )
+    return 0
+
+
+# -- Timer of the app startup, enabled by the environment variable
+startup_timer = StartupTimer(settings.PROFILE_STARTUP)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
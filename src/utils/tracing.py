@@ -0,0 +1,345 @@
+"""
+Lightweight tracing of the stages of the extraction and analysis pipeline.
+
+Usage:
+    FINANCE_ANALYZER_TRACE=1 python -m src.cli.batch_extract data/reports -o out
+
+    with tracer.span("pdf.text", page=3) as span:
+        text = page.extract_text()
+        span.set(bytes=len(text))
+
+    @tracer.traced("metrics.gross_margin")
+    def calculate_gross_margin(...): ...
+
+Spans record their duration with the pages and bytes they handled. When the
+tracer is disabled, spans are a shared no-op object, so the instrumented code
+only pays for a method call. The spans are exported at exit to a JSON trace in
+the Trace Event Format (opened by chrome://tracing or Perfetto) and the totals
+of each stage to a Prometheus text file.
+
+The spans of a single task (e.g. the extraction of an upload) can also be
+collected with tracer.collect, even when the tracer is disabled.
+
+Spans of worker processes (batch extraction, Excel sheets) are not collected.
+"""
+
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+from src.config import settings
+from src.utils.logger import get_logger
+
+# -- Get the logger
+logger = get_logger()
+
+# -- Prefix of the Prometheus metrics
+METRIC_PREFIX = "finance_analyzer_span"
+
+# -- Attributes of the spans summed on the stage totals
+COUNTED_ATTRIBUTES = ["pages", "bytes"]
+
+# -- Spans collected for the task running on the current context
+_collected: contextvars.ContextVar[list | None] = contextvars.ContextVar(
+    "collected_spans", default=None
+)
+
+
+class Span:
+    """
+    Class timing a stage of the pipeline, used as a context manager.
+
+    Attributes:
+        name - str: Name of the stage (e.g. "pdf.ocr")
+        attributes - dict: Attributes of the span (e.g. pages and bytes)
+        start - float: Start time in seconds since the epoch
+        duration - float: Duration in seconds
+        thread - int: Identifier of the thread running the stage
+        recording - bool: Flag of the spans that are recorded (False for no-ops)
+
+    Methods:
+        set: Set attributes of the span
+    """
+
+    __slots__ = ("name", "attributes", "start", "duration", "thread", "_tracer", "_t0")
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict) -> None:
+        """
+        Initialize the Span class.
+
+        Parameters:
+            tracer - Tracer: Tracer recording the span
+            name - str: Name of the stage
+            attributes - dict: Attributes of the span
+        """
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = threading.get_ident()
+        self._tracer = tracer
+        self._t0 = 0.0
+
+    def set(self, **attributes) -> None:
+        """
+        Set attributes of the span, like the pages or bytes handled.
+
+        Parameters:
+            attributes - dict: Attributes to set
+        """
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self._t0
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self._tracer.record(self)
+
+
+class _NoopSpan:
+    """
+    Span of the disabled tracer, shared by every stage.
+    """
+
+    __slots__ = ()
+    recording = False
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Class recording the spans of the stages and their totals.
+
+    Attributes:
+        enabled - bool: Flag to record the spans (spans are free when disabled)
+        max_spans - int: Number of spans kept for the trace (the totals count all)
+
+    Methods:
+        span: Create a span for a stage
+        traced: Decorator running a function in a span
+        collect: Context manager collecting the spans of a task
+        record: Record a finished span
+        spans: Get the recorded spans
+        stats: Get the totals of each stage
+        export_json: Write the spans as a JSON trace
+        export_prometheus: Write the totals in the Prometheus text format
+        export: Write the trace and the totals to the configured files
+        reset: Clear the spans and the totals
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 100_000) -> None:
+        """
+        Initialize the Tracer class.
+
+        Parameters:
+            enabled - bool: Flag to record the spans
+            max_spans - int: Number of spans kept for the trace
+        """
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes) -> Span | _NoopSpan:
+        """
+        Create a span for a stage, to use as a context manager.
+
+        Parameters:
+            name - str: Name of the stage
+            attributes - dict: Attributes of the span (e.g. page, pages, bytes)
+
+        Returns:
+            Span | _NoopSpan: Span of the stage (a no-op span when disabled)
+        """
+        if not self.enabled and _collected.get() is None:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def traced(self, name: str | None = None) -> Callable:
+        """
+        Decorator running each call of a function in a span.
+
+        Parameters:
+            name - str | None: Name of the stage (defaults to the function name)
+
+        Returns:
+            Callable: Decorator of the function
+        """
+
+        def decorator(func: Callable) -> Callable:
+            stage = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled and _collected.get() is None:
+                    return func(*args, **kwargs)
+                with Span(self, stage, {}):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @contextmanager
+    def collect(self) -> Iterator[list[Span]]:
+        """
+        Collect the spans of the task running on the current thread, even when
+        the tracer is disabled.
+
+        Yields:
+            list[Span]: Spans finished while the context is active
+        """
+        spans: list[Span] = []
+        token = _collected.set(spans)
+        try:
+            yield spans
+        finally:
+            _collected.reset(token)
+
+    def record(self, span: Span) -> None:
+        """
+        Record a finished span and add it to the totals of its stage.
+
+        Parameters:
+            span - Span: Finished span
+        """
+        collected = _collected.get()
+        if collected is not None:
+            collected.append(span)
+        if not self.enabled:
+            return
+        with self._lock:
+            self._spans.append(span)
+            stats = self._stats.setdefault(
+                span.name,
+                {"count": 0, "seconds": 0.0, "errors": 0, "pages": 0, "bytes": 0},
+            )
+            stats["count"] += 1
+            stats["seconds"] += span.duration
+            stats["errors"] += "error" in span.attributes
+            for attribute in COUNTED_ATTRIBUTES:
+                value = span.attributes.get(attribute)
+                if isinstance(value, (int, float)):
+                    stats[attribute] += value
+
+    def spans(self) -> list[Span]:
+        """
+        Get the recorded spans, oldest first.
+
+        Returns:
+            list[Span]: Finished spans
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Get the totals of each stage.
+
+        Returns:
+            dict[str, dict]: Count, seconds, errors, pages and bytes by stage
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def export_json(self, file_path: Path) -> None:
+        """
+        Write the spans as a JSON trace in the Trace Event Format.
+
+        Parameters:
+            file_path - Path: Path of the trace file
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread,
+                "args": span.attributes,
+            }
+            for span in self.spans()
+        ]
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events}, f, default=str)
+
+    def export_prometheus(self, file_path: Path) -> None:
+        """
+        Write the totals of each stage in the Prometheus text format.
+
+        Parameters:
+            file_path - Path: Path of the metrics file
+        """
+        metrics = {
+            "count": ("counter", "Number of runs of the stage"),
+            "seconds": ("counter", "Seconds spent on the stage"),
+            "errors": ("counter", "Runs of the stage that raised an error"),
+            "pages": ("counter", "Pages handled by the stage"),
+            "bytes": ("counter", "Bytes handled by the stage"),
+        }
+        stats = self.stats()
+        lines = []
+        for key, (kind, description) in metrics.items():
+            metric = f"{METRIC_PREFIX}_{key}_total"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, values in sorted(stats.items()):
+                lines.append(f'{metric}{{stage="{name}"}} {values[key]}')
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def export(self) -> None:
+        """
+        Write the trace and the totals to the files of the settings.
+        """
+        if not self.enabled or not self._stats:
+            return
+        if settings.TRACE_FILE:
+            self.export_json(Path(settings.TRACE_FILE))
+        if settings.TRACE_METRICS_FILE:
+            self.export_prometheus(Path(settings.TRACE_METRICS_FILE))
+        logger.info(
+            f"Trace of {sum(s['count'] for s in self._stats.values())} spans "
+            f"written to {settings.TRACE_FILE} and {settings.TRACE_METRICS_FILE}"
+        )
+
+    def reset(self) -> None:
+        """
+        Clear the spans and the totals.
+        """
+        with self._lock:
+            self._spans.clear()
+            self._stats.clear()
+
+
+# -- Tracer of the app, enabled by the environment variable
+tracer = Tracer(settings.TRACE, settings.TRACE_MAX_SPANS)
+atexit.register(tracer.export)
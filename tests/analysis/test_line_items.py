@@ -0,0 +1,171 @@
+import pytest
+import pandas as pd
+from src.analysis.financial_metrics import (
+    calculate_gross_margin,
+    calculate_net_income_growth,
+    calculate_roe,
+)
+from src.analysis.line_items import (
+    LineItemLocator,
+    match_label,
+    normalize_label,
+    to_numbers,
+)
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def tables() -> dict[str, pd.DataFrame]:
+    """
+    Create the tables of a sample filing, as extracted from a PDF.
+
+    Returns:
+        dict[str, pd.DataFrame]: Income statement with a line item per row
+            (in Portuguese, with a notes column) and balance sheet with a line
+            item per column
+    """
+    income = pd.DataFrame(
+        {
+            None: [
+                "Receita Líquida",
+                "Custo dos Produtos Vendidos",
+                "Lucro Bruto",
+                "Lucro Líquido do Exercício",
+            ],
+            "Nota": ["4", "5", None, None],
+            "2023": ["1,200", "(400)", "800", "100"],
+            "2024": ["1,500", "(500)", "1,000", "150"],
+        }
+    )
+    balance = pd.DataFrame(
+        {"Year": [2023, 2024], "Shareholders' Equity": ["1,000", "1,100"]}
+    )
+    return {"Page 1": pd.DataFrame(), "Page 2": income, "Page 3": balance}
+
+
+# -- Tests --
+def test_normalize_label() -> None:
+    """
+    Tests that accents, case, notes, filler words and plurals are removed from
+    the labels, so synonyms and translations match the same line item.
+    """
+    assert normalize_label("Receita Líquida (Nota 4)") == "receita liquida"
+    assert normalize_label("Total Net Revenues") == "net revenue"
+    assert match_label("Net revenue") == "revenue"
+    assert match_label("RECEITA LÍQUIDA") == "revenue"
+    assert match_label("Ventas netas") == "revenue"
+    assert match_label("Cost of Sales") == "cogs"
+    assert match_label("Gross profit") is None
+    assert match_label(None) is None
+
+
+def test_normalize_label_is_cached() -> None:
+    """
+    Tests that the normalized labels are cached.
+    """
+    normalize_label.cache_clear()
+
+    normalize_label("Net Income")
+    normalize_label("Net Income")
+
+    assert normalize_label.cache_info().hits == 1
+
+
+def test_locations(tables) -> None:
+    """
+    Tests that the rows and columns of the line items are located, with their
+    values parsed by period and costs as positive numbers.
+    """
+    locator = LineItemLocator(tables)
+
+    assert locator.concepts() == ["revenue", "cogs", "net_income", "equity"]
+    [cogs] = locator.locations("cogs")
+    assert cogs["table"] == "Page 2"
+    assert cogs["row"] == 1
+    assert cogs["column"] is None
+    assert cogs["label"] == "Custo dos Produtos Vendidos"
+    assert cogs["values"].to_dict() == {"2023": 400.0, "2024": 500.0}
+    [equity] = locator.locations("equity")
+    assert (equity["table"], equity["row"]) == ("Page 3", None)
+    assert equity["column"] == "Shareholders' Equity"
+    assert locator.locations("debt") == []
+
+
+def test_inputs_for_metrics(tables) -> None:
+    """
+    Tests that the data frame and column names of the line items are passed
+    to the metric functions, with the line items of several tables aligned by
+    period.
+    """
+    locator = LineItemLocator(tables)
+
+    df, columns = locator.inputs_for(calculate_gross_margin)
+    assert columns == {"revenue_col": "revenue", "cogs_col": "cogs"}
+    assert df["period"].tolist() == ["2023", "2024"]
+    assert calculate_gross_margin(df, **columns) == pytest.approx(100 * 1800 / 2700)
+
+    df, columns = locator.inputs_for(calculate_net_income_growth)
+    assert columns == {"net_income_col": "net_income", "date_col": "period"}
+    assert calculate_net_income_growth(df, **columns) == pytest.approx(50.0)
+
+    df, columns = locator.inputs_for(calculate_roe)
+    assert df[["net_income", "equity"]].to_numpy().tolist() == [
+        [100.0, 1000.0],
+        [150.0, 1100.0],
+    ]
+
+
+def test_inputs_prefers_table_with_most_line_items() -> None:
+    """
+    Tests that the line items are taken from the table that has most of them.
+    """
+    summary = pd.DataFrame({"Item": ["Revenue"], "2024": [99]})
+    income = pd.DataFrame({"Item": ["Sales", "COGS"], "2024": [10, 4]})
+    locator = LineItemLocator({"summary": summary, "income": income})
+
+    df, _ = locator.inputs("revenue", "cogs")
+
+    assert df.to_dict("records") == [{"period": "2024", "revenue": 10.0, "cogs": 4.0}]
+
+
+@pytest.mark.parametrize(
+    "revenue, cogs",
+    [
+        (["R$ 1.234.567", "R$ 1.500.000"], ["(800.000)", "(900.000)"]),
+        (["1.234.567,00", "1.500.000,00"], ["-800.000,00", "-900.000,00"]),
+        (["EUR 1.234.567", "EUR 1.500.000"], ["800.000", "900.000"]),
+    ],
+)
+def test_inputs_with_european_numbers(revenue, cogs) -> None:
+    """
+    Tests that numbers with dots as thousands separators and commas as decimal
+    separators (e.g. Portuguese, Spanish and German filings) are parsed.
+    """
+    income = pd.DataFrame(
+        {
+            "Conta": ["Receita Líquida", "Custo dos Produtos Vendidos"],
+            "2023": [revenue[0], cogs[0]],
+            "2024": [revenue[1], cogs[1]],
+        }
+    )
+    locator = LineItemLocator({"income": income})
+
+    df, _ = locator.inputs("revenue", "cogs")
+
+    assert df[["revenue", "cogs"]].to_numpy().tolist() == [
+        [1234567.0, 800000.0],
+        [1500000.0, 900000.0],
+    ]
+    assert to_numbers(pd.Series(["1.234,56", "12,5"])).tolist() == [1234.56, 12.5]
+
+
+def test_inputs_with_missing_line_items(tables) -> None:
+    """
+    Tests that missing line items raise KeyError and unknown ones ValueError.
+    """
+    locator = LineItemLocator(tables)
+
+    with pytest.raises(KeyError, match="assets"):
+        locator.inputs("net_income", "assets")
+    with pytest.raises(ValueError, match="ebitda"):
+        locator.inputs("ebitda")
@@ -0,0 +1,41 @@
+import pytest
+from pathlib import Path
+from src.api.blob_store import BlobStore
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def blob_store(tmp_path: Path) -> BlobStore:
+    """
+    Create a blob store on a temporary directory for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        BlobStore: Empty blob store
+    """
+    return BlobStore(tmp_path / "blobs")
+
+
+# -- Tests --
+def test_put_deduplicates(blob_store) -> None:
+    """
+    Tests that identical contents are stored only once.
+
+    Parameters:
+        blob_store - BlobStore: Empty blob store
+    """
+    # -- Store the same content from two uploads and another content
+    first = blob_store.put(b"public filing", ".pdf")
+    second = blob_store.put(memoryview(b"public filing"), ".pdf")
+    other = blob_store.put(b"private report", ".pdf")
+
+    # -- Check the stored blobs
+    assert first == second != other
+    assert first.read_bytes() == b"public filing"
+    assert len(list(blob_store.root.rglob("*.pdf"))) == 2
+
+    # -- Check the metrics
+    assert blob_store.stats["bytes_saved"] == len(b"public filing")
+    assert blob_store.hit_rate() == pytest.approx(1 / 3)
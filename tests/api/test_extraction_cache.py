@@ -0,0 +1,177 @@
+import pickle
+import time
+import pytest
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from src.api.extraction_cache import ExtractionCache
+from src.extract.extractor import DataExtractor
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def extractor(tmp_path: Path) -> DataExtractor:
+    """
+    Create an extractor of a sample CSV file for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        DataExtractor: Extractor with the data of the sample file
+    """
+    # -- Write the sample file
+    file = tmp_path / "sample.csv"
+    file.write_text("col1,col2\n1,2\n3,4")
+
+    return DataExtractor(file, {})
+
+
+# -- Tests --
+def test_cache_key() -> None:
+    """
+    Tests that the cache key depends on the content, format and configuration.
+    """
+    # -- Build the keys
+    key = ExtractionCache.key(b"data", "a.csv", {"scan": False})
+
+    # -- Check the keys
+    assert key == ExtractionCache.key(b"data", "b.csv", {"scan": False})
+    assert key != ExtractionCache.key(b"other", "a.csv", {"scan": False})
+    assert key != ExtractionCache.key(b"data", "a.json", {"scan": False})
+    assert key != ExtractionCache.key(b"data", "a.csv", {"scan": True})
+
+
+def test_cache_lru_eviction(extractor) -> None:
+    """
+    Tests that the least recently used result is evicted from memory.
+
+    Parameters:
+        extractor - DataExtractor: Extractor with sample data
+    """
+    # -- Fill the cache
+    cache = ExtractionCache(max_entries=2)
+    cache.put("a", extractor)
+    cache.put("b", extractor)
+    cache.get("a")
+    cache.put("c", extractor)
+
+    # -- Check the evicted result
+    assert cache.get("b") is None
+    assert cache.get("a") is extractor
+    assert cache.get("c") is extractor
+
+
+def test_cache_disk_tier(extractor, tmp_path) -> None:
+    """
+    Tests that results are kept on disk between cache instances.
+
+    Parameters:
+        extractor - DataExtractor: Extractor with sample data
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Store a result on a cache with the disk tier
+    ExtractionCache(cache_dir=tmp_path / "cache").put("a", extractor)
+
+    # -- Get the result from a new cache
+    cache = ExtractionCache(cache_dir=tmp_path / "cache")
+    cached = cache.get("a")
+
+    # -- Check the cached result
+    assert cached.data == extractor.data
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_cache_extracts_once(extractor) -> None:
+    """
+    Tests that concurrent lookups of the same key share one extraction.
+
+    Parameters:
+        extractor - DataExtractor: Extractor with sample data
+    """
+    # -- Extract the same key from many threads
+    cache = ExtractionCache()
+    calls = []
+
+    def extract() -> DataExtractor:
+        calls.append(1)
+        time.sleep(0.05)
+        return extractor
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(cache.get_or_extract, "a", extract) for _ in range(4)
+        ]
+        results = [future.result() for future in futures]
+
+    # -- Check that the data was extracted once
+    assert len(calls) == 1
+    assert all(result is extractor for result in results)
+    assert cache.hit_rate() == 0.75
+
+
+def test_cache_disk_tier_maps_tables(extractor, tmp_path) -> None:
+    """
+    Tests that the tables on disk are written as Arrow files and memory-mapped
+    when loaded, unless Arrow is disabled.
+
+    Parameters:
+        extractor - DataExtractor: Extractor with sample data
+        tmp_path - Path: Temporary directory path
+    """
+    ExtractionCache(cache_dir=tmp_path / "arrow").put("a", extractor)
+    ExtractionCache(cache_dir=tmp_path / "pickle", arrow=False).put("a", extractor)
+
+    # -- Get the results from new caches
+    mapped = ExtractionCache(cache_dir=tmp_path / "arrow").get("a")
+    pickled = ExtractionCache(cache_dir=tmp_path / "pickle").get("a")
+
+    # -- Check the files and the cached results
+    assert sorted(f.name for f in (tmp_path / "arrow" / "a").iterdir()) == [
+        "0.arrow",
+        "extractor.pkl",
+    ]
+    assert not list((tmp_path / "pickle" / "a").glob("*.arrow"))
+    assert isinstance(mapped.frames()[()]["col1"].dtype, pd.ArrowDtype)
+    assert mapped.data == pickled.data == extractor.data
+
+
+def test_cache_disk_tier_keeps_tables_mapped(extractor, tmp_path) -> None:
+    """
+    Tests that the mapped tables are only converted to dicts on an explicit
+    data access, not by the texts, pages, frames or pickling.
+
+    Parameters:
+        extractor - DataExtractor: Extractor with sample data
+        tmp_path - Path: Temporary directory path
+    """
+    ExtractionCache(cache_dir=tmp_path).put("a", extractor)
+    mapped = ExtractionCache(cache_dir=tmp_path).get("a")
+
+    # -- Access the results without asking for dicts
+    assert mapped.has_data()
+    assert mapped.texts == {}
+    assert mapped.frames()[()]["col2"].tolist() == [2, 4]
+    copy = pickle.loads(pickle.dumps(mapped))
+
+    # -- Check the tables stay Arrow-backed until the data is requested
+    assert mapped._frames and copy._frames
+    assert copy.data == extractor.data
+    assert not copy._frames
+
+
+def test_cache_disk_tier_missing_tables(extractor, tmp_path) -> None:
+    """
+    Tests that results with missing Arrow files are cache misses.
+
+    Parameters:
+        extractor - DataExtractor: Extractor with sample data
+        tmp_path - Path: Temporary directory path
+    """
+    ExtractionCache(cache_dir=tmp_path).put("a", extractor)
+    (tmp_path / "a" / "0.arrow").unlink()
+
+    cache = ExtractionCache(cache_dir=tmp_path)
+
+    assert cache.get("a") is None
+    assert cache.stats["misses"] == 1
@@ -1,17 +1,27 @@
 import pytest
+import pandas as pd
+from io import BytesIO
 from fpdf import FPDF
 from pathlib import Path
-from src.api.file_processing import process_uploaded_file
+from src.api import file_processing
+from src.api.extraction_cache import ExtractionCache
+from src.api.file_processing import (
+    combine_tables,
+    dedup_stats,
+    process_uploaded_file,
+)
+from src.api.staging import UploadStaging
+from src.api.text_index import TextIndex
 
 
 @pytest.fixture
 def sample_csv(tmp_path: Path) -> Path:
     """
     Create a sample CSV file for testing.
-    
+
     Parameters:
         tmp_path - Path: Temporary directory path
-    
+
     Returns:
         Path: Path to the sample CSV file
     """
@@ -28,10 +38,10 @@ def sample_csv(tmp_path: Path) -> Path:
 def sample_pdf(tmp_path: Path) -> Path:
     """
     Create a sample PDF file for testing.
-    
+
     Parameters:
         tmp_path - Path: Temporary directory path
-    
+
     Returns:
         Path: Path to the sample PDF file
     """
@@ -47,6 +57,7 @@ def sample_pdf(tmp_path: Path) -> Path:
 
     return sample_pdf
 
+
 # TODO: Not working yet, because of the BytesIO object
 # The FileUploader object from Streamlit returns a UploadedFile object, which is a BytesIO object
 # We need to mock this object to test the process_uploaded_file function
@@ -55,7 +66,7 @@ def sample_pdf(tmp_path: Path) -> Path:
 def test_process_uploaded_file(sample_csv, sample_pdf) -> None:
     """
     Tests file processing from Streamlit UI.
-    
+
     Parameters:
         sample_csv - Path: Path to the sample CSV file
         sample_pdf - Path: Path to the sample PDF file
@@ -64,9 +75,150 @@ def test_process_uploaded_file(sample_csv, sample_pdf) -> None:
     csv_extractor = process_uploaded_file(sample_csv, config={"scan": False})
     assert csv_extractor.file_format == "csv"
     assert isinstance(csv_extractor.data, dict)
-    
+
     # -- Test PDF file
-    pdf_extractor = process_uploaded_file(sample_pdf, config={"scan": False})
+    pdf_extractor = process_uploaded_file(
+        sample_pdf, config={"scan": False}, index=TextIndex()
+    )
     assert pdf_extractor.file_format == "pdf"
     assert isinstance(pdf_extractor.data, dict)
-    
\ No newline at end of file
+
+
+@pytest.fixture
+def uploaded_csv() -> BytesIO:
+    """
+    Create an in-memory CSV upload for testing.
+
+    Returns:
+        BytesIO: Uploaded file with a name, like the Streamlit UploadedFile
+    """
+    # -- Create the upload
+    uploaded_file = BytesIO(b"col1,col2\n1,2\n3,4")
+    uploaded_file.name = "upload.csv"
+
+    return uploaded_file
+
+
+def test_process_uploaded_file_cached(uploaded_csv, tmp_path, monkeypatch) -> None:
+    """
+    Tests that reruns with the same upload reuse the cached extraction.
+
+    Parameters:
+        uploaded_csv - BytesIO: In-memory CSV upload
+        tmp_path - Path: Temporary directory path
+        monkeypatch - pytest fixture: Patch the temp directory
+    """
+    # -- Set the temp directory and an empty cache
+    monkeypatch.setattr(file_processing.settings, "TEMP_DIR", tmp_path)
+    cache = ExtractionCache(max_entries=2)
+
+    # -- Process the same upload twice
+    first = process_uploaded_file(uploaded_csv, {}, cache)
+    second = process_uploaded_file(uploaded_csv, {}, cache)
+
+    # -- Check that the file was extracted once
+    assert first is second
+    assert first.data["col1"] == {0: 1, 1: 3}
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+
+    # -- Check that a new configuration is extracted again
+    process_uploaded_file(uploaded_csv, {"optimize_memory": True}, cache)
+    assert cache.stats["misses"] == 2
+
+
+def test_dedup_stats(uploaded_csv, tmp_path, monkeypatch) -> None:
+    """
+    Tests that the extraction metrics cover every upload and the staging ones
+    only the uploads staged on disk.
+
+    Parameters:
+        uploaded_csv - BytesIO: In-memory CSV upload
+        tmp_path - Path: Temporary directory path
+        monkeypatch - pytest fixture: Patch the shared cache, staging and counters
+    """
+    monkeypatch.setattr(file_processing, "extraction_cache", ExtractionCache())
+    monkeypatch.setattr(
+        file_processing, "upload_staging", UploadStaging(tmp_path / "staging")
+    )
+    monkeypatch.setattr(
+        file_processing,
+        "_upload_stats",
+        {"uploads": 0, "uploaded_bytes": 0, "extracted_bytes": 0},
+    )
+
+    # -- Upload a CSV file (extracted from memory) twice
+    process_uploaded_file(uploaded_csv, {})
+    process_uploaded_file(uploaded_csv, {})
+    stats = dedup_stats()
+    assert stats["uploads"] == 2
+    assert stats["extraction_hit_rate"] == 0.5
+    assert stats["staged_uploads"] == 0
+
+    # -- Upload a workbook with many sheets (staged on disk) with two configurations
+    workbook = BytesIO()
+    with pd.ExcelWriter(workbook) as writer:
+        for sheet in ["Q1", "Q2"]:
+            pd.DataFrame({"value": [1]}).to_excel(writer, sheet_name=sheet)
+    workbook.name = "quarters.xlsx"
+    for nrows in [1, 2]:
+        config = {"sheets": "all", "nrows": nrows, "max_workers": 1}
+        process_uploaded_file(workbook, config)
+    stats = dedup_stats()
+    assert stats["staged_uploads"] == 2
+    assert stats["staging_hit_rate"] == 0.5
+
+
+def test_combine_tables(uploaded_csv) -> None:
+    """
+    Tests that the tables of several uploads are combined into one dataset.
+
+    Parameters:
+        uploaded_csv - BytesIO: In-memory CSV upload
+    """
+    # -- Extract two uploads with different columns
+    other_csv = BytesIO(b"col1,col3\n5,x")
+    other_csv.name = "other.csv"
+    cache = ExtractionCache(max_entries=2)
+    extractors = {
+        "upload.csv": process_uploaded_file(uploaded_csv, {}, cache),
+        "other.csv": process_uploaded_file(other_csv, {}, cache),
+    }
+
+    # -- Combine the tables
+    combined = combine_tables(extractors)
+
+    # -- Check the dataset
+    assert list(combined.columns) == [
+        "source_file",
+        "source_table",
+        "col1",
+        "col2",
+        "col3",
+    ]
+    assert combined["source_file"].tolist() == ["upload.csv"] * 2 + ["other.csv"]
+    assert combined["col1"].tolist() == [1, 3, 5]
+    assert combined["col3"].isna().sum() == 2
+
+
+def test_combine_tables_with_same_file_name(uploaded_csv) -> None:
+    """
+    Tests that uploads with the same file name are all combined.
+
+    Parameters:
+        uploaded_csv - BytesIO: In-memory CSV upload
+    """
+    # -- Extract two different uploads with the same name
+    other_csv = BytesIO(b"col1,col2\n5,6")
+    other_csv.name = "upload.csv"
+    cache = ExtractionCache(max_entries=2)
+    extractors = {
+        "job-1": process_uploaded_file(uploaded_csv, {}, cache),
+        "job-2": process_uploaded_file(other_csv, {}, cache),
+    }
+
+    # -- Combine the tables
+    combined = combine_tables(extractors)
+
+    # -- Check that the rows of both files are kept
+    assert combined["source_file"].tolist() == ["upload.csv"] * 3
+    assert combined["col1"].tolist() == [1, 3, 5]
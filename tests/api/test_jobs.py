@@ -0,0 +1,132 @@
+import threading
+import pytest
+from src.api import jobs
+from src.api.jobs import JobManager
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def job_manager() -> JobManager:
+    """
+    Create a job manager with a single worker for testing.
+
+    Returns:
+        JobManager: Job manager without jobs
+    """
+    return JobManager(max_workers=1)
+
+
+# -- Tests --
+def test_job_reports_progress(job_manager) -> None:
+    """
+    Tests that a job records the progress and the result of the extraction.
+
+    Parameters:
+        job_manager - JobManager: Job manager without jobs
+    """
+
+    def extract(progress) -> str:
+        texts = {}
+        for page in range(3):
+            texts[page] = f"Page {page}"
+            progress(page, 3, {"texts": texts})
+        return "extracted"
+
+    # -- Run the job until it finishes
+    job = job_manager.submit("report.pdf", extract)
+    job.future.result(timeout=5)
+
+    # -- Check the job
+    assert job_manager.get(job.job_id) is job
+    assert job.status == "done"
+    assert job.result == "extracted"
+    assert (job.pages_done, job.total_pages) == (3, 3)
+    assert len(job.partial["texts"]) == 3
+
+
+def test_job_cancel(job_manager) -> None:
+    """
+    Tests that cancelling a job stops the extraction after the current page.
+
+    Parameters:
+        job_manager - JobManager: Job manager without jobs
+    """
+    started = threading.Event()
+    resume = threading.Event()
+
+    def extract(progress) -> str:
+        progress(0, 10, {})
+        started.set()
+        resume.wait(timeout=5)
+        for page in range(1, 10):
+            progress(page, 10, {})
+        return "extracted"
+
+    # -- Cancel the job while it extracts the first page
+    job = job_manager.submit("report.pdf", extract)
+    started.wait(timeout=5)
+    job_manager.cancel(job.job_id)
+    resume.set()
+    job.future.result(timeout=5)
+
+    # -- Check the job
+    assert job.status == "cancelled"
+    assert job.result is None
+    assert job.pages_done == 2
+
+
+def test_job_failure(job_manager) -> None:
+    """
+    Tests that the errors of the extraction are recorded on the job.
+
+    Parameters:
+        job_manager - JobManager: Job manager without jobs
+    """
+
+    def extract(progress) -> str:
+        raise ValueError("File format not supported: txt")
+
+    # -- Run the job until it fails
+    job = job_manager.submit("report.txt", extract)
+    job.future.result(timeout=5)
+
+    # -- Check the job
+    assert job.status == "failed"
+    assert "not supported" in job.error
+    job_manager.forget(job.job_id)
+    assert job_manager.get(job.job_id) is None
+
+
+def test_finished_jobs_are_pruned(monkeypatch) -> None:
+    """
+    Tests that finished jobs are removed when not accessed for max_age seconds
+    or when over max_finished, while running jobs are kept.
+
+    Parameters:
+        monkeypatch - MonkeyPatch: Pytest monkeypatch fixture
+    """
+    now = [100.0]
+    monkeypatch.setattr(jobs.time, "monotonic", lambda: now[0])
+    manager = JobManager(max_workers=1, max_age=60, max_finished=2)
+    resume = threading.Event()
+
+    # -- Finish three jobs, accessing them in order, and leave one running
+    done = []
+    for idx in range(3):
+        job = manager.submit(f"report-{idx}.pdf", lambda progress: "extracted")
+        job.future.result(timeout=5)
+        now[0] += 1
+        manager.get(job.job_id)
+        done.append(job)
+    running = manager.submit("running.pdf", lambda progress: resume.wait(timeout=5))
+
+    # -- Check that the least recently accessed finished job is over the limit
+    assert manager.get(done[0].job_id) is None
+    assert manager.get(done[2].job_id) is done[2]
+
+    # -- Check that the finished jobs expire, but not the running one
+    now[0] += 61
+    assert manager.get(done[2].job_id) is None
+    assert manager.get(running.job_id) is running
+    resume.set()
+    running.future.result(timeout=5)
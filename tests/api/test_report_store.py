@@ -0,0 +1,225 @@
+import sqlite3
+import pytest
+import pandas as pd
+from io import BytesIO
+from pathlib import Path
+from src.api.extraction_cache import ExtractionCache
+from src.api.file_processing import process_uploaded_file
+from src.api.report_store import ReportStore, normalize_table
+from src.extract.extractor import DataExtractor
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def store(tmp_path: Path) -> ReportStore:
+    """
+    Create a report store on a temporary database.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        ReportStore: Empty report store
+    """
+    return ReportStore(tmp_path / "store" / "reports.db")
+
+
+@pytest.fixture
+def extractor(tmp_path: Path) -> DataExtractor:
+    """
+    Create an extractor of a sample income statement.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        DataExtractor: Extractor with the data of the sample file
+    """
+    file = tmp_path / "income.csv"
+    file.write_text(
+        'line_item,2023,2024\nRevenue,"1,200",1500\nCOGS,(400),-500\nNotes,,n/a'
+    )
+    return DataExtractor(file, {}).load()
+
+
+# -- Tests --
+def test_normalize_table() -> None:
+    """
+    Tests that the tables are normalized to one line item per numeric value,
+    with the periods of the columns and numbers parsed from text.
+    """
+    df = pd.DataFrame(
+        {"Account": ["Revenue", "COGS"], "2023": ["$1,000", "(250)"], "Q1 2024": [3, 4]}
+    )
+
+    rows = normalize_table(df, "Sheet1", company="Acme")
+
+    assert rows == [
+        ("Sheet1", 0, "Acme", "2023", "Revenue", "2023", 1000.0),
+        ("Sheet1", 1, "Acme", "2023", "COGS", "2023", -250.0),
+        ("Sheet1", 0, "Acme", "Q1 2024", "Revenue", "Q1 2024", 3.0),
+        ("Sheet1", 1, "Acme", "Q1 2024", "COGS", "Q1 2024", 4.0),
+    ]
+
+
+def test_normalize_table_with_key_columns() -> None:
+    """
+    Tests that the company and period columns of a table take precedence over
+    the details of the report, and that the first text column is the line item.
+    """
+    df = pd.DataFrame(
+        {
+            "name": ["Sales", "Rent"],
+            "company": ["Beta", "Beta"],
+            "date": ["2024-01-31", "2024-02-29"],
+            "amount": [10.5, 20.0],
+        }
+    )
+
+    rows = normalize_table(df, "t", company="Acme", period="2023")
+
+    assert rows == [
+        ("t", 0, "Beta", "2024-01-31", "Sales", "amount", 10.5),
+        ("t", 1, "Beta", "2024-02-29", "Rent", "amount", 20.0),
+    ]
+    assert normalize_table(pd.DataFrame(), "t") == []
+    assert normalize_table(pd.DataFrame({"a": ["x", "y"]}), "t") == []
+
+
+def test_normalize_table_with_missing_keys() -> None:
+    """
+    Tests that missing companies, periods and line items are kept as NULL.
+    """
+    df = pd.DataFrame(
+        {
+            "item": ["Sales", None],
+            "company": ["Beta", None],
+            "period": [None, "2024"],
+            "amount": [10.5, 20.0],
+        }
+    )
+
+    rows = normalize_table(df, "t")
+
+    assert rows == [
+        ("t", 0, "Beta", None, "Sales", "amount", 10.5),
+        ("t", 1, None, "2024", None, "amount", 20.0),
+    ]
+
+
+def test_store_is_created_on_first_use(store) -> None:
+    """
+    Tests that the database is only created on first use.
+
+    Parameters:
+        store - ReportStore: Empty report store
+    """
+    assert not store.db_path.exists()
+    assert store.get("missing") is None
+    assert store.db_path.exists()
+    assert store.reports().empty
+
+
+def test_add_and_query(store, extractor) -> None:
+    """
+    Tests that the line items of a report are stored and queried by company,
+    period prefix, line item and metric, ignoring the case.
+
+    Parameters:
+        store - ReportStore: Empty report store
+        extractor - DataExtractor: Extractor of the sample income statement
+    """
+    tables = {"income.csv": pd.DataFrame(extractor.data)}
+
+    assert store.add("r1", extractor, tables, company="Acme") == 4
+
+    assert store.get("r1") == {
+        "file_name": "income.csv",
+        "file_format": "csv",
+        "company": "Acme",
+        "period": None,
+        "tables": 1,
+    }
+    revenue = store.query(company="acme", line_item="REVENUE")
+    assert revenue["period"].tolist() == ["2023", "2024"]
+    assert revenue["value"].tolist() == [1200.0, 1500.0]
+    assert revenue["file_name"].unique().tolist() == ["income.csv"]
+    assert store.query(period="2023")["value"].tolist() == [1200.0, -400.0]
+    assert store.query(period="202")["value"].size == 4
+    assert store.query(period="2025").empty
+    assert store.query(metric="2024", limit=1)["line_item"].tolist() == ["Revenue"]
+
+
+def test_add_replaces_report(store, extractor) -> None:
+    """
+    Tests that storing a report again replaces its line items, and that deleting
+    a report removes them.
+
+    Parameters:
+        store - ReportStore: Empty report store
+        extractor - DataExtractor: Extractor of the sample income statement
+    """
+    tables = {"income.csv": pd.DataFrame(extractor.data)}
+    store.add("r1", extractor, tables, company="Acme")
+    store.add("r1", extractor, tables, company="Beta")
+    store.add("r2", extractor, tables, company="Acme")
+
+    assert len(store.reports()) == 2
+    assert len(store.query()) == 8
+    assert len(store.query(company="Beta")) == 4
+
+    store.delete("r1")
+
+    assert store.get("r1") is None
+    assert store.query(company="Beta").empty
+    assert len(store.query()) == 4
+
+
+def test_query_uses_indexes(store, extractor) -> None:
+    """
+    Tests that the queries by company, period and line item use the indexes.
+
+    Parameters:
+        store - ReportStore: Empty report store
+        extractor - DataExtractor: Extractor of the sample income statement
+    """
+    store.add("r1", extractor, {"t": pd.DataFrame(extractor.data)})
+
+    with sqlite3.connect(store.db_path) as conn:
+        for condition, params in [
+            ("company = ? AND period >= ? AND period < ?", ["Acme", "2023", "2024"]),
+            ("period >= ? AND period < ?", ["2023", "2024"]),
+            ("line_item = ?", ["Revenue"]),
+        ]:
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM line_items WHERE {condition}",
+                params,
+            ).fetchall()
+            assert "USING INDEX" in plan[0][-1]
+
+
+def test_process_uploaded_file_stores_report(store) -> None:
+    """
+    Tests that the processed uploads are stored once, and stored again when
+    their details change.
+
+    Parameters:
+        store - ReportStore: Empty report store
+    """
+    cache = ExtractionCache()
+    uploaded_file = BytesIO(b"item,2024\nRevenue,10\nCOGS,4")
+    uploaded_file.name = "upload.csv"
+
+    process_uploaded_file(uploaded_file, {}, cache=cache, store=store)
+    stored_at = store.reports()["stored_at"].tolist()
+    process_uploaded_file(uploaded_file, {}, cache=cache, store=store)
+
+    assert store.reports()["stored_at"].tolist() == stored_at
+    assert store.query(line_item="Revenue", period="2024")["value"].tolist() == [10.0]
+
+    process_uploaded_file(
+        uploaded_file, {}, cache=cache, store=store, company="Acme", period="FY2024"
+    )
+
+    assert len(store.reports()) == 1
+    assert store.query(company="Acme")["value"].tolist() == [10.0, 4.0]
@@ -0,0 +1,215 @@
+import os
+import json
+import time
+import asyncio
+import pytest
+import tornado.web
+from fpdf import FPDF
+from pathlib import Path
+from typing import Callable, Iterator
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.testing import bind_unused_port
+from src.api import file_processing, server
+from src.api.extraction_cache import ExtractionCache
+from src.api.text_index import TextIndex
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def sample_pdf(tmp_path: Path) -> bytes:
+    """
+    Create a sample PDF with two pages for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        bytes: Content of the PDF file
+    """
+    # -- Set file path
+    file = tmp_path / "report.pdf"
+
+    # -- Create a PDF file with a text on each page
+    pdf = FPDF()
+    pdf.set_font("Arial", size=12)
+    for page in range(2):
+        pdf.add_page()
+        pdf.cell(200, 10, txt=f"Quarter {page + 1} revenue", ln=True)
+    pdf.output(str(file))
+
+    return file.read_bytes()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch, tmp_path) -> None:
+    """
+    Use an empty extraction cache and text index on each test.
+
+    The worker processes are forked by each test, so they get the patched ones.
+
+    Parameters:
+        monkeypatch - pytest fixture: Patch the shared cache and index
+        tmp_path - Path: Temporary directory path
+    """
+    monkeypatch.setattr(file_processing, "extraction_cache", ExtractionCache())
+    monkeypatch.setattr(file_processing, "text_index", TextIndex(tmp_path / "index"))
+
+
+@pytest.fixture
+def make_app() -> Iterator[Callable]:
+    """
+    Create the applications of the service, closing their worker pools after the test.
+
+    Yields:
+        Callable: Function creating an application (see server.make_app)
+    """
+    apps = []
+
+    def make(**options) -> tornado.web.Application:
+        apps.append(server.make_app(**options))
+        return apps[-1]
+
+    yield make
+    for app in apps:
+        app.settings["pool"].close()
+
+
+def fetch_all(app, requests: list[tuple[str, bytes]]) -> list:
+    """
+    Send concurrent POST requests to the application on a local port.
+
+    Parameters:
+        app - tornado.web.Application: Application of the service
+        requests - list[tuple[str, bytes]]: Path and body of each request
+
+    Returns:
+        list: Response of each request (errors are returned, not raised)
+    """
+
+    async def fetch() -> list:
+        sock, port = bind_unused_port()
+        http_server = HTTPServer(app)
+        http_server.add_sockets([sock])
+        client = AsyncHTTPClient()
+        try:
+            return await asyncio.gather(
+                *(
+                    client.fetch(
+                        f"http://127.0.0.1:{port}{path}",
+                        method="POST",
+                        body=body,
+                        raise_error=False,
+                    )
+                    for path, body in requests
+                )
+            )
+        finally:
+            http_server.stop()
+
+    return asyncio.run(fetch())
+
+
+# -- Tests --
+def test_extract(make_app) -> None:
+    """
+    Tests that the service returns the data of an uploaded file, and that
+    invalid requests free their place on the worker pool.
+
+    Parameters:
+        make_app - Callable: Create an application of the service
+    """
+    # -- Extract a CSV file, a request without file name and one with an
+    #    invalid configuration
+    app = make_app(max_workers=2, max_queue=0)
+    responses = fetch_all(
+        app,
+        [
+            ("/extract?name=revenue.csv", b"quarter,revenue\nQ1,100"),
+            ("/extract", b""),
+            ("/extract?name=revenue.csv&scan=%FF", b"quarter,revenue\nQ1,100"),
+        ],
+    )
+
+    # -- Check the responses
+    assert responses[0].code == 200
+    body = json.loads(responses[0].body)
+    assert body["file_format"] == "csv"
+    assert body["data"] == {"quarter": {"0": "Q1"}, "revenue": {"0": 100}}
+    assert responses[1].code == 400
+    assert responses[2].code == 400
+    assert app.settings["pool"].pending == 0
+
+
+def test_extract_stream(sample_pdf, make_app, tmp_path) -> None:
+    """
+    Tests that the pages of a PDF are streamed as NDJSON lines.
+
+    Parameters:
+        sample_pdf - bytes: Content of a PDF with two pages
+        make_app - Callable: Create an application of the service
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Stream the extraction of the PDF
+    (response,) = fetch_all(
+        make_app(max_workers=1, max_queue=0),
+        [("/extract/stream?name=report.pdf", sample_pdf)],
+    )
+
+    # -- Check a line for each page and the status line
+    lines = [json.loads(line) for line in response.body.decode().splitlines()]
+    assert [line.get("page") for line in lines] == [1, 2, None]
+    assert "Quarter 2 revenue" in lines[1]["text"]
+    assert lines[-1]["status"] == "done"
+
+    # -- Check that the worker indexed the texts in the test index
+    assert [doc["name"] for doc in TextIndex(tmp_path / "index").documents()] == [
+        "report.pdf"
+    ]
+
+
+def test_extract_queue_full(monkeypatch, make_app) -> None:
+    """
+    Tests that requests over the capacity of the worker pool get a 429 response.
+
+    Parameters:
+        monkeypatch - pytest fixture: Patch the extraction with a slow one
+        make_app - Callable: Create an application of the service
+    """
+
+    def slow_extraction(uploaded_file, config, progress=None):
+        time.sleep(0.3)
+        return file_processing.process_uploaded_file(uploaded_file, config)
+
+    monkeypatch.setattr(server, "process_uploaded_file", slow_extraction)
+
+    # -- Send three requests to a pool with one worker and one queued request
+    responses = fetch_all(
+        make_app(max_workers=1, max_queue=1),
+        [("/extract?name=revenue.csv", b"quarter,revenue\nQ1,100")] * 3,
+    )
+
+    # -- Check that only one request was rejected
+    assert sorted(response.code for response in responses) == [200, 200, 429]
+    rejected = next(response for response in responses if response.code == 429)
+    assert rejected.headers["Retry-After"] == "1"
+
+
+def test_worker_pool_runs_on_processes() -> None:
+    """
+    Tests that the extractions run on worker processes, so they do not share
+    the GIL of the service.
+    """
+    pool = server.WorkerPool(max_workers=2, max_queue=0)
+
+    async def run_all() -> list[int]:
+        assert pool.acquire() and pool.acquire()
+        return await asyncio.gather(pool.run(os.getpid), pool.run(os.getpid))
+
+    try:
+        pids = asyncio.run(run_all())
+    finally:
+        pool.close()
+
+    assert os.getpid() not in pids
+    assert pool.stats()["running"] == 0
@@ -0,0 +1,106 @@
+import os
+import time
+import pytest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from src.api.staging import UploadStaging
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def staging(tmp_path: Path) -> UploadStaging:
+    """
+    Create an upload staging on a temporary directory for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        UploadStaging: Upload staging with a small disk quota
+    """
+    return UploadStaging(tmp_path / "staging", max_age=60, max_bytes=10)
+
+
+# -- Tests --
+def test_stage_without_collisions(staging) -> None:
+    """
+    Tests that uploads with the same name from many sessions do not collide.
+
+    Parameters:
+        staging - UploadStaging: Upload staging
+    """
+    # -- Stage uploads with the same name concurrently
+    uploads = [(f"report {i}".encode(), "report.pdf", f"session-{i}") for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        paths = list(executor.map(lambda args: staging.stage(*args), uploads))
+
+    # -- Check that every upload kept its content
+    assert len(set(paths)) == len(uploads)
+    for (content, _, session_id), file_path in zip(uploads, paths):
+        assert file_path.read_bytes() == content
+        assert file_path.parent.name == session_id
+
+    # -- Check that identical shared uploads use the same file
+    assert staging.stage(b"same", "a.pdf") == staging.stage(b"same", "b.pdf")
+
+
+def test_evict_by_age(staging) -> None:
+    """
+    Tests that the janitor evicts old files that are not in use.
+
+    Parameters:
+        staging - UploadStaging: Upload staging
+    """
+    # -- Stage two old files and release one of them
+    staging.max_bytes = 1024
+    with staging.staged(b"old", "old.csv") as released:
+        pass
+    in_use = staging.stage(b"in use", "in_use.csv")
+    old_time = time.time() - 120
+    os.utime(released, (old_time, old_time))
+    os.utime(in_use, (old_time, old_time))
+
+    # -- Evict the files
+    assert staging.evict() == 1
+
+    # -- Check the removed files
+    assert not released.exists()
+    assert in_use.exists()
+
+
+def test_evict_by_size(staging) -> None:
+    """
+    Tests that the janitor evicts the oldest files over the disk quota.
+
+    Parameters:
+        staging - UploadStaging: Upload staging
+    """
+    # -- Stage files over the quota of 10 bytes
+    paths = []
+    for i in range(3):
+        with staging.staged(f"file {i}".encode(), "file.csv", "session") as path:
+            paths.append(path)
+        os.utime(path, (time.time() + i, time.time() + i))
+
+    # -- Evict the files
+    staging.evict()
+
+    # -- Check that only the newest file was kept
+    assert [path.exists() for path in paths] == [False, False, True]
+
+
+def test_stage_shares_identical_uploads(staging) -> None:
+    """
+    Tests that identical uploads from many sessions are stored once.
+
+    Parameters:
+        staging - UploadStaging: Upload staging
+    """
+    # -- Stage the same content from two sessions
+    first = staging.stage(b"public filing", "filing.pdf", "session-1")
+    second = staging.stage(b"public filing", "copy.pdf", "session-2")
+
+    # -- Check that the session files share the same blob
+    assert first != second
+    assert first.stat().st_ino == second.stat().st_ino
+    assert staging.blob_store.stats["bytes_saved"] == len(b"public filing")
@@ -0,0 +1,258 @@
+import numpy as np
+import pytest
+from fpdf import FPDF
+from io import BytesIO
+from src.api.extraction_cache import ExtractionCache
+from src.api.file_processing import process_uploaded_file
+from src.api.text_index import (
+    TextIndex,
+    _decode_varints,
+    _encode_varints,
+    tokenize,
+)
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def texts() -> dict[str, dict[int, str]]:
+    """
+    Create the page texts of two filings.
+
+    Returns:
+        dict[str, dict[int, str]]: Text of each page by document
+    """
+    return {
+        "a": {
+            0: "Annual Report. EBITDA grew 12%.",
+            1: "Net debt fell; net income rose. EBIT margin was 9%.",
+        },
+        "b": {
+            0: "Quarterly report",
+            1: "",
+            2: "The NET DEBT was 1,200 and EBITDA 300.",
+        },
+    }
+
+
+@pytest.fixture
+def index(texts) -> TextIndex:
+    """
+    Create an in-memory index of the filings.
+
+    Parameters:
+        texts - dict: Page texts of the filings
+
+    Returns:
+        TextIndex: Index of the filings
+    """
+    index = TextIndex()
+    for key, pages in texts.items():
+        index.add(key, f"{key}.pdf", pages)
+    return index
+
+
+def matches(index: TextIndex, texts: dict, query: str, **kwargs) -> list[tuple]:
+    """
+    Get the documents, pages and matched texts of a query.
+
+    Parameters:
+        index - TextIndex: Index of the filings
+        texts - dict: Page texts of the filings
+        query - str: Query of the search
+
+    Returns:
+        list[tuple]: Document, page and text of each occurrence
+    """
+    return [
+        (
+            hit["document"],
+            hit["page"],
+            texts[hit["document"]][hit["page"]][
+                hit["offset"] : hit["offset"] + hit["length"]
+            ],
+        )
+        for hit in index.search(query, **kwargs)
+    ]
+
+
+# -- Tests --
+def test_tokenize() -> None:
+    """
+    Tests that the texts are split into lowercase words with their offsets.
+    """
+    assert tokenize("Net debt: 1,200") == [
+        ("net", 0),
+        ("debt", 4),
+        ("1", 10),
+        ("200", 12),
+    ]
+
+
+def test_varints_roundtrip() -> None:
+    """
+    Tests that integers of any size are encoded and decoded as varints.
+    """
+    values = np.array([0, 1, 127, 128, 300, 2**21, 2**40], dtype=np.int64)
+
+    data, sizes = _encode_varints(values)
+
+    assert sizes.tolist() == [1, 1, 1, 2, 2, 4, 6]
+    assert data[:4] == bytes([0, 1, 127, 0x80]) and len(data) == sizes.sum()
+    assert _decode_varints(data).tolist() == values.tolist()
+
+
+def test_search_phrases_and_prefixes(index, texts) -> None:
+    """
+    Tests that phrases and prefixes are found ignoring the case.
+
+    Parameters:
+        index - TextIndex: Index of the filings
+        texts - dict: Page texts of the filings
+    """
+    assert matches(index, texts, "net debt") == [
+        ("a", 1, "Net debt"),
+        ("b", 2, "NET DEBT"),
+    ]
+    assert matches(index, texts, "EBIT*") == [
+        ("a", 0, "EBITDA"),
+        ("a", 1, "EBIT"),
+        ("b", 2, "EBITDA"),
+    ]
+    assert matches(index, texts, "net in*") == [("a", 1, "net income")]
+    assert matches(index, texts, "ebitda") == [("a", 0, "EBITDA"), ("b", 2, "EBITDA")]
+    assert matches(index, texts, "debt net") == []
+    assert matches(index, texts, "missing") == []
+    assert index.search("  ") == []
+
+
+def test_search_documents_and_limit(index, texts) -> None:
+    """
+    Tests that the search is restricted to some documents and occurrences.
+
+    Parameters:
+        index - TextIndex: Index of the filings
+        texts - dict: Page texts of the filings
+    """
+    assert matches(index, texts, "net debt", documents=["b", "other"]) == [
+        ("b", 2, "NET DEBT")
+    ]
+    assert matches(index, texts, "net debt", documents=[]) == []
+    assert matches(index, texts, "report", limit=1) == [("a", 0, "Report")]
+
+
+def test_add_is_idempotent(index) -> None:
+    """
+    Tests that documents are only indexed once.
+
+    Parameters:
+        index - TextIndex: Index of the filings
+    """
+    assert not index.add("a", "a.pdf", {0: "EBITDA"})
+    assert index.has("a") and not index.has("c")
+    assert [document["pages"] for document in index.documents()] == [2, 3]
+    assert len(index.search("ebitda")) == 2
+
+
+def test_index_on_disk(texts, tmp_path) -> None:
+    """
+    Tests that each document is written as a segment, that the segments are
+    merged, and that a new index loads them.
+
+    Parameters:
+        texts - dict: Page texts of the filings
+        tmp_path - Path: Temporary directory path
+    """
+    index = TextIndex(tmp_path / "index", max_segments=2)
+    index.add("a", "a.pdf", texts["a"])
+    assert len(list((tmp_path / "index").glob("*.seg"))) == 1
+
+    # -- The second segment is merged with the first one
+    index.add("b", "b.pdf", texts["b"])
+    index.add("c", "c.pdf", {0: "Net debt and EBITDA"})
+    assert len(list((tmp_path / "index").glob("*.seg"))) == 2
+
+    loaded = TextIndex(tmp_path / "index", max_segments=2)
+    assert loaded.search("net debt") == index.search("net debt")
+    assert [hit["document"] for hit in loaded.search("ebitda")] == ["a", "b", "c"]
+
+    # -- New documents continue the postings of the loaded ones
+    loaded.add("d", "d.pdf", {3: "net debt"})
+    loaded.compact()
+    assert len(list((tmp_path / "index").glob("*.seg"))) == 1
+    hits = TextIndex(tmp_path / "index").search("net debt")
+    assert [(hit["document"], hit["page"]) for hit in hits] == [
+        ("a", 1),
+        ("b", 2),
+        ("c", 0),
+        ("d", 3),
+    ]
+
+
+def test_index_shared_by_processes(texts, tmp_path) -> None:
+    """
+    Tests that indexes of the same directory (e.g. in several processes) keep
+    the documents added by each other.
+
+    Parameters:
+        texts - dict: Page texts of the filings
+        tmp_path - Path: Temporary directory path
+    """
+    first = TextIndex(tmp_path, max_segments=2)
+    second = TextIndex(tmp_path, max_segments=2)
+
+    # -- Add the documents to both indexes in turns
+    first.add("a", "a.pdf", texts["a"])
+    second.add("b", "b.pdf", texts["b"])
+    first.add("c", "c.pdf", {0: "EBITDA"})
+    second.add("d", "d.pdf", {1: "EBITDA margin"})
+
+    # -- Check that no document was lost
+    for index in [first, second, TextIndex(tmp_path)]:
+        assert [doc["key"] for doc in index.documents()] == ["a", "b", "c", "d"]
+        hits = index.search("ebitda")
+        assert [hit["document"] for hit in hits] == ["a", "b", "c", "d"]
+
+
+def test_corrupt_segment(texts, tmp_path) -> None:
+    """
+    Tests that a corrupt segment is removed with the ones after it.
+
+    Parameters:
+        texts - dict: Page texts of the filings
+        tmp_path - Path: Temporary directory path
+    """
+    index = TextIndex(tmp_path)
+    index.add("a", "a.pdf", texts["a"])
+    index.add("b", "b.pdf", texts["b"])
+    (tmp_path / "0000000000.seg").write_bytes(b"not a segment")
+
+    loaded = TextIndex(tmp_path)
+
+    assert loaded.documents() == []
+    assert not list(tmp_path.glob("*.seg"))
+    assert loaded.add("b", "b.pdf", texts["b"])
+
+
+def test_process_uploaded_file_indexes_pdf(tmp_path) -> None:
+    """
+    Tests that the texts of the processed PDF uploads are indexed once.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    pdf = FPDF()
+    for text in ["Annual report", "Net debt was reduced"]:
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.cell(0, 10, txt=text, ln=True)
+    uploaded_file = BytesIO(pdf.output(dest="S").encode("latin-1"))
+    uploaded_file.name = "filing.pdf"
+    index = TextIndex()
+    cache = ExtractionCache()
+
+    process_uploaded_file(uploaded_file, {"scan": False}, cache=cache, index=index)
+    process_uploaded_file(uploaded_file, {"scan": False}, cache=cache, index=index)
+
+    hits = index.search("net debt")
+    assert len(index.documents()) == 1
+    assert [(hit["name"], hit["page"]) for hit in hits] == [("filing.pdf", 1)]
@@ -0,0 +1,97 @@
+import json
+import pytest
+from pathlib import Path
+from benchmarks.generators import (
+    generate,
+    ledger,
+    write_csv,
+    write_excel,
+    write_json,
+    write_pdf,
+    write_scanned_pdf,
+)
+from src.extract.extractor import DataExtractor
+
+
+# -- Tests --
+def test_ledger_is_reproducible() -> None:
+    """
+    Tests that the same seed generates the same ledger.
+    """
+    assert ledger(50, seed=1).equals(ledger(50, seed=1))
+    assert not ledger(50, seed=1).equals(ledger(50, seed=2))
+
+
+@pytest.mark.parametrize(
+    "writer, name, config, rows",
+    [
+        (write_csv, "ledger.csv", {"optimize_memory": False}, 30),
+        (write_excel, "ledger.xlsx", {"sheets": 0}, 30),
+    ],
+)
+def test_table_documents(writer, name, config, rows, tmp_path: Path) -> None:
+    """
+    Tests that the generated tables are extracted with all their rows.
+
+    Parameters:
+        writer - Callable: Generator of the document
+        name - str: Name of the document
+        config - dict: Configuration for the extractor
+        rows - int: Number of rows
+        tmp_path - Path: Temporary directory path
+    """
+    file_path = writer(tmp_path / name, rows)
+
+    data = DataExtractor(file_path, config).load().data
+
+    assert len(data["revenue"]) == rows
+    assert "net_income" in data
+
+
+def test_json_document(tmp_path: Path) -> None:
+    """
+    Tests that the JSON ledger is nested by account.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    file_path = write_json(tmp_path / "ledger.json", 40)
+
+    document = json.loads(file_path.read_text())
+    entries = [
+        entry for account in document["accounts"] for entry in account["entries"]
+    ]
+    assert len(entries) == 40
+
+
+def test_pdf_documents(tmp_path: Path) -> None:
+    """
+    Tests that the generated PDFs have a text layer with tables, or only images.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    pdf = DataExtractor(write_pdf(tmp_path / "report.pdf", 2), {"scan": False}).load()
+    scanned = DataExtractor(
+        write_scanned_pdf(tmp_path / "scanned.pdf", 1), {"scan": False}
+    ).load()
+
+    assert "Quarterly Report - Page 2" in pdf.data["texts"][1]
+    assert set(pdf.data["tables"]) == {0, 1}
+    assert scanned.data == {}
+
+
+def test_generate_reuses_documents(tmp_path: Path) -> None:
+    """
+    Tests that the documents are generated once per kind, size and seed.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    file_path = generate("csv", "small", tmp_path)
+    mtime = file_path.stat().st_mtime_ns
+
+    assert generate("csv", "small", tmp_path).stat().st_mtime_ns == mtime
+    assert file_path.name == "csv-small-0.csv"
+    with pytest.raises(ValueError):
+        generate("csv", "huge", tmp_path)
@@ -0,0 +1,58 @@
+import pytest
+from pathlib import Path
+from benchmarks.memory import READERS, fit, profile_reader
+
+# -- Smaller sizes of the readers, to keep the tests fast
+TEST_SIZES = {
+    "csv": [5_000, 20_000],
+    "excel": [1_000, 4_000],
+    "json": [5_000, 20_000],
+    "pdf": [4, 32],
+}
+
+
+# -- Fixtures --
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory) -> Path:
+    """
+    Fixture with the directory of the generated documents, shared by the tests.
+
+    Parameters:
+        tmp_path_factory - TempPathFactory: Pytest temporary directory factory
+
+    Returns:
+        Path: Directory of the documents
+    """
+    return tmp_path_factory.mktemp("memory")
+
+
+# -- Tests --
+def test_fit() -> None:
+    """
+    Tests the line fitted to the peak RSS by input size.
+    """
+    points = [
+        {"input_bytes": size * 1024**2, "peak_rss": (10 + 3 * size) * 1024**2}
+        for size in [1, 2, 4]
+    ]
+
+    line = fit(points)
+
+    assert line["slope"] == pytest.approx(3.0)
+    assert line["intercept"] == pytest.approx(10.0)
+    assert line["max_ratio"] == pytest.approx(13.0)
+
+
+@pytest.mark.parametrize("reader", list(TEST_SIZES))
+def test_reader_memory_per_input(reader, data_dir) -> None:
+    """
+    Tests that the memory used by each reader per MB of input is under its threshold.
+
+    Parameters:
+        reader - str: Name of the reader
+        data_dir - Path: Directory of the generated documents
+    """
+    result = profile_reader(reader, data_dir, TEST_SIZES[reader], trace=False)
+
+    assert all(point["peak_rss"] > 0 for point in result["points"])
+    assert result["slope"] <= READERS[reader]["max_slope"], result["points"]
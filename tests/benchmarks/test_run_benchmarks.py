@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+from benchmarks import run_benchmarks
+from benchmarks.run_benchmarks import Case, compare, time_case
+
+
+# -- Helpers --
+def result(name: str, median: float) -> dict:
+    """
+    Build the result of a case.
+
+    Parameters:
+        name - str: Name of the case
+        median - float: Median time in seconds
+
+    Returns:
+        dict: Result of the case
+    """
+    return {"name": name, "median": median}
+
+
+# -- Tests --
+def test_time_case() -> None:
+    """
+    Tests that the cases are run after the warmup and timed.
+    """
+    calls = []
+    case = Case("extract.csv.small", "extract", "small", lambda: calls.append(1))
+
+    stats = time_case(case, repeat=3, warmup=2)
+
+    assert len(calls) == 5
+    assert stats["runs"] == 3
+    assert 0 <= stats["min"] <= stats["median"]
+
+
+def test_compare_flags_regressions() -> None:
+    """
+    Tests that only the medians growing over the threshold and the minimum
+    delta are flagged.
+    """
+    baseline = {
+        "slow": result("slow", 1.0),
+        "fast": result("fast", 0.0001),
+        "faster": result("faster", 1.0),
+        "removed": result("removed", 1.0),
+    }
+    current = {
+        "slow": result("slow", 1.5),
+        "fast": result("fast", 0.0002),
+        "faster": result("faster", 0.5),
+        "added": result("added", 1.0),
+    }
+
+    statuses = {
+        item["name"]: item["status"]
+        for item in compare(baseline, current, threshold=0.2, min_delta=0.001)
+    }
+
+    assert statuses == {
+        "slow": "regression",
+        "fast": "unchanged",
+        "faster": "improvement",
+        "removed": "missing",
+        "added": "new",
+    }
+
+
+def test_run_and_compare(tmp_path: Path) -> None:
+    """
+    Tests the run and compare commands, with the results files.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    data_dir = tmp_path / "data"
+    args = ["--data-dir", str(data_dir), "--repeat", "1", "--warmup", "0"]
+
+    # -- Run the metrics of the small ledger
+    baseline = tmp_path / "baseline.json"
+    code = run_benchmarks.main(["run", *args, "-k", "metrics", "-o", str(baseline)])
+    results = json.loads(baseline.read_text())
+    assert code == 0
+    assert results["settings"]["sizes"] == ["small"]
+    assert {item["group"] for item in results["results"]} == {"metrics"}
+
+    # -- A slower run is flagged as a regression
+    for item in results["results"]:
+        item["median"] += 1.0
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(results))
+    assert run_benchmarks.main(["compare", str(baseline), str(current)]) == 1
+    assert run_benchmarks.main(["compare", str(baseline), str(baseline)]) == 0
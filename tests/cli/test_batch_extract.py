@@ -0,0 +1,123 @@
+import json
+import pytest
+import pandas as pd
+from pathlib import Path
+from src.cli.batch_extract import MANIFEST_NAME, find_files, main
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def reports_dir(tmp_path: Path) -> Path:
+    """
+    Create a directory of reports for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        Path: Directory with CSV and JSON reports and an unsupported file
+    """
+    # -- Set the directory
+    reports_dir = tmp_path / "reports"
+    (reports_dir / "2024").mkdir(parents=True)
+
+    # -- Write the reports
+    (reports_dir / "revenue.csv").write_text("quarter,revenue\nQ1,100\nQ2,120")
+    (reports_dir / "2024" / "revenue.csv").write_text("quarter,revenue\nQ3,130")
+    (reports_dir / "2024" / "summary.json").write_text(json.dumps({"year": 2024}))
+    (reports_dir / "notes.txt").write_text("not a report")
+
+    return reports_dir
+
+
+# -- Tests --
+def test_find_files(reports_dir) -> None:
+    """
+    Tests that directories and globs are expanded to the supported files.
+
+    Parameters:
+        reports_dir - Path: Directory with the reports
+    """
+    # -- Check the directory and a glob matching the same files
+    files = find_files([str(reports_dir), str(reports_dir / "**" / "*.csv")])
+    assert [file.name for file in files] == [
+        "revenue.csv",
+        "summary.json",
+        "revenue.csv",
+    ]
+
+
+def test_batch_extract(reports_dir, tmp_path) -> None:
+    """
+    Tests that the files are extracted to Parquet and the manifest resumes the run.
+
+    Parameters:
+        reports_dir - Path: Directory with the reports
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Extract the reports
+    output_dir = tmp_path / "output"
+    assert main([str(reports_dir), "-o", str(output_dir), "-w", "2"]) == 0
+
+    # -- Check the results
+    tables = sorted(output_dir.glob("*.parquet"))
+    assert len(tables) == 2
+    revenue = pd.concat(pd.read_parquet(table) for table in tables)
+    assert sorted(revenue["quarter"]) == ["Q1", "Q2", "Q3"]
+    summary = next(output_dir.glob("summary-*.texts.jsonl"))
+    assert json.loads(summary.read_text()) == {"year": 2024}
+
+    # -- Check the manifest
+    manifest = (output_dir / MANIFEST_NAME).read_text().splitlines()
+    assert len(manifest) == 3
+    assert all(json.loads(line)["status"] == "done" for line in manifest)
+
+    # -- Check that a new run only extracts the changed files
+    (reports_dir / "revenue.csv").write_text("quarter,revenue\nQ1,100\nQ2,125\nQ4,90")
+    assert main([str(reports_dir), "-o", str(output_dir), "-f", "jsonl"]) == 0
+    manifest = (output_dir / MANIFEST_NAME).read_text().splitlines()
+    assert len(manifest) == 4
+    assert json.loads(manifest[-1])["file"] == str(
+        (reports_dir / "revenue.csv").resolve()
+    )
+
+
+def test_batch_extract_config_changed(reports_dir, tmp_path) -> None:
+    """
+    Tests that a run with another configuration extracts the files again.
+
+    Parameters:
+        reports_dir - Path: Directory with the reports
+        tmp_path - Path: Temporary directory path
+    """
+    output_dir = tmp_path / "output"
+    assert main([str(reports_dir), "-o", str(output_dir)]) == 0
+    assert main([str(reports_dir), "-o", str(output_dir)]) == 0
+    assert main([str(reports_dir), "-o", str(output_dir), "--normalize"]) == 0
+
+    manifest = (output_dir / MANIFEST_NAME).read_text().splitlines()
+    assert len(manifest) == 6
+
+
+def test_batch_extract_same_table_names(tmp_path) -> None:
+    """
+    Tests that tables with the same file name are written to different files.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Write a workbook with sheets that differ only in punctuation
+    file = tmp_path / "quarters.xlsx"
+    with pd.ExcelWriter(file) as writer:
+        for sheet in ["Q1 2024", "Q1-2024", "q1 2024!"]:
+            pd.DataFrame({"sheet": [sheet]}).to_excel(
+                writer, sheet_name=sheet, index=False
+            )
+
+    output_dir = tmp_path / "output"
+    assert main([str(file), "-o", str(output_dir), "--all-sheets", "-w", "1"]) == 0
+
+    tables = sorted(output_dir.glob("*.parquet"))
+    assert len(tables) == 3
+    sheets = sorted(pd.read_parquet(table)["sheet"][0] for table in tables)
+    assert sheets == ["Q1 2024", "Q1-2024", "q1 2024!"]
@@ -0,0 +1,189 @@
+import pickle
+import pytest
+import pandas as pd
+from pathlib import Path
+from src.extract import arrow_tables
+from src.extract.extractor import DataExtractor
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def pdf_data() -> dict:
+    """
+    Create the data of a PDF file with two tables.
+
+    Returns:
+        dict: Texts and tables of the pages
+    """
+    return {
+        "texts": {0: "Page one", 1: "Page two"},
+        "tables": {
+            0: {"item": {0: "Revenue", 1: "COGS"}, "value": {0: 10.5, 1: None}},
+            1: {"item": {0: "Cash"}, "value": {0: 3.0}},
+        },
+    }
+
+
+@pytest.fixture
+def sample_csv(tmp_path: Path) -> Path:
+    """
+    Create a sample CSV file for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        Path: Path of the sample CSV file
+    """
+    file = tmp_path / "sample.csv"
+    file.write_text("date,item,value\n2024-01-31,Revenue,1.5\n2024-02-29,COGS,-0.5\n")
+    return file
+
+
+# -- Tests --
+def test_table_paths(pdf_data) -> None:
+    """
+    Tests that the paths of the tables depend on the file format and configuration.
+
+    Parameters:
+        pdf_data - dict: Data of a PDF file
+    """
+    table = {"a": {0: 1}}
+
+    assert arrow_tables.table_paths(pdf_data, "pdf", {}) == [
+        ("tables", 0),
+        ("tables", 1),
+    ]
+    assert arrow_tables.table_paths({"tables": {"x": table}}, "json", {}) == []
+    assert arrow_tables.table_paths(
+        {"tables": {"x": table}}, "json", {"normalize": True}
+    ) == [("tables", "x")]
+    assert arrow_tables.table_paths(
+        {"s1": table, "s2": table}, "xlsx", {"sheets": "all"}
+    ) == [("s1",), ("s2",)]
+    assert arrow_tables.table_paths(table, "csv", {}) == [()]
+    assert arrow_tables.table_paths({}, "csv", {}) == []
+
+
+def test_split_tables_keeps_data(pdf_data) -> None:
+    """
+    Tests that splitting the tables leaves placeholders in a copy of the data.
+
+    Parameters:
+        pdf_data - dict: Data of a PDF file
+    """
+    paths = arrow_tables.table_paths(pdf_data, "pdf", {})
+
+    rest, tables = arrow_tables.split_tables(pdf_data, paths)
+
+    assert rest == {"texts": pdf_data["texts"], "tables": {0: None, 1: None}}
+    assert tables[("tables", 1)] == pdf_data["tables"][1]
+    assert pdf_data["tables"][0] is not None
+    assert arrow_tables.split_tables({"a": {0: 1}}, [()]) == ({}, {(): {"a": {0: 1}}})
+
+
+def test_write_and_open_tables(pdf_data, tmp_path) -> None:
+    """
+    Tests that the tables written as Arrow files are opened memory-mapped and
+    converted back to the same columns of values by row.
+
+    Parameters:
+        pdf_data - dict: Data of a PDF file
+        tmp_path - Path: Temporary directory path
+    """
+    tables = {("tables", page): table for page, table in pdf_data["tables"].items()}
+
+    written = arrow_tables.write_tables(tmp_path / "tables", tables)
+    opened = arrow_tables.open_tables(tmp_path / "tables")
+
+    assert written == list(tables)
+    assert list(opened) == list(tables)
+    assert arrow_tables.to_dict(opened[("tables", 1)]) == pdf_data["tables"][1]
+    restored = arrow_tables.to_dict(opened[("tables", 0)])
+    assert restored["item"] == pdf_data["tables"][0]["item"]
+    assert pd.isna(restored["value"][1])
+
+    # -- The frames are backed by the memory-mapped buffers
+    df = arrow_tables.to_frame(opened[("tables", 0)])
+    assert isinstance(df["value"].dtype, pd.ArrowDtype)
+    assert df["item"].tolist() == ["Revenue", "COGS"]
+
+
+def test_write_tables_skips_unsupported(tmp_path) -> None:
+    """
+    Tests that tables with mixed or nested values are not written.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    tables = {
+        ("mixed",): {"a": {0: 1, 1: "x"}},
+        ("nested",): {"a": {0: [1, 2], 1: [3]}},
+        ("records",): [{"a": 1}],
+        ("ok",): {"a": {0: 1, 1: 2}},
+    }
+
+    assert arrow_tables.write_tables(tmp_path, tables) == [("ok",)]
+
+
+def test_extractor_maps_tables(sample_csv, tmp_path) -> None:
+    """
+    Tests that an extractor restored from Arrow files keeps the tables mapped
+    until its data is accessed, and pickles the full data.
+
+    Parameters:
+        sample_csv - Path: Path of the sample CSV file
+        tmp_path - Path: Temporary directory path
+    """
+    extractor = DataExtractor(sample_csv, {"optimize_memory": True}).load()
+
+    stripped, written = extractor.dump_tables(tmp_path / "tables")
+    assert written == [()]
+    assert stripped.data == {}
+    restored = pickle.loads(pickle.dumps(stripped))
+    restored.map_tables(arrow_tables.open_tables(tmp_path / "tables"))
+
+    frames = restored.frames()
+    assert isinstance(frames[()]["value"].dtype, pd.ArrowDtype)
+    assert restored.data == extractor.data
+    assert pickle.loads(pickle.dumps(restored)).data == extractor.data
+
+
+def test_map_tables_checks_placeholders(pdf_data, tmp_path) -> None:
+    """
+    Tests that tables that do not match the placeholders of the data are rejected.
+
+    Parameters:
+        pdf_data - dict: Data of a PDF file
+        tmp_path - Path: Temporary directory path
+    """
+    extractor = DataExtractor(b"%PDF", {"scan": False}, "report.pdf")
+    extractor.release()
+    extractor._data, tables = arrow_tables.split_tables(
+        pdf_data, [("tables", 0), ("tables", 1)]
+    )
+    arrow_tables.write_tables(tmp_path, {("tables", 0): tables[("tables", 0)]})
+
+    with pytest.raises(ValueError, match="Tables do not match"):
+        extractor.map_tables(arrow_tables.open_tables(tmp_path))
+
+
+def test_extractor_maps_table_by_path(pdf_data, tmp_path) -> None:
+    """
+    Tests that a single mapped table is converted without converting the others.
+
+    Parameters:
+        pdf_data - dict: Data of a PDF file
+        tmp_path - Path: Temporary directory path
+    """
+    extractor = DataExtractor(b"%PDF", {"scan": False}, "report.pdf")
+    extractor.release()
+    paths = [("tables", 0), ("tables", 1)]
+    extractor._data, tables = arrow_tables.split_tables(pdf_data, paths)
+    arrow_tables.write_tables(tmp_path, tables)
+    extractor.map_tables(arrow_tables.open_tables(tmp_path))
+
+    assert extractor.table_paths() == paths
+    assert extractor.frame(("tables", 1))["item"].tolist() == ["Cash"]
+    assert extractor.page(1)["table"] == pdf_data["tables"][1]
+    assert sorted(extractor._frames) == paths
@@ -1,7 +1,14 @@
 import pytest
 import pandas as pd
 from pathlib import Path
-from src.extract.dataframe_reader import extract_data
+from src.extract import dataframe_reader
+from src.extract.dataframe_reader import (
+    clear_dialect_cache,
+    extract_data,
+    optimize_memory,
+    read_frames,
+    sniff_csv,
+)
 
 
 # -- Fixtures for the tests --
@@ -44,6 +51,77 @@ def sample_excel(tmp_path: Path) -> Path:
     return file
 
 
+@pytest.fixture
+def multi_sheet_excel(tmp_path: Path) -> Path:
+    """
+    Creates a temporary Excel file with many sheets for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        file - Path: Path to the sample Excel file
+    """
+    # -- Set the file path
+    file = tmp_path / "multi_sheet.xlsx"
+
+    # -- Write one sheet per quarter
+    with pd.ExcelWriter(file) as writer:
+        for quarter in range(1, 4):
+            df = pd.DataFrame(
+                {"account": ["cash", "debt", "equity"], "value": [quarter, 2, 3]}
+            )
+            df.to_excel(writer, sheet_name=f"Q{quarter}", index=False)
+    return file
+
+
+@pytest.fixture
+def ledger_csv(tmp_path: Path) -> Path:
+    """
+    Creates a temporary ledger CSV file with repeated accounts for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        file - Path: Path to the ledger CSV file
+    """
+    # -- Set the file path
+    file = tmp_path / "ledger.csv"
+
+    # -- Write data to the file
+    rows = [
+        f"2024-01-{day:02d},{account},{day * 100},{day}.25,{day}.1"
+        for day in range(1, 29)
+        for account in ["cash", "revenue", "cogs"]
+    ]
+    file.write_text("date,account,amount,rate,price\n" + "\n".join(rows))
+    return file
+
+
+@pytest.fixture
+def european_csv(tmp_path: Path) -> Path:
+    """
+    Creates a temporary CSV file exported with the European dialect for testing.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        file - Path: Path to the European CSV file
+    """
+    # -- Clear the dialects cached by previous tests
+    clear_dialect_cache()
+
+    # -- Set the file path
+    file = tmp_path / "european.csv"
+
+    # -- Write data to the file with a Windows encoding
+    content = "conta;valor\nreceita;1.500,25\ncustos;-300,5\nimpostos;12,75"
+    file.write_bytes(content.encode("cp1252"))
+    return file
+
+
 @pytest.fixture
 def empty_csv(tmp_path: Path) -> Path:
     """
@@ -151,3 +229,154 @@ def test_extract_corrupted_csv(corrupted_csv, caplog) -> None:
 
     # -- Check the log message
     assert "Error parsing the file" in caplog.text
+
+
+def test_extract_excel_all_sheets(multi_sheet_excel, monkeypatch) -> None:
+    """
+    Tests the parallel extraction of every sheet of an Excel file, reusing the
+    process pool between reads.
+
+    Parameters:
+        multi_sheet_excel - Path: Path to the Excel file with many sheets
+        monkeypatch - pytest fixture: Parse small workbooks in parallel
+    """
+    monkeypatch.setattr(dataframe_reader, "PARALLEL_SHEETS_MIN_SIZE", 0)
+    config = {"sheets": "all", "max_workers": 2}
+
+    # -- Extract data twice
+    extracted_data = extract_data(multi_sheet_excel, config)
+    executor = dataframe_reader._sheet_pools[2]
+    assert extract_data(multi_sheet_excel, config) == extracted_data
+
+    # -- Check the extracted data and the shared pool
+    assert list(extracted_data) == ["Q1", "Q2", "Q3"]
+    assert extracted_data["Q3"]["value"] == {0: 3, 1: 2, 2: 3}
+    assert dataframe_reader._sheet_pools[2] is executor
+
+
+def test_extract_excel_selected_columns(multi_sheet_excel) -> None:
+    """
+    Tests the extraction of selected sheets, columns and rows.
+
+    Parameters:
+        multi_sheet_excel - Path: Path to the Excel file with many sheets
+    """
+    # -- Extract data
+    config = {"sheets": ["Q2"], "usecols": ["value"], "nrows": 2}
+    extracted_data = extract_data(multi_sheet_excel, config)
+
+    # -- Check the extracted data
+    assert extracted_data == {"Q2": {"value": {0: 2, 1: 2}}}
+
+
+def test_extract_excel_read_only(multi_sheet_excel) -> None:
+    """
+    Tests the extraction of an Excel sheet on the streaming mode.
+
+    Parameters:
+        multi_sheet_excel - Path: Path to the Excel file with many sheets
+    """
+    # -- Extract data with and without streaming
+    config = {"sheets": "Q1", "usecols": "B", "nrows": 2}
+    streamed_data = extract_data(multi_sheet_excel, {**config, "read_only": True})
+    extracted_data = extract_data(multi_sheet_excel, config)
+
+    # -- Check the extracted data
+    assert streamed_data == extracted_data == {"value": {0: 1, 1: 2}}
+
+
+@pytest.mark.parametrize("read_only", [False, True])
+def test_extract_excel_missing_columns(multi_sheet_excel, read_only) -> None:
+    """
+    Tests that missing columns raise the same error with and without streaming.
+
+    Parameters:
+        multi_sheet_excel - Path: Path to the Excel file with many sheets
+        read_only - bool: Flag to stream the rows of the sheet
+    """
+    config = {"sheets": "Q1", "usecols": ["value", "total"], "read_only": read_only}
+
+    with pytest.raises(ValueError, match=r"not found: \['total'\]"):
+        extract_data(multi_sheet_excel, config)
+
+
+def test_optimize_memory(ledger_csv) -> None:
+    """
+    Tests the dtype inference and downcasting of a ledger table.
+
+    Parameters:
+        ledger_csv - Path: Path to the ledger CSV file
+    """
+    # -- Optimize the table
+    df = pd.read_csv(ledger_csv)
+    optimized, report = optimize_memory(df)
+
+    # -- Check the inferred dtypes
+    assert optimized["date"].dtype.kind == "M"
+    assert optimized["account"].dtype == "category"
+    assert optimized["amount"].dtype == "int16"
+    assert optimized["rate"].dtype == "float32"
+    assert optimized["price"].dtype == "float64"  # Not exact as float32
+
+    # -- Check the memory report
+    assert report["after"] < report["before"]
+    assert optimized["price"].equals(df["price"])
+
+
+def test_extract_csv_optimized(sample_csv, caplog) -> None:
+    """
+    Tests CSV extraction with the memory optimization.
+
+    Parameters:
+        sample_csv - Path: Path to the sample CSV file
+        caplog - pytest fixture: Capture log messages
+    """
+    # -- Extract data as dictionaries and as DataFrames
+    extracted_data = extract_data(sample_csv, {"optimize_memory": True})
+    assert "Memory usage" not in caplog.text
+    df = read_frames(sample_csv, {"optimize_memory": True})
+
+    # -- Check the extracted data, the compact dtypes and the memory report
+    assert extracted_data["col1"] == {0: 1, 1: 3}
+    assert df["col1"].dtype == "int8"
+    assert "Memory usage of sample.csv" in caplog.text
+
+
+def test_sniff_csv(european_csv) -> None:
+    """
+    Tests the detection and caching of a CSV dialect.
+
+    Parameters:
+        european_csv - Path: Path to the European CSV file
+    """
+    # -- Detect the dialect
+    dialect = sniff_csv(european_csv)
+
+    # -- Check the detected dialect
+    assert dialect["sep"] == ";"
+    assert dialect["decimal"] == ","
+    assert dialect["thousands"] == "."
+
+    # -- Check that a file with the same header is detected on its own
+    other_file = european_csv.with_name("other.csv")
+    other_file.write_text("conta;valor\nreceita;1.5\ncustos;2.25")
+    assert sniff_csv(other_file)["decimal"] == "."
+
+    # -- Check that the files of a source reuse its dialect
+    cached = sniff_csv(european_csv, source="erp")
+    assert sniff_csv(other_file, source="erp") is cached
+
+
+def test_extract_european_csv(european_csv) -> None:
+    """
+    Tests the extraction of a CSV file with the European dialect.
+
+    Parameters:
+        european_csv - Path: Path to the European CSV file
+    """
+    # -- Extract data
+    extracted_data = extract_data(european_csv)
+
+    # -- Check the extracted data
+    assert extracted_data["conta"] == {0: "receita", 1: "custos", 2: "impostos"}
+    assert extracted_data["valor"] == {0: 1500.25, 1: -300.5, 2: 12.75}
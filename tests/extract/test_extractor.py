@@ -1,7 +1,9 @@
+import pickle
 import pytest
 import pandas as pd
 from fpdf import FPDF
 from pathlib import Path
+from src.extract import dataframe_reader
 from src.extract.extractor import DataExtractor
 
 
@@ -220,3 +222,148 @@ def test_extract_missing_file() -> None:
     # -- Initialize the Extractor class and expect a FileNotFoundError
     with pytest.raises(FileNotFoundError, match=f"File not found: {missing_file}"):
         DataExtractor(missing_file, {})
+
+    # -- Check the file exists before its format
+    with pytest.raises(FileNotFoundError, match="File not found"):
+        DataExtractor(Path("non_existent_file.txt"))
+
+
+def test_extract_normalized_json(tmp_path: Path) -> None:
+    """
+    Test the extract method for nested JSON files with normalization.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Write a nested JSON file
+    file = tmp_path / "nested.json"
+    file.write_text('{"statements": {"income": [{"revenue": 10}, {"revenue": 20}]}}')
+
+    # -- Initialize the Extractor class with normalization
+    extractor = DataExtractor(file, {"normalize": True})
+
+    # -- Check the extracted tables
+    assert extractor.data == {
+        "tables": {"statements.income[*]": {"revenue": {0: 10, 1: 20}}}
+    }
+
+
+@pytest.mark.parametrize(
+    "sample", ["sample_csv", "sample_excel", "sample_json", "sample_pdf"]
+)
+def test_extract_in_memory(sample, request) -> None:
+    """
+    Test the extract method for files read from an in-memory buffer.
+
+    Parameters:
+        sample - str: Name of the fixture with the sample file
+        request - pytest fixture: Get the sample fixture by name
+    """
+    # -- Get the sample file and its content
+    file = request.getfixturevalue(sample)
+    content = memoryview(file.read_bytes())
+
+    # -- Initialize the Extractor class with the path and with the buffer
+    config = {"scan": False}
+    from_path = DataExtractor(file, config)
+    from_buffer = DataExtractor(content, config, file.name)
+
+    # -- Check the extracted data
+    assert from_buffer.data == from_path.data
+    assert from_buffer.file_path is None
+    assert from_buffer.file_format == file.suffix[1:]
+
+
+def test_extract_in_memory_without_name() -> None:
+    """
+    Test the extract method for an in-memory file without a name.
+    """
+    # -- Initialize the Extractor class and expect a ValueError
+    with pytest.raises(ValueError, match="File name is required"):
+        DataExtractor(b"col1,col2\n1,2", {})
+
+
+def test_extract_lazy(sample_csv, monkeypatch) -> None:
+    """
+    Test that the data is extracted on first access and kept for the next ones.
+
+    Parameters:
+        sample_csv - Path: Path to the sample CSV file
+        monkeypatch - pytest fixture: Count the extractions
+    """
+    # -- Count the calls to the CSV reader
+    calls = []
+    reader = dataframe_reader.extract_data
+    monkeypatch.setattr(
+        dataframe_reader,
+        "extract_data",
+        lambda *args: calls.append(args) or reader(*args),
+    )
+
+    # -- Initialize the Extractor class without extracting the file
+    extractor = DataExtractor(sample_csv, {})
+    assert calls == []
+
+    # -- Check that the data is extracted once
+    assert (
+        extractor.data
+        == extractor.tables
+        == {"col1": {0: 1, 1: 3}, "col2": {0: 2, 1: 4}}
+    )
+    assert len(calls) == 1
+    assert not hasattr(extractor, "__dict__")
+
+
+def test_extract_pdf_sections(sample_pdf) -> None:
+    """
+    Test that the texts and pages of a PDF are extracted without the whole file.
+
+    Parameters:
+        sample_pdf - Path: Path to the sample PDF file
+    """
+    # -- Initialize the Extractor class with the in-memory content
+    extractor = DataExtractor(sample_pdf.read_bytes(), {"scan": False}, "sample.pdf")
+
+    # -- Check the page and the texts
+    assert "test PDF file" in extractor.page(0)["text"]
+    assert extractor.page(3) == {"text": None, "table": None}
+    assert extractor.texts[0] == extractor.page(0)["text"]
+
+    # -- Check that the sections are not available after the release
+    extractor.release()
+    with pytest.raises(ValueError, match="already released"):
+        extractor.page(0)
+
+
+def test_extract_pickle(sample_csv) -> None:
+    """
+    Test that extracted data survives pickling without the progress callback.
+
+    Parameters:
+        sample_csv - Path: Path to the sample CSV file
+    """
+    # -- Extract the data with a progress callback and pickle the extractor
+    extractor = DataExtractor(sample_csv, {}, progress=lambda *args: None).load()
+    restored = pickle.loads(pickle.dumps(extractor))
+
+    # -- Check the restored extractor
+    assert restored.data == extractor.data
+    assert restored.file_name == "sample.csv"
+
+
+def test_extract_optimized_frames(sample_csv) -> None:
+    """
+    Test that the optimized tables are kept as DataFrames until the data is accessed.
+
+    Parameters:
+        sample_csv - Path: Path to the sample CSV file
+    """
+    # -- Extract the data with the memory optimization and pickle the extractor
+    extractor = DataExtractor(sample_csv, {"optimize_memory": True}).load()
+    restored = pickle.loads(pickle.dumps(extractor))
+
+    # -- Check the kept DataFrames and the converted data
+    assert extractor.has_data()
+    assert extractor.frames()[()]["col1"].dtype == "int8"
+    assert restored.frames()[()]["col2"].tolist() == [2, 4]
+    assert restored.data == {"col1": {0: 1, 1: 3}, "col2": {0: 2, 1: 4}}
@@ -0,0 +1,105 @@
+import pytest
+from src.analysis.financial_metrics import calculate_gross_margin
+from src.extract.json_normalizer import (
+    clear_mapping_cache,
+    find_record_paths,
+    normalize_json,
+    schema_signature,
+)
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def nested_report() -> dict:
+    """
+    Creates a nested JSON report for testing.
+
+    Returns:
+        dict: Nested JSON report
+    """
+    # -- Clear the mappings cached by previous tests
+    clear_mapping_cache()
+
+    return {
+        "company": "ACME",
+        "statements": {
+            "income": [
+                {
+                    "period": "2023",
+                    "revenue": "1000",
+                    "cogs": 400,
+                    "notes": {"audited": True},
+                },
+                {
+                    "period": "2024",
+                    "revenue": "1500",
+                    "cogs": 600,
+                    "notes": {"audited": False},
+                },
+            ],
+            "balance": [{"period": "2024", "assets": 5000}],
+        },
+    }
+
+
+# -- Tests --
+def test_find_record_paths(nested_report) -> None:
+    """
+    Tests the detection of record-like paths.
+
+    Parameters:
+        nested_report - dict: Nested JSON report
+    """
+    # -- Find the record paths
+    paths = find_record_paths(nested_report)
+
+    # -- Check the detected paths
+    assert paths == ["statements.income[*]", "statements.balance[*]"]
+
+
+def test_normalize_json(nested_report) -> None:
+    """
+    Tests the flattening of a nested JSON report into typed tables.
+
+    Parameters:
+        nested_report - dict: Nested JSON report
+    """
+    # -- Normalize the report
+    tables = normalize_json(nested_report)
+
+    # -- Check the flattened tables
+    income = tables["statements.income[*]"]
+    assert list(income.columns) == ["period", "revenue", "cogs", "notes.audited"]
+    assert income["revenue"].dtype.kind == "i"
+    assert calculate_gross_margin(income, "revenue", "cogs") == 60.0
+
+
+def test_normalize_json_cached_mappings(nested_report) -> None:
+    """
+    Tests that user-provided mappings are cached per schema.
+
+    Parameters:
+        nested_report - dict: Nested JSON report
+    """
+    # -- Normalize the report with mappings
+    normalize_json(nested_report, {"income": "statements.income[*]"})
+
+    # -- Normalize a report with the same schema and no mappings
+    other_report = dict(nested_report, company="Other")
+    assert schema_signature(other_report) == schema_signature(nested_report)
+    tables = normalize_json(other_report)
+
+    # -- Check that the cached mappings were used
+    assert list(tables) == ["income"]
+
+
+def test_normalize_json_missing_path(nested_report) -> None:
+    """
+    Tests the normalization with a path that is not in the document.
+
+    Parameters:
+        nested_report - dict: Nested JSON report
+    """
+    # -- Normalize the report and expect a KeyError
+    with pytest.raises(KeyError, match="Path not found"):
+        normalize_json(nested_report, {"cash": "statements.cash_flow[*]"})
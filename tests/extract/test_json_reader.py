@@ -1,7 +1,7 @@
 import pytest
 import json
 from pathlib import Path
-from src.extract.json_reader import extract_data
+from src.extract.json_reader import extract_data, read
 
 
 # -- Fixtures for testing --
@@ -112,3 +112,17 @@ def test_extract_empty_json(empty_json) -> None:
 
     # -- Check if the extracted data is correct
     assert extracted_data == {}
+
+
+def test_read_json_without_records(sample_json, caplog) -> None:
+    """
+    Tests that a normalized JSON file without lists of records keeps its data.
+
+    Parameters:
+        sample_json - Path : Path to a JSON file without records.
+        caplog - pytest fixture for capturing log messages.
+    """
+    data = read(sample_json, {"normalize": True}, sample_json.name)
+
+    assert data == {"name": "Alice", "age": 30}
+    assert "No records to flatten" in caplog.text
@@ -0,0 +1,81 @@
+import sys
+import json
+import subprocess
+import pytest
+from importlib.metadata import EntryPoint
+from src.extract import registry
+from src.extract.registry import ReaderRegistry
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def reader_registry() -> ReaderRegistry:
+    """
+    Create a registry with a JSON reader for testing.
+
+    Returns:
+        ReaderRegistry: Registry with the JSON reader, ignoring entry points
+    """
+    reader_registry = ReaderRegistry(entry_point_group=None)
+    reader_registry.register("json:loads", [".JSON"], ["application/json"])
+    return reader_registry
+
+
+# -- Tests --
+def test_get_reader(reader_registry) -> None:
+    """
+    Tests that readers are imported on first use and found by MIME type.
+
+    Parameters:
+        reader_registry - ReaderRegistry: Registry with the JSON reader
+    """
+    # -- Check the reader before and after its first use
+    assert not reader_registry.is_loaded("json")
+    assert reader_registry.get("json") is json.loads
+    assert reader_registry.is_loaded("json")
+
+    # -- Check the MIME types and the unsupported formats
+    assert reader_registry.get("application/json; charset=utf-8") is json.loads
+    with pytest.raises(ValueError, match="File format not supported: txt"):
+        reader_registry.get("txt")
+    with pytest.raises(ValueError, match="File format not supported: text/plain"):
+        reader_registry.get("text/plain")
+
+
+def test_entry_point_readers(monkeypatch) -> None:
+    """
+    Tests that third-party readers are registered from entry points.
+
+    Parameters:
+        monkeypatch - pytest fixture: Patch the installed entry points
+    """
+    # -- Install a reader for XML files and another one for JSON files
+    installed = [
+        EntryPoint("xml", "json:dumps", registry.ENTRY_POINT_GROUP),
+        EntryPoint("json", "json:dumps", registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(registry, "entry_points", lambda group: installed)
+    reader_registry = ReaderRegistry()
+    reader_registry.register("json:loads", ["json"])
+
+    # -- Check the new format and the built-in one
+    assert reader_registry.formats() == ["json", "xml"]
+    assert reader_registry.get("xml") is json.dumps
+    assert reader_registry.get("json") is json.loads
+
+
+def test_extractor_lazy_imports() -> None:
+    """
+    Tests that importing the extractor does not import the heavy backends.
+    """
+    # -- Import the extractor on a new interpreter
+    code = (
+        "import sys; import src.extract.extractor; "
+        "print(sorted({'pandas', 'pdfplumber', 'pytesseract'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    # -- Check the imported modules
+    assert result.stdout.strip() == "[]"
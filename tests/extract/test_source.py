@@ -0,0 +1,73 @@
+import io
+import pytest
+from pathlib import Path
+from src.config import settings
+from src.extract.source import as_path, open_source, read_head, to_buffer
+
+
+# -- Fixtures for testing --
+@pytest.fixture
+def content() -> bytes:
+    """
+    Creates a sample file content for testing.
+
+    Returns:
+        bytes: Sample content
+    """
+    return b"col1,col2\n1,2\n3,4"
+
+
+# -- Tests --
+def test_open_source_buffer(content) -> None:
+    """
+    Tests reading and seeking a stream over a memory buffer.
+
+    Parameters:
+        content - bytes: Sample content
+    """
+    # -- Open a stream over the buffer of an in-memory file
+    with open_source(to_buffer(io.BytesIO(content))) as f:
+        # -- Check the reads
+        assert f.read(4) == b"col1"
+        f.seek(-3, io.SEEK_END)
+        assert f.read() == b"3,4"
+        f.seek(0)
+        assert f.read() == content
+
+
+def test_read_head(content, tmp_path) -> None:
+    """
+    Tests reading the first bytes of paths and buffers.
+
+    Parameters:
+        content - bytes: Sample content
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Write the content to a file
+    file = tmp_path / "sample.csv"
+    file.write_bytes(content)
+
+    # -- Check the first bytes
+    assert read_head(to_buffer(file), 4) == b"col1"
+    assert read_head(to_buffer(content), 4) == b"col1"
+
+
+def test_as_path_spills_buffer(content, tmp_path, monkeypatch) -> None:
+    """
+    Tests that buffers are spilled to a temporary file removed after use.
+
+    Parameters:
+        content - bytes: Sample content
+        tmp_path - Path: Temporary directory path
+        monkeypatch - pytest fixture: Patch the temp directory
+    """
+    # -- Set the temp directory
+    monkeypatch.setattr(settings, "TEMP_DIR", tmp_path)
+
+    # -- Get a path for the buffer
+    with as_path(to_buffer(content), ".csv") as file_path:
+        assert isinstance(file_path, Path)
+        assert file_path.read_bytes() == content
+
+    # -- Check that the temporary file was removed
+    assert not file_path.exists()
@@ -26,6 +26,21 @@ def sample_json(tmp_path: Path) -> Path:
     return file
 
 
+def _show_file(file_path: str, config: dict) -> None:
+    """
+    Show the content extracted from a file, as an AppTest script.
+
+    Parameters:
+        file_path - str: Path of the file
+        config - dict: Configuration for the extractor
+    """
+    from pathlib import Path
+    from src.extract.extractor import DataExtractor
+    from src.pages.file_upload import show_extracted_content
+
+    show_extracted_content(DataExtractor(Path(file_path), config).load(), "file")
+
+
 # -- Tests --
 # TODO: Not working yet due to the lack of support for the file uploader.
 #       Add tests for the file uploader when supported.
@@ -33,7 +48,7 @@ def sample_json(tmp_path: Path) -> Path:
 def test_file_upload_ui(sample_json: Path) -> None:
     """
     Test the UI elements of the File Upload page.
-    
+
     Parameters:
         sample_json - Path : Pytest fixture for a valid JSON file.
     """
@@ -50,4 +65,46 @@ def test_file_upload_ui(sample_json: Path) -> None:
     # -- Check the checkbox for scanning PDF files
     assert "Scanned PDF file" in at.checkbox
     at.checkbox[0].check().run()
-    assert at.checkbox[0].value is True
\ No newline at end of file
+    assert at.checkbox[0].value is True
+
+
+def test_show_table_by_rows(tmp_path: Path) -> None:
+    """
+    Tests that large tables are shown a group of rows at a time.
+    """
+    file = tmp_path / "ledger.csv"
+    file.write_text("account,value\n" + "".join(f"a{i},{i}\n" for i in range(2500)))
+
+    at = stt.AppTest.from_function(_show_file, args=(str(file), {})).run()
+
+    assert at.selectbox[0].label == "Rows (2500)"
+    assert at.selectbox[0].options == ["1 - 1000", "1001 - 2000", "2001 - 2500"]
+    assert len(at.dataframe[0].value) == 1000
+
+    at.selectbox[0].select(2000).run()
+    assert at.dataframe[0].value["value"].tolist() == list(range(2000, 2500))
+
+
+def test_show_pages(tmp_path: Path) -> None:
+    """
+    Tests that the pages of PDF files are shown a group at a time, filtered by
+    their text, and that their tables are only shown on demand.
+    """
+    from benchmarks.generators import write_pdf
+
+    file = write_pdf(tmp_path / "report.pdf", 12)
+
+    at = stt.AppTest.from_function(
+        _show_file, args=(str(file), {"scan": False}), default_timeout=30
+    ).run()
+
+    assert at.selectbox[0].options == ["1 - 10", "11 - 12"]
+    assert [e.label for e in at.expander] == [f"Page {i}" for i in range(1, 11)]
+    assert len(at.dataframe) == 0
+
+    at.toggle(key="file-table-0").set_value(True).run()
+    assert len(at.dataframe) == 1
+
+    at.text_input(key="file-filter").input("Page 12").run()
+    assert [e.label for e in at.expander] == ["Page 12"]
+    assert len(at.selectbox) == 0
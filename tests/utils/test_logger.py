@@ -0,0 +1,185 @@
+import io
+import logging
+import pytest
+from src.config import settings
+from src.utils import logger as logger_module
+from src.utils.logger import (
+    LOGGER_NAME,
+    RateLimitFilter,
+    get_logger,
+    stop_logging,
+    _module_level,
+    _start_listener,
+)
+
+
+# -- Fixtures --
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """
+    Fixture to control the clock of the rate limit.
+
+    Parameters:
+        monkeypatch - MonkeyPatch: Pytest monkeypatch fixture
+
+    Returns:
+        list[float]: Current time, changed by the tests
+    """
+    now = [100.0]
+    monkeypatch.setattr(logger_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_record(message: str, level: int = logging.DEBUG, lineno: int = 10):
+    """
+    Create a log record of a line of code.
+
+    Parameters:
+        message - str: Message of the record
+        level - int: Level of the record
+        lineno - int: Line of the record
+
+    Returns:
+        logging.LogRecord: Log record
+    """
+    return logging.LogRecord("test", level, "reader.py", lineno, message, None, None)
+
+
+# -- Tests --
+def test_rate_limit_drops_records_of_a_line(clock) -> None:
+    """
+    Tests that the records of a line over the limit are dropped and counted.
+
+    Parameters:
+        clock - list[float]: Current time
+    """
+    rate_limit = RateLimitFilter(max_records=2)
+
+    # -- Only the first records of the line are logged
+    logged = [rate_limit.filter(make_record(f"Page {i}")) for i in range(5)]
+    assert logged == [True, True, False, False, False]
+
+    # -- Other lines, warnings and errors are not limited
+    assert rate_limit.filter(make_record("Other", lineno=20))
+    assert rate_limit.filter(make_record("Failed", level=logging.WARNING))
+
+    # -- The next record of the line reports the dropped ones
+    clock[0] += 1.0
+    record = make_record("Page 5")
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "Page 5"
+    assert record.dropped == " (3 similar messages dropped)"
+
+
+def test_rate_limit_shared_by_handlers(clock) -> None:
+    """
+    Tests that a filter shared by several handlers counts each record once and
+    that the dropped records are reported once, without changing the message.
+
+    Parameters:
+        clock - list[float]: Current time
+    """
+    rate_limit = RateLimitFilter(max_records=1)
+    formatter = logging.Formatter(
+        "{message}{dropped}", style="{", defaults={"dropped": ""}
+    )
+    streams = [io.StringIO(), io.StringIO()]
+    logger = logging.getLogger("test-rate-limit")
+    logger.propagate = False
+    for stream in streams:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+        handler.addFilter(rate_limit)
+        logger.addHandler(handler)
+
+    for i in range(3):
+        logger.handle(make_record(f"Page {i}"))
+    clock[0] += 1.0
+    record = make_record("Page 3")
+    logger.handle(record)
+
+    for stream in streams:
+        assert stream.getvalue().splitlines() == [
+            "Page 0",
+            "Page 3 (2 similar messages dropped)",
+        ]
+    assert record.getMessage() == "Page 3"
+
+
+def test_rate_limit_disabled() -> None:
+    """
+    Tests that a limit of 0 logs every record.
+    """
+    rate_limit = RateLimitFilter(max_records=0)
+
+    assert all(rate_limit.filter(make_record(f"Page {i}")) for i in range(100))
+
+
+def test_module_levels(monkeypatch) -> None:
+    """
+    Tests that the level of a module comes from its most specific entry.
+
+    Parameters:
+        monkeypatch - MonkeyPatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(
+        settings, "LOG_LEVELS", {"src.extract": "INFO", "src.extract.pdf": "ERROR"}
+    )
+
+    assert _module_level("src.extract.registry") == logging.INFO
+    assert _module_level("src.extract.pdf") == logging.ERROR
+    assert _module_level("src.extract.pdf_reader") == logging.INFO
+    assert _module_level("src.api.server") == logging.NOTSET
+
+
+def test_module_level_invalid(monkeypatch, caplog) -> None:
+    """
+    Tests that an invalid level of a module falls back to the level of the app,
+    with one warning for its entry.
+
+    Parameters:
+        monkeypatch - MonkeyPatch: Pytest monkeypatch fixture
+        caplog - LogCaptureFixture: Pytest fixture to capture log messages
+    """
+    monkeypatch.setattr(settings, "LOG_LEVELS", {"src.extract": "VERBOSE"})
+    monkeypatch.setattr(logger_module, "_invalid_levels", set())
+
+    assert _module_level("src.extract.pdf_reader") == logging.NOTSET
+    assert _module_level("src.extract.registry") == logging.NOTSET
+    assert caplog.text.count("Invalid log level for src.extract: VERBOSE") == 1
+
+
+def test_get_logger_of_module() -> None:
+    """
+    Tests that get_logger returns a child of the app logger named after the caller.
+    """
+    logger = get_logger()
+
+    assert logger.name == f"{LOGGER_NAME}.{__name__}"
+    assert logger.parent is logging.getLogger(LOGGER_NAME)
+    assert logger.handlers == []
+
+
+def test_queue_writes_on_background_thread(monkeypatch) -> None:
+    """
+    Tests that the records put on the queue are written by the writer thread.
+
+    Parameters:
+        monkeypatch - MonkeyPatch: Pytest monkeypatch fixture
+    """
+    # -- Keep the writer thread of the app
+    monkeypatch.setattr(logger_module, "_listener", None)
+    stream = io.StringIO()
+    queue_handler = _start_listener([logging.StreamHandler(stream)])
+
+    # -- Log through the queue and wait for the writer to finish
+    logger = logging.getLogger(f"{LOGGER_NAME}.test_queue")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        logger.warning("Page %d of %d read", 1, 3)
+    finally:
+        logger.removeHandler(queue_handler)
+        stop_logging()
+
+    assert stream.getvalue() == "Page 1 of 3 read\n"
@@ -0,0 +1,84 @@
+import tracemalloc
+import pytest
+from io import BytesIO
+from src.api.extraction_cache import ExtractionCache
+from src.api.file_processing import process_uploaded_file
+from src.utils.profiling import TaskProfile, peak_rss
+from src.utils.tracing import tracer
+
+
+# -- Fixtures --
+@pytest.fixture
+def uploaded_csv() -> BytesIO:
+    """
+    Fixture with an in-memory CSV upload.
+
+    Returns:
+        BytesIO: Uploaded file with a name, like the Streamlit UploadedFile
+    """
+    uploaded_file = BytesIO(b"col1,col2\n1,2\n3,4")
+    uploaded_file.name = "upload.csv"
+    return uploaded_file
+
+
+# -- Tests --
+def test_profile_collects_stages_with_disabled_tracer() -> None:
+    """
+    Tests that the spans of a profiled task are collected, even when the tracer
+    is disabled, and that the spans of other tasks are not.
+    """
+    assert not tracer.enabled
+    profile = TaskProfile()
+
+    def task() -> int:
+        for page in range(3):
+            with tracer.span("pdf.text", page=page, pages=1):
+                pass
+        return 42
+
+    assert profile.run(task) == 42
+    with tracer.span("pdf.text", page=0) as span:
+        assert not span.recording
+
+    assert profile.seconds > 0
+    assert profile.stages()[0]["stage"] == "pdf.text"
+    assert profile.stages()[0]["runs"] == 3
+    assert profile.stages()[0]["pages"] == 3
+    assert [page["page"] for page in profile.pages()] == [1, 2, 3]
+
+
+def test_profile_memory() -> None:
+    """
+    Tests that the profile records the peak RSS and the top allocations, and
+    stops tracemalloc after the task.
+    """
+    profile = TaskProfile(top_allocations=3)
+
+    blocks = profile.run(lambda: [bytearray(1024) for _ in range(1000)])
+
+    assert len(blocks) == 1000
+    assert 0 < profile.peak_rss <= peak_rss()
+    assert 0 < len(profile.allocations) <= 3
+    assert profile.allocations[0]["bytes"] >= 1000 * 1024
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_cache_tier(uploaded_csv) -> None:
+    """
+    Tests that the profile records the cache tier that served the upload.
+
+    Parameters:
+        uploaded_csv - BytesIO: In-memory CSV upload
+    """
+    cache = ExtractionCache()
+
+    # -- Extract the upload, then get it from the cache
+    first = TaskProfile()
+    first.run(lambda: process_uploaded_file(uploaded_csv, {}, cache=cache))
+    second = TaskProfile()
+    second.run(lambda: process_uploaded_file(uploaded_csv, {}, cache=cache))
+
+    assert first.cache_tier() == "misses"
+    assert "table.read.csv" in [stage["stage"] for stage in first.stages()]
+    assert second.cache_tier() == "memory_hits"
+    assert TaskProfile().cache_tier() is None
@@ -0,0 +1,89 @@
+import sys
+import subprocess
+import pytest
+from pathlib import Path
+from src.utils.startup import StartupTimer, imported_modules
+
+# -- Core modules imported by the app startup
+CORE_MODULES = ["src.extract.extractor", "src.analysis.financial_metrics"]
+
+# -- Heavy packages the core modules only import on first use (pandas alone
+#    takes about 0.5s to import)
+DEFERRED_IMPORTS = [
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "pdfplumber",
+    "pdf2image",
+    "openpyxl",
+    "streamlit",
+]
+
+
+# -- Tests --
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_import_defers_heavy_packages(module) -> None:
+    """
+    Tests that the core modules do not import the heavy packages, which keeps
+    their import fast without depending on the speed of the machine.
+
+    Parameters:
+        module - str: Name of the module
+    """
+    imported = imported_modules(module)
+
+    assert [name for name in DEFERRED_IMPORTS if name in imported] == []
+
+
+def test_logger_opens_file_lazily(tmp_path: Path) -> None:
+    """
+    Tests that importing the modules does not create the log file.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Import a module on a new interpreter in an empty directory
+    subprocess.run(
+        [sys.executable, "-c", "import src.extract.extractor"],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(Path.cwd())},
+        check=True,
+    )
+
+    # -- Check the log file
+    assert not (tmp_path / "app.log").exists()
+
+
+def test_startup_timer() -> None:
+    """
+    Tests that the startup steps are only timed when the timer is enabled.
+    """
+    # -- Time a step with the timer enabled and disabled
+    enabled = StartupTimer(enabled=True)
+    disabled = StartupTimer()
+    for timer in [enabled, disabled]:
+        with timer.step("import pandas"):
+            pass
+
+    # -- Check the steps
+    assert [name for name, _ in enabled.steps] == ["import pandas"]
+    assert enabled.report().startswith("Startup took")
+    assert disabled.steps == []
+
+
+def test_startup_timer_logs_once(caplog) -> None:
+    """
+    Tests that the startup is only logged by the first run of the app script.
+
+    Parameters:
+        caplog - pytest fixture: Capture log messages
+    """
+    timer = StartupTimer(enabled=True)
+
+    # -- Run the steps of the app script twice
+    for _ in range(2):
+        with timer.step("navigation"):
+            pass
+        timer.log()
+
+    assert caplog.text.count("Startup took") == 1
@@ -0,0 +1,162 @@
+import json
+import pytest
+import pandas as pd
+from fpdf import FPDF
+from pathlib import Path
+from src.analysis.financial_metrics import calculate_gross_margin
+from src.extract.extractor import DataExtractor
+from src.utils.tracing import Tracer, tracer as app_tracer
+
+
+# -- Fixtures --
+@pytest.fixture
+def enabled_tracer(monkeypatch) -> Tracer:
+    """
+    Fixture enabling the tracer of the app with no recorded spans.
+
+    Parameters:
+        monkeypatch - MonkeyPatch: Pytest monkeypatch fixture
+
+    Returns:
+        Tracer: Tracer of the app
+    """
+    monkeypatch.setattr(app_tracer, "enabled", True)
+    app_tracer.reset()
+    yield app_tracer
+    app_tracer.reset()
+
+
+@pytest.fixture
+def sample_pdf(tmp_path: Path) -> Path:
+    """
+    Create a sample PDF file with two pages.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+
+    Returns:
+        Path: Path to the sample PDF file
+    """
+    file = tmp_path / "sample.pdf"
+    pdf = FPDF()
+    pdf.set_font("Arial", size=12)
+    for page in range(2):
+        pdf.add_page()
+        pdf.cell(200, 10, txt=f"Page {page + 1}", ln=True)
+    pdf.output(str(file))
+    return file
+
+
+# -- Tests --
+def test_disabled_tracer_records_nothing() -> None:
+    """
+    Tests that the spans of a disabled tracer are shared no-ops.
+    """
+    tracer = Tracer(enabled=False)
+
+    with tracer.span("stage", pages=1) as span:
+        span.set(bytes=10)
+
+    assert tracer.span("a") is tracer.span("b")
+    assert tracer.spans() == []
+    assert tracer.stats() == {}
+
+
+def test_spans_totals() -> None:
+    """
+    Tests that the spans are recorded with their totals by stage.
+    """
+    tracer = Tracer(enabled=True)
+
+    # -- Record two runs of a stage, one of them failing
+    with tracer.span("pdf.text", page=0, pages=1) as span:
+        span.set(bytes=100)
+    with pytest.raises(ValueError):
+        with tracer.span("pdf.text", page=1, pages=1):
+            raise ValueError("Invalid page")
+
+    stats = tracer.stats()["pdf.text"]
+    assert stats["count"] == 2
+    assert stats["pages"] == 2
+    assert stats["bytes"] == 100
+    assert stats["errors"] == 1
+    assert stats["seconds"] >= 0
+    assert tracer.spans()[1].attributes == {
+        "page": 1,
+        "pages": 1,
+        "error": "ValueError",
+    }
+
+
+def test_traced_decorator() -> None:
+    """
+    Tests that the decorated functions run in a span only when enabled.
+    """
+    tracer = Tracer(enabled=False)
+
+    @tracer.traced("double")
+    def double(value: int) -> int:
+        return value * 2
+
+    assert double(2) == 4
+    assert tracer.stats() == {}
+
+    tracer.enabled = True
+    assert double(3) == 6
+    assert tracer.stats()["double"]["count"] == 1
+
+
+def test_export(tmp_path: Path) -> None:
+    """
+    Tests the JSON trace and the Prometheus text exports.
+
+    Parameters:
+        tmp_path - Path: Temporary directory path
+    """
+    tracer = Tracer(enabled=True)
+    with tracer.span("table.read.csv", bytes=2048):
+        pass
+
+    # -- JSON trace in the Trace Event Format
+    tracer.export_json(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    event = trace["traceEvents"][0]
+    assert event["name"] == "table.read.csv"
+    assert event["ph"] == "X"
+    assert event["args"] == {"bytes": 2048}
+
+    # -- Prometheus totals
+    tracer.export_prometheus(tmp_path / "metrics.prom")
+    lines = (tmp_path / "metrics.prom").read_text().splitlines()
+    assert "# TYPE finance_analyzer_span_seconds_total counter" in lines
+    assert 'finance_analyzer_span_bytes_total{stage="table.read.csv"} 2048' in lines
+    assert 'finance_analyzer_span_count_total{stage="table.read.csv"} 1' in lines
+
+
+def test_pipeline_stages(enabled_tracer, sample_pdf, tmp_path: Path) -> None:
+    """
+    Tests that the extraction and the metrics record their stages.
+
+    Parameters:
+        enabled_tracer - Tracer: Tracer of the app
+        sample_pdf - Path: Path to the sample PDF file
+        tmp_path - Path: Temporary directory path
+    """
+    # -- Extract a PDF and a CSV file
+    DataExtractor(sample_pdf, {"scan": False}).load()
+    csv_file = tmp_path / "sample.csv"
+    csv_file.write_text("revenue,cogs\n100,60\n")
+    DataExtractor(csv_file, {}).load()
+    df = pd.DataFrame({"revenue": [100], "cogs": [60]})
+    calculate_gross_margin(df, "revenue", "cogs")
+
+    stats = enabled_tracer.stats()
+    sizes = [sample_pdf.stat().st_size, csv_file.stat().st_size]
+    assert stats["extract"]["count"] == 2
+    assert stats["extract"]["bytes"] == sum(sizes)
+    assert stats["pdf.extract"]["pages"] == 2
+    assert stats["pdf.text"]["count"] == 2
+    assert stats["pdf.tables"]["count"] == 2
+    assert stats["table.read.csv"]["bytes"] == sizes[1]
+    assert stats["table.to_dict"]["count"] == 1
+    assert stats["metrics.gross_margin"]["count"] == 1